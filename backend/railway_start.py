@@ -10,6 +10,9 @@ import uvicorn
 if __name__ == "__main__":
     # Railway sets the PORT environment variable
     port = int(os.environ.get("PORT", 8000))
+
+    # Requests arrive through Railway's proxy, which appends the client address to X-Forwarded-For
+    os.environ.setdefault("TRUSTED_PROXY_HOPS", "1")
     
     # Run the FastAPI application
     uvicorn.run(
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Regenerate the monthly_rollups collection from the stored transactions.
+
+Usage: python rebuild_rollups.py [user_id]
+Without a user id every user's rollups are rebuilt.
+"""
+
+import asyncio
+import sys
+
+import server
+
+if __name__ == "__main__":
+    user_id = sys.argv[1] if len(sys.argv) > 1 else None
+    rows = asyncio.run(server.rebuild_monthly_rollups(user_id))
+    print(f"Rebuilt {rows} monthly rollup rows" + (f" for user {user_id}" if user_id else ""))
@@ -1,5 +1,6 @@
 from fastapi import FastAPI, APIRouter, UploadFile, File, Form, HTTPException, Depends, status, Request
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import RedirectResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from dotenv import load_dotenv
@@ -10,7 +11,7 @@ import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from typing import List, Optional, Union
 import uuid
 from datetime import datetime, date, timedelta
 import pandas as pd
@@ -24,6 +25,10 @@ import tempfile
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.utils import get_column_letter
+from openpyxl.cell import WriteOnlyCell
+import pyarrow as pa
+import pyarrow.parquet as pq
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 import secrets
@@ -34,6 +39,19 @@ import random
 import string
 from authlib.integrations.starlette_client import OAuth
 import httpx
+import asyncio
+import time
+import hashlib
+import functools
+import inspect
+import csv
+import pickle
+import base64
+import itertools
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pymongo import UpdateOne, ReturnDocument
+from pymongo.errors import BulkWriteError
 
 
 
@@ -55,6 +73,48 @@ GMAIL_APP_PASSWORD = os.environ.get("GMAIL_APP_PASSWORD")
 GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.environ.get("GOOGLE_CLIENT_SECRET")
 
+# Per-subsystem log levels, e.g. "lifetracker.parser=DEBUG,lifetracker.pdf=INFO"
+LOG_LEVELS = os.environ.get("LOG_LEVELS", "")
+
+# PDF extraction worker pool configuration
+PDF_WORKERS = max(1, int(os.environ.get("PDF_WORKERS", os.cpu_count() or 2)))
+# PDF tasks submitted to the pool at once; further tasks wait for a slot
+PDF_QUEUE_LIMIT = max(1, int(os.environ.get("PDF_QUEUE_LIMIT", PDF_WORKERS * 4)))
+PDF_PAGE_BATCH = max(1, int(os.environ.get("PDF_PAGE_BATCH", 5)))
+# Page ranges of one statement extracted concurrently; 1 extracts and parses batch by batch
+PDF_PARALLEL_RANGES = max(1, int(os.environ.get("PDF_PARALLEL_RANGES", PDF_WORKERS)))
+# "adaptive" only runs extract_tables() on pages whose text has no transaction rows
+PDF_TABLE_EXTRACTION = os.environ.get("PDF_TABLE_EXTRACTION", "adaptive")  # always, adaptive, never
+
+# Extracted PDF cache configuration
+PDF_CACHE_SIZE = max(0, int(os.environ.get("PDF_CACHE_SIZE", 64)))
+PDF_CACHE_DIR = os.environ.get("PDF_CACHE_DIR")  # Optional on-disk tier
+
+# Statement import job queue configuration
+IMPORT_JOB_WORKERS = max(1, int(os.environ.get("IMPORT_JOB_WORKERS", 2)))
+IMPORT_QUEUE_LIMIT = max(1, int(os.environ.get("IMPORT_QUEUE_LIMIT", 50)))
+IMPORT_JOB_TTL_MINUTES = int(os.environ.get("IMPORT_JOB_TTL_MINUTES", 60))
+IMPORT_BATCH_MAX_FILES = max(1, int(os.environ.get("IMPORT_BATCH_MAX_FILES", 50)))
+CSV_IMPORT_CHUNK_SIZE = max(1, int(os.environ.get("CSV_IMPORT_CHUNK_SIZE", 5000)))
+
+# Analytics response cache configuration
+ANALYTICS_CACHE_SIZE = max(0, int(os.environ.get("ANALYTICS_CACHE_SIZE", 1024)))
+ANALYTICS_CACHE_MAX_BYTES = max(0, int(os.environ.get("ANALYTICS_CACHE_MAX_BYTES", 64 * 1024 * 1024)))  # memory backend only
+ANALYTICS_CACHE_TTL_SECONDS = max(1, int(os.environ.get("ANALYTICS_CACHE_TTL_SECONDS", 300)))
+ANALYTICS_CACHE_BACKEND = os.environ.get("ANALYTICS_CACHE_BACKEND", "memory")  # memory, mongo (shared across processes)
+
+# Authenticated user cache configuration; a TTL of 0 looks the user up on every request
+AUTH_CACHE_SIZE = max(0, int(os.environ.get("AUTH_CACHE_SIZE", 1024)))
+AUTH_CACHE_TTL_SECONDS = max(0, int(os.environ.get("AUTH_CACHE_TTL_SECONDS", 30)))
+
+# Password hashing pool and login rate limiting
+PASSWORD_WORKERS = max(1, int(os.environ.get("PASSWORD_WORKERS", 2)))
+PASSWORD_QUEUE_LIMIT = max(1, int(os.environ.get("PASSWORD_QUEUE_LIMIT", PASSWORD_WORKERS * 8)))
+LOGIN_RATE_LIMIT = max(1, int(os.environ.get("LOGIN_RATE_LIMIT", 10)))  # attempts per IP per window
+LOGIN_RATE_WINDOW_SECONDS = max(1, int(os.environ.get("LOGIN_RATE_WINDOW_SECONDS", 60)))
+# Reverse proxies in front of the app that append to X-Forwarded-For (1 on Railway, 0 when exposed directly)
+TRUSTED_PROXY_HOPS = max(0, int(os.environ.get("TRUSTED_PROXY_HOPS", 0)))
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -73,6 +133,126 @@ google_oauth = oauth.register(
 mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
+db_logger = logging.getLogger("lifetracker.db")
+
+# MongoDB indexes, reconciled at startup: collection -> [(keys, options)]
+INDEX_SPECS = {
+    "transactions": [
+        # id is the keyset tie-breaker for paginated listing
+        ([("user_id", 1), ("date", -1), ("id", -1)], {"name": "user_date"}),
+        ([("user_id", 1), ("amount", -1), ("id", -1)], {"name": "user_amount"}),
+        ([("user_id", 1), ("description", 1), ("id", 1)], {"name": "user_description"}),
+        ([("user_id", 1), ("category", 1), ("date", -1)], {"name": "user_category_date"}),
+        ([("user_id", 1), ("account_type", 1), ("date", -1)], {"name": "user_account_type_date"}),
+        ([("user_id", 1), ("pdf_source", 1)], {"name": "user_pdf_source"}),
+        ([("id", 1)], {"name": "id"}),
+    ],
+    "users": [
+        ([("email", 1)], {"name": "email", "unique": True}),
+        ([("id", 1)], {"name": "id", "unique": True}),
+        ([("username", 1)], {"name": "username"}),
+        ([("household_id", 1)], {"name": "household_id"}),
+    ],
+    "categories": [
+        ([("user_id", 1), ("id", 1)], {"name": "user_id"}),
+    ],
+    "households": [
+        ([("id", 1)], {"name": "id", "unique": True}),
+    ],
+    "monthly_rollups": [
+        ([(field, 1) for field in ("user_id", "month", "category", "account_type", "pdf_source")], {"name": "rollup_key", "unique": True}),
+    ],
+    "password_resets": [
+        ([("email", 1)], {"name": "email"}),
+        ([("expires_at", 1)], {"name": "expires_at_ttl", "expireAfterSeconds": 0}),
+    ],
+    "analytics_cache": [
+        ([("key", 1)], {"name": "key", "unique": True}),
+        ([("expires_at", 1)], {"name": "expires_at_ttl", "expireAfterSeconds": 0}),
+    ],
+    "analytics_versions": [
+        ([("user_id", 1)], {"name": "user_id", "unique": True}),
+    ],
+    "category_rules": [
+        ([("user_id", 1), ("created_at", 1)], {"name": "user_created_at"}),
+        ([("id", 1)], {"name": "id", "unique": True}),
+    ],
+    "merchant_categories": [
+        ([("user_id", 1), ("merchant", 1)], {"name": "user_merchant", "unique": True}),
+    ],
+}
+
+# Leading fields (equality first, then sort/range) of the queries server.py issues
+QUERY_SHAPES = {
+    "transactions": [
+        ("user_id", "date"), ("user_id", "amount"), ("user_id", "description"), ("user_id", "category", "date"),
+        ("user_id", "pdf_source"), ("user_id", "account_type", "date"), ("id", "user_id"),
+    ],
+    "users": [("email",), ("id",), ("username",), ("household_id",)],
+    "categories": [("user_id",), ("user_id", "id")],
+    "households": [("id",)],
+    "monthly_rollups": [("user_id", "month")],
+    "password_resets": [("email", "reset_code", "expires_at")],
+    "analytics_cache": [("key",)],
+    "analytics_versions": [("user_id",)],
+    "category_rules": [("user_id", "created_at"), ("id", "user_id")],
+    "merchant_categories": [("user_id",), ("user_id", "merchant")],
+}
+
+def index_covers(index_fields: tuple, shape: tuple) -> bool:
+    """Whether an index can serve a query shape through a shared key prefix"""
+    shared = min(len(index_fields), len(shape))
+    return index_fields[:shared] == shape[:shared] and (shared == len(shape) or shared == len(index_fields))
+
+async def ensure_indexes() -> dict:
+    """Create missing indexes and rebuild ones whose definition changed.
+
+    Safe to run on every startup. Returns what changed plus any query shapes
+    no index covers; a failed index or collection is logged, recorded in
+    report["failed"] and skipped so the app still boots.
+    """
+    report = {"created": [], "rebuilt": [], "failed": [], "uncovered": []}
+
+    for collection_name, specs in INDEX_SPECS.items():
+        collection = db[collection_name]
+        try:
+            existing = await collection.index_information()
+        except Exception as e:
+            db_logger.error(f"Could not list indexes of {collection_name}: {e}")
+            report["failed"].append(collection_name)
+            continue
+        existing_keys = {tuple(info["key"]) for info in existing.values()}
+
+        for keys, options in specs:
+            name = options["name"]
+            current = existing.get(name)
+            try:
+                if current is not None:
+                    if (list(current["key"]) == keys
+                            and current.get("unique", False) == options.get("unique", False)
+                            and current.get("expireAfterSeconds") == options.get("expireAfterSeconds")):
+                        continue
+                    await collection.drop_index(name)
+                elif tuple(keys) in existing_keys:
+                    # Same keys already indexed under another name
+                    continue
+
+                await collection.create_index(keys, **options)
+                report["rebuilt" if current is not None else "created"].append(f"{collection_name}.{name}")
+            except Exception as e:
+                db_logger.error(f"Could not reconcile index {collection_name}.{name}: {e}")
+                report["failed"].append(f"{collection_name}.{name}")
+
+        index_fields = [tuple(field for field, _ in keys) for keys, _ in specs]
+        index_fields += [tuple(field for field, _ in info["key"]) for info in existing.values()]
+        for shape in QUERY_SHAPES.get(collection_name, []):
+            if not any(index_covers(fields, shape) for fields in index_fields):
+                report["uncovered"].append(f"{collection_name}({', '.join(shape)})")
+
+    db_logger.info("Index reconciliation %s", json.dumps(report))
+    for shape in report["uncovered"]:
+        db_logger.warning(f"No index covers query shape {shape}")
+    return report
 
 # Create the main app without a prefix
 app = FastAPI()
@@ -116,6 +296,21 @@ class CategoryUpdate(BaseModel):
     name: Optional[str] = None
     color: Optional[str] = None
 
+class CategoryRule(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    keyword: str
+    category: str
+    user_id: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class CategoryRuleCreate(BaseModel):
+    keyword: str
+    category: str
+
+class CategoryRuleUpdate(BaseModel):
+    keyword: Optional[str] = None
+    category: Optional[str] = None
+
 class Transaction(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     date: date
@@ -129,6 +324,11 @@ class Transaction(BaseModel):
     user_name: Optional[str] = None  # Extracted user name from PDF
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class TransactionPage(BaseModel):
+    transactions: List[Transaction]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
 class TransactionCreate(BaseModel):
     date: date
     description: str
@@ -150,6 +350,25 @@ class CategorySpending(BaseModel):
     count: int
     percentage: float
 
+class ImportJob(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    filename: str
+    status: str = "queued"  # queued, processing, completed, failed
+    pages_total: int = 0
+    pages_done: int = 0
+    transactions_found: int = 0
+    imported_count: int = 0
+    duplicate_count: int = 0
+    cache_hit: bool = False
+    message: Optional[str] = None
+    error: Optional[str] = None
+    extracted_text_preview: Optional[str] = None
+    summary: Optional[dict] = None
+    files: List[dict] = []  # Per-statement results
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
 # Authentication Models
 class UserCreate(BaseModel):
     email: EmailStr
@@ -214,6 +433,77 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+password_executor: Optional[ThreadPoolExecutor] = None
+password_queue_depth = 0
+
+def get_password_executor() -> ThreadPoolExecutor:
+    """Create the password pool on first use"""
+    global password_executor
+    if password_executor is None:
+        password_executor = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="password")
+    return password_executor
+
+async def run_in_password_pool(func, *args):
+    """Run verify_password/get_password_hash on the password pool"""
+    global password_queue_depth
+    if password_queue_depth >= PASSWORD_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests, please try again shortly"
+        )
+
+    password_queue_depth += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_password_executor(), func, *args)
+    finally:
+        password_queue_depth -= 1
+
+class LoginRateLimiter:
+    """Sliding-window count of login attempts per client IP"""
+
+    def __init__(self, limit: int, window_seconds: int):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.attempts = defaultdict(deque)
+
+    def check(self, client_ip: str):
+        """Record an attempt, raising 429 once the IP is over its limit"""
+        now = time.monotonic()
+        cutoff = now - self.window_seconds
+        attempts = self.attempts[client_ip]
+        while attempts and attempts[0] <= cutoff:
+            attempts.popleft()
+        if len(attempts) >= self.limit:
+            retry_after = int(attempts[0] - cutoff) + 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please try again later",
+                headers={"Retry-After": str(retry_after)}
+            )
+        attempts.append(now)
+
+        # Forget idle IPs so the table doesn't grow without bound
+        if len(self.attempts) > 10000:
+            for ip in [ip for ip, times in self.attempts.items() if not times or times[-1] <= cutoff]:
+                del self.attempts[ip]
+
+login_rate_limiter = LoginRateLimiter(LOGIN_RATE_LIMIT, LOGIN_RATE_WINDOW_SECONDS)
+
+def get_client_ip(request: Request) -> str:
+    """Client address as seen by the outermost trusted proxy.
+
+    Each trusted proxy appends the address it received the request from, so
+    the entry TRUSTED_PROXY_HOPS from the right is the client; anything to its
+    left was supplied by the client and can't be trusted.
+    """
+    if TRUSTED_PROXY_HOPS:
+        forwarded_for = [host.strip() for host in request.headers.get("x-forwarded-for", "").split(",") if host.strip()]
+        if forwarded_for:
+            return forwarded_for[-min(TRUSTED_PROXY_HOPS, len(forwarded_for))]
+    return request.client.host if request.client else "unknown"
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -234,7 +524,7 @@ async def authenticate_user(email: str, password: str):
     user = await get_user_by_email(email)
     if not user:
         return False
-    if not verify_password(password, user["password_hash"]):
+    if not await run_in_password_pool(verify_password, password, user["password_hash"]):
         return False
     return user
 
@@ -269,6 +559,42 @@ def generate_reset_code():
     """Generate a 6-digit reset code"""
     return ''.join(random.choices(string.digits, k=6))
 
+class PrincipalCache:
+    """User documents keyed by token subject (email), held for a few seconds.
+
+    Writes to a user's profile, password or household call invalidate() so
+    the next request sees them immediately; anything else ages out via the TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, subject: str) -> Optional[dict]:
+        entry = self.entries.get(subject)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(subject)
+        return dict(entry[1])
+
+    def put(self, subject: str, user: dict):
+        if not self.ttl_seconds:
+            return
+        self.entries[subject] = (time.monotonic() + self.ttl_seconds, user)
+        self.entries.move_to_end(subject)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, subject: str):
+        self.entries.pop(subject, None)
+
+principal_cache = PrincipalCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS)
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -283,10 +609,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
+    user = principal_cache.get(token_data.email)
+    if user is not None:
+        return user
     user = await get_user_by_email(email=token_data.email)
     if user is None:
         raise credentials_exception
-    return user
+    principal_cache.put(token_data.email, user)
+    return dict(user)
 
 async def get_current_user_id(current_user: dict = Depends(get_current_user)):
     return current_user["id"]
@@ -326,52 +656,161 @@ async def get_current_user_id_flexible(authorization: Optional[str] = Depends(oa
         return "default_user"  # Fallback for invalid tokens
 
 # PDF Processing Functions
-def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from PDF using multiple methods for better reliability"""
-    text = ""
+pdf_logger = logging.getLogger("lifetracker.pdf")
+parser_logger = logging.getLogger("lifetracker.parser")
+import_logger = logging.getLogger("lifetracker.import")
+
+# Statement patterns, compiled once at import instead of on every line
+MONTH_MAP = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+NAME_LINE_RE = re.compile(r'^[A-Z\s]{8,50}$')
+BANK_TERMS_RE = re.compile('ACCOUNT|STATEMENT|CARD|BANK|DIVIDEND|CIBC|VISA|TRANSACTION|DETAILS')
+PREPARED_FOR_RE = re.compile(r'prepared for:?\s*([A-Z\s]+?)(?:\s+[A-Z]{2,}\s+\d|\s*$)', re.IGNORECASE)
+NAME_WITH_PERIOD_RE = re.compile(r'^([A-Z\s]+?)\s+For\s+(\w+\s+\d+\s+to\s+\w+\s+\d+,?\s+\d{4})', re.IGNORECASE)
+STATEMENT_PERIOD_RE = re.compile(r'(\w+)\s+(\d+)\s*to\s*(\w+)\s+(\d+),?\s*(\d{4})', re.IGNORECASE)
+STATEMENT_DATE_RE = re.compile(r'(\w+)\s+(\d+),?\s*(\d{4})')
+
+# Use word boundaries to avoid false positives (e.g., "LOVISA" containing "VISA")
+HEADER_KEYWORDS_RE = re.compile(r'\b(?:CARD NUMBER|PAGE|CIBC|DIVIDEND|VISA|YOUR PAYMENTS|YOUR NEW CHARGES)\b')
+TABLE_HEADERS_RE = re.compile('|'.join(re.escape(h) for h in ['TRANS   POST', 'DATE    DATE', 'SPEND CATEGORIES', 'AMOUNT($)']))
+EXACT_HEADERS = frozenset(['TRANS', 'POST', 'DESCRIPTION', 'AMOUNT', 'SPEND CATEGORIES'])
+PAYMENT_KEYWORDS_RE = re.compile('|'.join(re.escape(k) for k in [
+    'PAYMENT THANK YOU', 'PAIEMENT MERCI', 'PAYMENT - THANK YOU',
+    'THANK YOU FOR YOUR PAYMENT', 'PAYMENT RECEIVED'
+]))
+# Known categories (longest first to avoid partial matches)
+KNOWN_CATEGORIES = [
+    'Foreign Currency Transactions',
+    'Hotel, Entertainment and Recreation', 
+    'Professional and Financial Services',
+    'Home and Office Improvement',
+    'Personal and Household Expenses',
+    'Health and Education',
+    'Retail and Grocery',
+    'Transportation',
+    'Restaurants'
+]
+
+MONTH_DAY_RE = re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}')
+DECIMAL_AMOUNT_RE = re.compile(r'(\d+\.\d{2})')
+GROUPED_AMOUNT_RE = re.compile(r'(\d{1,3}(?:,\d{3})*\.\d{2})')
+TRANS_POST_DATES_RE = re.compile(r'(\w{3}\s+\d{1,2})\s+(\w{3}\s+\d{1,2})\s+(.+)')
+COLUMN_GAP_RE = re.compile(r'\s{2,}')
+WHITESPACE_RE = re.compile(r'\s+')
+
+DEBIT_HEADERS_RE = re.compile('DATE|DESCRIPTION|WITHDRAWALS|DEPOSITS|BALANCE')
+DEBIT_END_MARKERS_RE = re.compile('closing balance|important:|free transaction')
+DEBIT_SKIP_RE = re.compile('balance forward|opening balance|service charge')
+LEADING_DATE_RE = re.compile(r'^(\w{3}\s+\d{1,2})')
+TRAILING_AMOUNT_RE = re.compile(r'(\d+\.\d{2})\s*$')
+
+def classify_credit_line(line: str) -> tuple:
+    """Classify a credit statement line in one pass.
+
+    Returns (kind, skip_reason) where kind is 'header', 'candidate' (has a
+    month/day and an amount), 'table_row' (pipe-separated with an amount) or None.
+    """
+    line_upper = line.upper()
+
+    # Only skip if the line is clearly a header (contains header keywords or exact matches)
+    if HEADER_KEYWORDS_RE.search(line_upper):
+        return 'header', f"Contains header keyword: {HEADER_KEYWORDS_RE.findall(line_upper)}"
+    if TABLE_HEADERS_RE.search(line_upper):
+        return 'header', f"Contains table header: {TABLE_HEADERS_RE.findall(line_upper)}"
+    if line_upper.strip() in EXACT_HEADERS:
+        return 'header', f"Exact match header: {line_upper.strip()}"
+
+    if not DECIMAL_AMOUNT_RE.search(line):
+        return None, None
+    if MONTH_DAY_RE.search(line):
+        return 'candidate', None
+    if '|' in line:
+        return 'table_row', None
+    return None, None
+
+def page_has_transaction_rows(page_text: str) -> bool:
+    """Cheap check for whether a page's text already yields transaction-like rows"""
+    return any(MONTH_DAY_RE.search(line) and DECIMAL_AMOUNT_RE.search(line) for line in page_text.split('\n'))
+
+def count_pdf_pages(file_content: bytes) -> int:
+    """Count the pages in a PDF, falling back to PyPDF2 like extract_text_from_pdf"""
+    try:
+        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+            return len(pdf.pages)
+    except Exception as e:
+        pdf_logger.warning(f"pdfplumber page count failed: {e}")
+        try:
+            return len(PyPDF2.PdfReader(io.BytesIO(file_content)).pages)
+        except Exception as e2:
+            pdf_logger.error(f"PyPDF2 page count also failed: {e2}")
+            raise HTTPException(status_code=400, detail="Could not extract text from PDF")
+
+def iter_pdf_pages(file_content: bytes, start_page: int = 0, end_page: Optional[int] = None, stats: Optional[dict] = None):
+    """Yield the extracted text of each page, tables included, as soon as that page is read.
+
+    start_page/end_page select a zero-based, end-exclusive page range; page
+    markers keep their absolute page numbers so ranges can be concatenated.
+    stats["table_pass_pages"] counts pages that needed the extract_tables() pass.
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault("table_pass_pages", 0)
+    debug = pdf_logger.isEnabledFor(logging.DEBUG)
     
     try:
         # Method 1: Using pdfplumber (better for tables and structured data)
         with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-            print(f"PDF has {len(pdf.pages)} pages")
-            for page_num, page in enumerate(pdf.pages):
-                print(f"Processing page {page_num + 1}")
+            pdf_logger.debug("PDF has %d pages", len(pdf.pages))
+            for page_num, page in enumerate(pdf.pages[start_page:end_page], start_page):
+                page_block = ""
                 page_text = page.extract_text()
                 if page_text:
-                    print(f"Page {page_num + 1} extracted {len(page_text)} characters")
-                    text += f"\n--- PAGE {page_num + 1} ---\n" + page_text + "\n"
-                else:
-                    print(f"Page {page_num + 1} - no text extracted")
+                    if debug:
+                        pdf_logger.debug("Page %d extracted %d characters", page_num + 1, len(page_text))
+                    page_block += f"\n--- PAGE {page_num + 1} ---\n" + page_text + "\n"
+                elif debug:
+                    pdf_logger.debug("Page %d - no text extracted", page_num + 1)
                     
-                # Also try to extract tables
-                tables = page.extract_tables()
-                if tables:
-                    print(f"Page {page_num + 1} has {len(tables)} tables")
+                # Tables are the most expensive pass, so only fall back to them when the text has no rows
+                needs_tables = PDF_TABLE_EXTRACTION == "always" or (
+                    PDF_TABLE_EXTRACTION == "adaptive" and not (page_text and page_has_transaction_rows(page_text))
+                )
+                if needs_tables:
+                    stats["table_pass_pages"] += 1
+                    tables = page.extract_tables()
+                    if tables and debug:
+                        pdf_logger.debug("Page %d has %d tables", page_num + 1, len(tables))
                     for table_num, table in enumerate(tables):
-                        text += f"\n--- TABLE {table_num + 1} ON PAGE {page_num + 1} ---\n"
+                        page_block += f"\n--- TABLE {table_num + 1} ON PAGE {page_num + 1} ---\n"
                         for row in table:
                             if row and any(cell for cell in row if cell):  # Skip empty rows
-                                text += " | ".join(str(cell) if cell else "" for cell in row) + "\n"
+                                page_block += " | ".join(str(cell) if cell else "" for cell in row) + "\n"
+                
+                yield page_block
     
     except Exception as e:
-        logging.warning(f"pdfplumber extraction failed: {e}")
+        pdf_logger.warning(f"pdfplumber extraction failed: {e}")
         
         # Method 2: Fallback to PyPDF2
         try:
             pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            print(f"PyPDF2: PDF has {len(pdf_reader.pages)} pages")
-            for page_num, page in enumerate(pdf_reader.pages):
+            pdf_logger.debug("PyPDF2: PDF has %d pages", len(pdf_reader.pages))
+            for page_num, page in enumerate(pdf_reader.pages[start_page:end_page], start_page):
                 page_text = page.extract_text()
-                text += f"\n--- PYPDF2 PAGE {page_num + 1} ---\n" + page_text + "\n"
+                yield f"\n--- PYPDF2 PAGE {page_num + 1} ---\n" + page_text + "\n"
         except Exception as e2:
-            logging.error(f"PyPDF2 extraction also failed: {e2}")
+            pdf_logger.error(f"PyPDF2 extraction also failed: {e2}")
             raise HTTPException(status_code=400, detail="Could not extract text from PDF")
+
+def extract_text_from_pdf(file_content: bytes, start_page: int = 0, end_page: Optional[int] = None, stats: Optional[dict] = None) -> str:
+    """Extract text from PDF using multiple methods for better reliability"""
+    text = "".join(iter_pdf_pages(file_content, start_page, end_page, stats))
     
-    print(f"Total extracted text length: {len(text)}")
-    print("EXTRACTED TEXT PREVIEW:")
-    print("=" * 80)
-    print(text[:2000])  # Print first 2000 characters for debugging
-    print("=" * 80)
+    if pdf_logger.isEnabledFor(logging.DEBUG):
+        pdf_logger.debug("Total extracted text length: %d", len(text))
+        pdf_logger.debug("Extracted text preview:\n%s", text[:2000])
     
     return text
 
@@ -395,6 +834,9 @@ def generate_source_name(user_name: str, account_type: str, original_filename: s
         clean_name = user_name.title()
         return f"{clean_name}'s {account_type.title()}"
 
+# extract_pdf_metadata only reads this many lines from the top of the statement
+STATEMENT_HEADER_LINES = 20
+
 def extract_pdf_metadata(text: str) -> dict:
     """Extract user name and statement period from PDF header - enhanced for multiple formats"""
     metadata = {
@@ -411,34 +853,33 @@ def extract_pdf_metadata(text: str) -> dict:
         line = line.strip()
         
         # Method 1: Look for name patterns (all caps, likely a person's name)
-        if re.match(r'^[A-Z\s]{8,50}$', line) and ' ' in line and len(line.split()) >= 2:
+        if NAME_LINE_RE.match(line) and ' ' in line and len(line.split()) >= 2:
             # Skip common bank terms
-            bank_terms = ['ACCOUNT', 'STATEMENT', 'CARD', 'BANK', 'DIVIDEND', 'CIBC', 'VISA', 'TRANSACTION', 'DETAILS']
-            if not any(term in line.upper() for term in bank_terms):
+            if not BANK_TERMS_RE.search(line.upper()):
                 metadata['user_name'] = line.strip()
-                print(f"Found user name (Method 1): {metadata['user_name']}")
+                parser_logger.debug("Found user name (Method 1): %s", metadata['user_name'])
                 break
         
         # Method 2: Look for "Prepared for:" pattern (credit cards)
-        prepared_match = re.search(r'prepared for:?\s*([A-Z\s]+?)(?:\s+[A-Z]{2,}\s+\d|\s*$)', line, re.IGNORECASE)
+        prepared_match = PREPARED_FOR_RE.search(line)
         if prepared_match:
             name = prepared_match.group(1).strip()
             if len(name) > 5 and ' ' in name:  # Valid name should have space and be reasonable length
                 metadata['user_name'] = name
-                print(f"Found user name (Method 2): {metadata['user_name']}")
+                parser_logger.debug("Found user name (Method 2): %s", metadata['user_name'])
                 break
         
         # Method 3: Look for name right after date pattern (debit format)
         # Example: "JANE AGBAOHWO                                For Jul 1 to Jul 31, 2024"
-        date_with_name = re.search(r'^([A-Z\s]+?)\s+For\s+(\w+\s+\d+\s+to\s+\w+\s+\d+,?\s+\d{4})', line, re.IGNORECASE)
+        date_with_name = NAME_WITH_PERIOD_RE.search(line)
         if date_with_name:
             name = date_with_name.group(1).strip()
             if len(name) > 5 and ' ' in name:
                 metadata['user_name'] = name
-                print(f"Found user name (Method 3): {metadata['user_name']}")
+                parser_logger.debug("Found user name (Method 3): %s", metadata['user_name'])
                 # Also extract the date from this line
                 date_part = date_with_name.group(2)
-                period_match = re.search(r'(\w+)\s+(\d+)\s*to\s*(\w+)\s+(\d+),?\s*(\d{4})', date_part, re.IGNORECASE)
+                period_match = STATEMENT_PERIOD_RE.search(date_part)
                 if period_match:
                     start_month, start_day, end_month, end_day, year = period_match.groups()
                     metadata['statement_start'] = f"{start_month} {start_day}"
@@ -448,10 +889,10 @@ def extract_pdf_metadata(text: str) -> dict:
     
     # Look for statement period if not found above
     if not metadata['statement_year']:
-        for line in lines[:20]:
+        for line in lines[:STATEMENT_HEADER_LINES]:
             line = line.strip()
             # Pattern: "October 16to November 15, 2024" or "October 16 to November 15, 2024"
-            period_match = re.search(r'(\w+)\s+(\d+)\s*to\s*(\w+)\s+(\d+),?\s*(\d{4})', line, re.IGNORECASE)
+            period_match = STATEMENT_PERIOD_RE.search(line)
             if period_match:
                 start_month, start_day, end_month, end_day, year = period_match.groups()
                 metadata['statement_start'] = f"{start_month} {start_day}"
@@ -460,7 +901,7 @@ def extract_pdf_metadata(text: str) -> dict:
                 break
             
             # Alternative pattern: "November 15, 2024" for statement date
-            date_match = re.search(r'(\w+)\s+(\d+),?\s*(\d{4})', line)
+            date_match = STATEMENT_DATE_RE.search(line)
             if date_match and 'statement' in line.lower():
                 month, day, year = date_match.groups()
                 metadata['statement_end'] = f"{month} {day}"
@@ -468,30 +909,8 @@ def extract_pdf_metadata(text: str) -> dict:
     
     return metadata
 
-def parse_transactions_from_text(text: str, user_id: str, source_filename: str = None) -> List[dict]:
-    """Parse transactions from extracted PDF text - enhanced for multiple bank formats"""
-    transactions = []
-    
-    # Extract metadata first
-    metadata = extract_pdf_metadata(text)
-    statement_year = metadata.get('statement_year', datetime.now().year)
-    user_name = metadata.get('user_name', 'Unknown User')
-    
-    print(f"Extracted metadata: User: {user_name}, Year: {statement_year}")
-    
-    # Enhanced patterns for CIBC format specifically
-    # The correct format should be: Trans Date, Post Date, Description, Category, Amount
-    patterns = [
-        # Main CIBC pattern - Trans Date, Post Date, Description, Spend Category, Amount
-        r'(\w{3}\s+\d{1,2})\s+(\w{3}\s+\d{1,2})\s+([A-Z0-9\s\#\*\.\-\/\&\(\)]+?)\s+([A-Za-z\s,&]+?)\s+(\d+\.\d{2})(?:\s|$)',
-        # Alternative pattern for transactions without clear category
-        r'(\w{3}\s+\d{1,2})\s+(\w{3}\s+\d{1,2})\s+([A-Z0-9\s\#\*\.\-\/\&\(\)]+?)\s+(\d+\.\d{2})(?:\s|$)',
-        # Catch remaining patterns
-        r'(\w{3}\s+\d{1,2})\s+([A-Z0-9\s\#\*\.\-\/\&\(\)]{10,})\s+(\d+\.\d{2})(?:\s|$)'
-    ]
-    
-def detect_statement_format(text: str) -> str:
-    """Detect the type of CIBC statement format"""
+def statement_format_scores(text: str) -> tuple:
+    """Count the debit and credit statement indicators found in the text"""
     text_upper = text.upper()
     
     # Check for debit account indicators
@@ -515,434 +934,422 @@ def detect_statement_format(text: str) -> str:
     
     debit_score = sum(1 for indicator in debit_indicators if indicator in text_upper)
     credit_score = sum(1 for indicator in credit_indicators if indicator in text_upper)
-    
-    print(f"Format detection - Debit score: {debit_score}, Credit score: {credit_score}")
+    return debit_score, credit_score
+
+def detect_statement_format(text: str) -> str:
+    """Detect the type of CIBC statement format"""
+    debit_score, credit_score = statement_format_scores(text)
+    parser_logger.debug("Format detection - Debit score: %d, Credit score: %d", debit_score, credit_score)
     
     if debit_score > credit_score:
         return 'debit'
     else:
         return 'credit'
 
-def parse_cibc_debit_transactions(text: str, user_id: str, source_filename: str, statement_year: int, user_name: str) -> List[dict]:
-    """Parse CIBC debit account transactions with table format"""
-    transactions = []
-    
-    print("Parsing CIBC debit format...")
-    
-    lines = text.split('\n')
-    in_transaction_section = False
-    
-    for line_num, line in enumerate(lines):
-        line = line.strip()
-        if not line:
+def new_parse_stats() -> dict:
+    """Counters the parsers fill in for the per-import summary"""
+    return {"lines_scanned": 0, "matches": 0, "table_pass_pages": 0, "skipped": defaultdict(int)}
+
+def merge_parse_stats(stats_list: List[dict]) -> dict:
+    """Add up the parse stats of several statements"""
+    merged = new_parse_stats()
+    for stats in stats_list:
+        for counter in ("lines_scanned", "matches", "table_pass_pages"):
+            merged[counter] += stats.get(counter, 0)
+        for reason, count in stats["skipped"].items():
+            merged["skipped"][reason] += count
+    return merged
+
+def new_parse_state(stats: Optional[dict] = None) -> dict:
+    """Parser state carried from one page batch to the next while a statement streams through.
+
+    metadata and format are taken from the statement header (see
+    iter_statement_transactions), whose pages wait in header_pages until it is
+    complete; the debit section flags and the dedup keys carry over so batches
+    parse like one text.
+    """
+    return {
+        "metadata": None,
+        "format": None,
+        "header_pages": [],
+        "in_transaction_section": False,
+        "finished": False,
+        "seen": set(),
+        "has_text": False,
+        "text_preview": "",
+        "stats": stats if stats is not None else new_parse_stats()
+    }
+
+def parse_statement_amount(amount_str: str) -> float:
+    """Parse a statement amount, treating a leading '-' or '(' as a credit"""
+    amount_str = amount_str.strip()
+    if amount_str.startswith('-') or amount_str.startswith('('):
+        return -float(amount_str.replace('-', '').replace('(', '').replace(')', '').strip())
+    return float(amount_str)
+
+def iter_statement_lines(pages, state: dict):
+    """Yield the stripped, non-empty lines of each page as the page arrives"""
+    for page in pages:
+        if page.strip():
+            state["has_text"] = True
+        if len(state["text_preview"]) <= 500:
+            state["text_preview"] += page[:501 - len(state["text_preview"])]
+        for line in page.split('\n'):
+            line = line.strip()
+            if line:
+                yield line
+
+def iter_credit_rows(lines, state: dict):
+    """Yield (trans_date, description, category, amount) strings for credit card transaction lines"""
+    stats = state["stats"]
+    skipped = stats["skipped"]
+    debug = parser_logger.isEnabledFor(logging.DEBUG)
+    
+    for line in lines:
+        stats["lines_scanned"] += 1
+        if len(line) < 15:
+            skipped["short_line"] += 1
             continue
             
-        # Look for transaction details section
-        if 'transaction details' in line.lower():
-            in_transaction_section = True
-            print(f"Found transaction details section at line {line_num}")
-            continue
+        # Trace every non-empty line to catch missing transactions
+        if debug:
+            parser_logger.debug("LINE: %s", line)
             
-        # Skip header lines
-        if any(header in line.upper() for header in ['DATE', 'DESCRIPTION', 'WITHDRAWALS', 'DEPOSITS', 'BALANCE']):
+        # Skip header lines and section headers, and spot transaction candidates
+        line_kind, skip_reason = classify_credit_line(line)
+        
+        if line_kind == 'header':
+            skipped["header"] += 1
+            if debug:
+                parser_logger.debug("SKIPPED HEADER: %s (Reason: %s)", line, skip_reason)
             continue
+        
+        # More aggressive transaction detection
+        # Any line with a month abbreviation followed by digits AND a decimal amount
+        if line_kind == 'candidate':
+            if debug:
+                parser_logger.debug("FOUND TRANSACTION LINE: %s", line)
             
-        # Stop at end indicators
-        if any(end_marker in line.lower() for end_marker in ['closing balance', 'important:', 'free transaction']):
-            break
-            
-        if in_transaction_section and line:
-            # Try to parse debit transaction line
-            # Format: Date | Description | Withdrawals | Deposits | Balance
-            
-            # Look for date pattern at start of line
-            date_match = re.match(r'^(\w{3}\s+\d{1,2})', line)
-            if not date_match:
-                continue
+            # Strategy 1: Amount at the end approach (most reliable)
+            amount_matches = GROUPED_AMOUNT_RE.findall(line)
+            if amount_matches:
+                # Take the last amount as the transaction amount
+                amount_str = amount_matches[-1]
                 
-            date_str = date_match.group(1)
-            remaining_line = line[len(date_str):].strip()
-            
-            # Look for amounts (withdrawals, deposits, balance)
-            # Balance is usually at the end
-            balance_match = re.search(r'(\d+\.\d{2})\s*$', remaining_line)
-            if not balance_match:
-                continue
+                # Remove commas from amount before converting to float
+                clean_amount_str = amount_str.replace(',', '')
                 
-            balance_amount = balance_match.group(1)
-            line_without_balance = remaining_line[:balance_match.start()].strip()
-            
-            # Look for withdrawal or deposit amount before balance
-            amount_pattern = r'(\d+\.\d{2})\s+(\d+\.\d{2})?'
-            amounts = re.findall(r'(\d+\.\d{2})', line_without_balance)
-            
-            if not amounts:
-                continue
+                # Find where this amount starts in the line
+                amount_pos = line.rfind(amount_str)
+                line_without_amount = line[:amount_pos].strip()
                 
-            # The transaction amount is typically the first amount found
-            # Enhanced to handle negative amounts and credits
-            amount_str = amounts[0].strip()
-            
-            # Check for negative sign (indicates credit/deposit)
-            is_credit = False
-            if amount_str.startswith('-') or amount_str.startswith('('):
-                is_credit = True
-                amount_str = amount_str.replace('-', '').replace('(', '').replace(')', '').strip()
-            
-            transaction_amount = float(amount_str)
-            
-            # For debit accounts: negative usually means deposit/credit, positive means withdrawal/debit
-            if is_credit:
-                transaction_amount = -transaction_amount
-                print(f"💳 DEBIT CREDIT/DEPOSIT detected: ${abs(transaction_amount)} (stored as negative)")
-            else:
-                print(f"💰 DEBIT WITHDRAWAL detected: ${transaction_amount} (stored as positive)")
+                # Extract dates from the beginning
+                date_pattern = TRANS_POST_DATES_RE.match(line_without_amount)
+                if date_pattern:
+                    trans_date_str, post_date_str, description_and_category = date_pattern.groups()
+                    
+                    # Clean up the description and category part
+                    desc_and_cat = description_and_category.strip()
+                    
+                    # Skip payment transactions - these are not expenses
+                    if PAYMENT_KEYWORDS_RE.search(desc_and_cat.upper()):
+                        skipped["payment"] += 1
+                        if debug:
+                            parser_logger.debug("SKIPPED PAYMENT: %s", desc_and_cat)
+                        continue
+                    
+                    # Try to identify where description ends and category begins
+                    category_str = ""
+                    description = desc_and_cat
+                    
+                    # Try to find category at the end
+                    for cat in KNOWN_CATEGORIES:
+                        if desc_and_cat.endswith(cat):
+                            category_str = cat
+                            description = desc_and_cat[:-len(cat)].strip()
+                            break
+                    
+                    # If no category found, try to extract from spacing patterns
+                    if not category_str:
+                        # Look for multiple spaces that might separate description from category
+                        parts = COLUMN_GAP_RE.split(desc_and_cat)
+                        if len(parts) >= 2:
+                            description = parts[0].strip()
+                            category_str = ' '.join(parts[1:]).strip()
+                    
+                    if debug:
+                        parser_logger.debug("EXTRACTED: Date=%s, Desc='%s', Cat='%s', Amt=%s (original: %s)", trans_date_str, description, category_str, clean_amount_str, amount_str)
+                    yield trans_date_str, description, category_str, clean_amount_str
+                    continue
+                
+                if '|' not in line:
+                    skipped["no_dates"] += 1
+                if debug:
+                    parser_logger.debug("Could not extract dates from: %s", line_without_amount)
+        
+        # Alternative pattern for table rows with | separators
+        if '|' in line and line_kind in ('candidate', 'table_row'):
+            if debug:
+                parser_logger.debug("TABLE ROW: %s", line)
+            parts = [p.strip() for p in line.split('|')]
+            if len(parts) >= 5:
+                # Assume format: trans_date | post_date | description | category | amount
+                amount_match = DECIMAL_AMOUNT_RE.search(parts[-1])
+                if amount_match:
+                    yield parts[0], parts[2], parts[3], amount_match.group(1)
+
+def iter_credit_transactions(rows, user_id: str, source_filename: str, state: dict):
+    """Turn credit card rows into transaction dicts"""
+    stats = state["stats"]
+    skipped = stats["skipped"]
+    debug = parser_logger.isEnabledFor(logging.DEBUG)
+    statement_year = state["metadata"].get('statement_year', datetime.now().year)
+    user_name = state["metadata"].get('user_name', 'Unknown User')
+    
+    # Create enhanced source name
+    enhanced_source = generate_source_name(user_name, 'credit', source_filename)
+    
+    for trans_date_str, description, category_str, amount_str in rows:
+        try:
+            # Parse amount - Enhanced to handle negative amounts and credits
+            amount = parse_statement_amount(amount_str)
             
-            # Extract description (everything between date and amounts)
-            desc_end_pos = line_without_balance.rfind(amounts[0])
-            if desc_end_pos == -1:
+            if abs(amount) < 0.01 or abs(amount) > 50000:
+                skipped["amount_out_of_range"] += 1
+                if debug:
+                    parser_logger.debug("Skipping amount %s (out of range)", amount)
                 continue
-                
-            description = line_without_balance[:desc_end_pos].strip()
             
-            # Clean up description
-            description = re.sub(r'\s+', ' ', description)
+            # Clean description
+            description = WHITESPACE_RE.sub(' ', description.strip())
             
-            # Skip if description is too short or looks like header
-            if len(description) < 5:
-                continue
-                
-            # Skip certain transaction types
-            skip_keywords = ['balance forward', 'opening balance', 'service charge']
-            if any(keyword in description.lower() for keyword in skip_keywords):
-                continue
-                
-            # Parse date
-            transaction_date = parse_date_string(date_str, statement_year)
+            # Parse transaction date (use trans_date, not post_date!)
+            transaction_date = parse_date_string(trans_date_str, statement_year)
             if not transaction_date:
+                skipped["bad_date"] += 1
+                if debug:
+                    parser_logger.debug("Failed to parse date: %s", trans_date_str)
                 continue
-                
-            # Categorize transaction
-            category = clean_category("", description)
-            
-            # Create enhanced source name
-            enhanced_source = generate_source_name(user_name, 'debit', source_filename)
             
-            # Create transaction
-            transaction = {
-                'date': transaction_date.isoformat(),
-                'description': description,
-                'category': category,
-                'amount': transaction_amount,
-                'account_type': 'debit',
-                'user_id': user_id,
-                'pdf_source': enhanced_source,
-                'user_name': user_name
-            }
-            
-            transactions.append(transaction)
-            print(f"✅ DEBIT ADDED: {description} -> ${transaction_amount} on {transaction_date} ({category})")
-    
-    return transactions
-
-def parse_transactions_from_text(text: str, user_id: str, source_filename: str = None) -> List[dict]:
-    """Parse transactions from extracted PDF text - enhanced for multiple CIBC formats"""
-    transactions = []
-    
-    # Extract metadata first
-    metadata = extract_pdf_metadata(text)
-    statement_year = metadata.get('statement_year', datetime.now().year)
-    user_name = metadata.get('user_name', 'Unknown User')
-    
-    print(f"Extracted metadata: User: {user_name}, Year: {statement_year}")
-    
-    # Detect statement format
-    format_type = detect_statement_format(text)
-    print(f"Detected format: {format_type}")
-    
-    if format_type == 'debit':
-        # Use debit parsing logic
-        transactions = parse_cibc_debit_transactions(text, user_id, source_filename, statement_year, user_name)
-        print(f"\n=== DEBIT PARSING COMPLETE: {len(transactions)} transactions found ===")
-        return remove_duplicates(transactions)
-    
-    # Original credit card parsing logic
-    sections = text.split('--- PAGE')
-    
-    for section_num, section in enumerate(sections):
-        if not section.strip():
+            # Clean and categorize
+            category = clean_category(category_str, description)
+        
+        except Exception as e:
+            skipped["error"] += 1
+            parser_logger.warning("Error processing transaction: %s", e)
             continue
-            
-        print(f"\n=== PROCESSING SECTION {section_num} ===")
-        print(f"Section preview: {section[:500]}...")
         
-        lines = section.split('\n')
+        stats["matches"] += 1
+        if debug:
+            parser_logger.debug("ADDED: %s -> $%s on %s (%s)", description, amount, transaction_date, category)
         
-        for line_num, line in enumerate(lines):
-            line = line.strip()
-            if not line or len(line) < 15:
-                continue
-                
-            # Debug: Print every non-empty line to catch missing transactions
-            print(f"LINE {line_num}: {line}")
-                
-            # Skip header lines and section headers - be more specific
-            skip_line = False
-            line_upper = line.upper()
-            
-            # Only skip if the line is clearly a header (contains multiple header keywords or exact matches)
-            # Use word boundaries to avoid false positives (e.g., "LOVISA" containing "VISA")
-            header_keywords = [r'\bCARD NUMBER\b', r'\bPAGE\b', r'\bCIBC\b', r'\bDIVIDEND\b', r'\bVISA\b', r'\bYOUR PAYMENTS\b', r'\bYOUR NEW CHARGES\b']
-            table_headers = ['TRANS   POST', 'DATE    DATE', 'SPEND CATEGORIES', 'AMOUNT($)']
+        yield {
+            'date': transaction_date.isoformat(),
+            'description': description,
+            'category': category,
+            'amount': amount,
+            'account_type': 'credit_card',
+            'user_id': user_id,
+            'pdf_source': enhanced_source,
+            'user_name': user_name
+        }
+
+def iter_debit_rows(lines, state: dict):
+    """Yield (date, description, amount) strings from the CIBC debit transaction details table"""
+    stats = state["stats"]
+    skipped = stats["skipped"]
+    
+    for line in lines:
+        if state["finished"]:
+            return
+        stats["lines_scanned"] += 1
             
-            # Skip if it's clearly a header line
-            skip_reason = None
-            if any(re.search(header, line_upper) for header in header_keywords):
-                skip_line = True
-                matching_headers = [h for h in header_keywords if re.search(h, line_upper)]
-                skip_reason = f"Contains header keyword: {matching_headers}"
-            elif any(header in line_upper for header in table_headers):
-                skip_line = True
-                skip_reason = f"Contains table header: {[h for h in table_headers if h in line_upper]}"
-            elif line_upper.strip() in ['TRANS', 'POST', 'DESCRIPTION', 'AMOUNT', 'SPEND CATEGORIES']:
-                skip_line = True
-                skip_reason = f"Exact match header: {line_upper.strip()}"
+        # Look for transaction details section
+        if 'transaction details' in line.lower():
+            state["in_transaction_section"] = True
+            parser_logger.debug("Found transaction details section")
+            continue
             
-            # Special debug for Lovisa line
-            if 'lovisa' in line.lower():
-                print(f"🔍 LOVISA DEBUG: skip_line={skip_line}, skip_reason={skip_reason}")
-                print(f"🔍 LOVISA LINE_UPPER: '{line_upper}'")
-                print(f"🔍 LOVISA HEADER_KEYWORDS: {[h for h in header_keywords if h in line_upper]}")
-                print(f"🔍 LOVISA TABLE_HEADERS: {[h for h in table_headers if h in line_upper]}")
+        # Skip header lines
+        if DEBIT_HEADERS_RE.search(line.upper()):
+            skipped["header"] += 1
+            continue
             
-            if skip_line:
-                print(f"SKIPPED HEADER: {line} (Reason: {skip_reason})")
-                continue
+        # Stop at end indicators
+        if DEBIT_END_MARKERS_RE.search(line.lower()):
+            state["finished"] = True
+            return
             
-            # More aggressive transaction detection
-            # Any line with a month abbreviation followed by digits AND a decimal amount
-            has_month_day = re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}', line)
-            has_decimal_amount = re.search(r'\d+\.\d{2}', line)
+        if not state["in_transaction_section"]:
+            continue
+        
+        # Format: Date | Description | Withdrawals | Deposits | Balance
+        
+        # Look for date pattern at start of line
+        date_match = LEADING_DATE_RE.match(line)
+        if not date_match:
+            skipped["no_date"] += 1
+            continue
             
-            # Additional check: if line contains "Lovisa" specifically, flag it for debugging
-            if 'lovisa' in line.lower():
-                print(f"🔍 FOUND LOVISA LINE: {line}")
-                print(f"   Has month/day: {bool(has_month_day)}")
-                print(f"   Has decimal amount: {bool(has_decimal_amount)}")
+        date_str = date_match.group(1)
+        remaining_line = line[len(date_str):].strip()
+        
+        # Look for amounts (withdrawals, deposits, balance)
+        # Balance is usually at the end
+        balance_match = TRAILING_AMOUNT_RE.search(remaining_line)
+        if not balance_match:
+            skipped["no_amount"] += 1
+            continue
             
-            transaction_match = None  # Initialize here
+        line_without_balance = remaining_line[:balance_match.start()].strip()
+        
+        # Look for withdrawal or deposit amount before balance
+        amounts = DECIMAL_AMOUNT_RE.findall(line_without_balance)
+        
+        if not amounts:
+            skipped["no_amount"] += 1
+            continue
+        
+        # Extract description (everything between date and amounts)
+        desc_end_pos = line_without_balance.rfind(amounts[0])
+        if desc_end_pos == -1:
+            continue
             
-            if has_month_day and has_decimal_amount:
-                print(f"FOUND TRANSACTION LINE {line_num}: {line}")
-                
-                transaction_match = None
-                
-                # Strategy 1: Amount at the end approach (most reliable)
-                amount_matches = re.findall(r'(\d{1,3}(?:,\d{3})*\.\d{2})', line)
-                if amount_matches:
-                    # Take the last amount as the transaction amount
-                    amount_str = amount_matches[-1]
-                    
-                    # Remove commas from amount before converting to float
-                    clean_amount_str = amount_str.replace(',', '')
-                    
-                    # Find where this amount starts in the line
-                    amount_pos = line.rfind(amount_str)
-                    line_without_amount = line[:amount_pos].strip()
-                    
-                    # Extract dates from the beginning
-                    date_pattern = re.match(r'(\w{3}\s+\d{1,2})\s+(\w{3}\s+\d{1,2})\s+(.+)', line_without_amount)
-                    if date_pattern:
-                        trans_date_str, post_date_str, description_and_category = date_pattern.groups()
-                        
-                        # Clean up the description and category part
-                        desc_and_cat = description_and_category.strip()
-                        
-                        # Skip payment transactions - these are not expenses
-                        if any(payment_keyword in desc_and_cat.upper() for payment_keyword in [
-                            'PAYMENT THANK YOU', 'PAIEMENT MERCI', 'PAYMENT - THANK YOU', 
-                            'THANK YOU FOR YOUR PAYMENT', 'PAYMENT RECEIVED'
-                        ]):
-                            print(f"SKIPPED PAYMENT: {desc_and_cat}")
-                            continue
-                        
-                        # Try to identify where description ends and category begins
-                        category_str = ""
-                        description = desc_and_cat
-                        
-                        # Known categories (longest first to avoid partial matches)
-                        known_categories = [
-                            'Foreign Currency Transactions',
-                            'Hotel, Entertainment and Recreation', 
-                            'Professional and Financial Services',
-                            'Home and Office Improvement',
-                            'Personal and Household Expenses',
-                            'Health and Education',
-                            'Retail and Grocery',
-                            'Transportation',
-                            'Restaurants'
-                        ]
-                        
-                        # Try to find category at the end
-                        for cat in known_categories:
-                            if desc_and_cat.endswith(cat):
-                                category_str = cat
-                                description = desc_and_cat[:-len(cat)].strip()
-                                break
-                        
-                        # If no category found, try to extract from spacing patterns
-                        if not category_str:
-                            # Look for multiple spaces that might separate description from category
-                            parts = re.split(r'\s{2,}', desc_and_cat)
-                            if len(parts) >= 2:
-                                description = parts[0].strip()
-                                category_str = ' '.join(parts[1:]).strip()
-                        
-                        transaction_match = (trans_date_str, post_date_str, description, category_str, clean_amount_str)
-                        print(f"EXTRACTED: Date={trans_date_str}, Desc='{description}', Cat='{category_str}', Amt={clean_amount_str} (original: {amount_str})")
-                    else:
-                        print(f"Could not extract dates from: {line_without_amount}")
-                
-                # If we found a transaction match, process it
+        description = line_without_balance[:desc_end_pos].strip()
+        
+        # Clean up description
+        description = WHITESPACE_RE.sub(' ', description)
+        
+        # Skip if description is too short or looks like header
+        if len(description) < 5:
+            skipped["short_description"] += 1
+            continue
             
-            # If we found a transaction match, process it
-            # If we found a transaction match, process it
-            if transaction_match:
-                try:
-                    # Handle both tuple and regex match objects
-                    if isinstance(transaction_match, tuple):
-                        trans_date_str, post_date_str, description, category_str, amount_str = transaction_match
-                    else:
-                        trans_date_str, post_date_str, description, category_str, amount_str = transaction_match.groups()
-                    
-                    print(f"PROCESSING: Trans={trans_date_str}, Post={post_date_str}, Desc='{description}', Cat='{category_str}', Amt={amount_str}")
-                except Exception as e:
-                    print(f"Error processing transaction match: {e}")
-                    continue
-                
-                try:
-                    # Parse amount - Enhanced to handle negative amounts and credits
-                    amount_str_clean = amount_str.strip()
-                    
-                    # Check for negative sign (indicates credit/payment)
-                    is_credit = False
-                    if amount_str_clean.startswith('-') or amount_str_clean.startswith('('):
-                        is_credit = True
-                        amount_str_clean = amount_str_clean.replace('-', '').replace('(', '').replace(')', '').strip()
-                    
-                    amount = float(amount_str_clean)
-                    
-                    # Apply negative for credits (payments, refunds)
-                    if is_credit:
-                        amount = -amount
-                        print(f"💳 CREDIT/PAYMENT detected: ${abs(amount)} (stored as negative)")
-                    else:
-                        print(f"💰 DEBIT/CHARGE detected: ${amount} (stored as positive)")
-                    
-                    if abs(amount) < 0.01 or abs(amount) > 50000:
-                        print(f"Skipping amount {amount} (out of range)")
-                        continue
-                    
-                    # Clean description
-                    description = re.sub(r'\s+', ' ', description.strip())
-                    
-                    # Parse transaction date (use trans_date, not post_date!)
-                    transaction_date = parse_date_string(trans_date_str, statement_year)
-                    if not transaction_date:
-                        print(f"Failed to parse date: {trans_date_str}")
-                        continue
-                    
-                    print(f"🗓️ DATE DEBUG: Input='{trans_date_str}' -> Parsed={transaction_date} -> Final ISO={transaction_date.isoformat()}")
-                    
-                    # Verify we're using transaction date, not post date
-                    post_date_parsed = parse_date_string(post_date_str, statement_year)
-                    if post_date_parsed:
-                        print(f"🔍 COMPARISON: Transaction={transaction_date} vs Post={post_date_parsed} (using Transaction date)")
-                    
-                    # Clean and categorize
-                    category = clean_category(category_str, description)
-                    
-                    # Create enhanced source name
-                    enhanced_source = generate_source_name(user_name, 'credit', source_filename)
-                    
-                    # Create transaction
-                    transaction = {
-                        'date': transaction_date.isoformat(),
-                        'description': description,
-                        'category': category,
-                        'amount': amount,
-                        'account_type': 'credit_card',
-                        'user_id': user_id,
-                        'pdf_source': enhanced_source,
-                        'user_name': user_name
-                    }
-                    
-                    transactions.append(transaction)
-                    print(f"✅ ADDED: {description} -> ${amount} on {transaction_date} ({category})")
-                    
-                except Exception as e:
-                    print(f"❌ Error processing transaction: {e}")
-                    continue
+        # Skip certain transaction types
+        if DEBIT_SKIP_RE.search(description.lower()):
+            skipped["non_transaction"] += 1
+            continue
+        
+        # The transaction amount is typically the first amount found
+        yield date_str, description, amounts[0]
+
+def iter_debit_transactions(rows, user_id: str, source_filename: str, state: dict):
+    """Turn CIBC debit rows into transaction dicts"""
+    stats = state["stats"]
+    skipped = stats["skipped"]
+    debug = parser_logger.isEnabledFor(logging.DEBUG)
+    statement_year = state["metadata"].get('statement_year', datetime.now().year)
+    user_name = state["metadata"].get('user_name', 'Unknown User')
+    
+    # Create enhanced source name
+    enhanced_source = generate_source_name(user_name, 'debit', source_filename)
+    
+    for date_str, description, amount_str in rows:
+        # For debit accounts: negative usually means deposit/credit, positive means withdrawal/debit
+        transaction_amount = parse_statement_amount(amount_str)
+        
+        # Parse date
+        transaction_date = parse_date_string(date_str, statement_year)
+        if not transaction_date:
+            skipped["bad_date"] += 1
+            continue
             
-            # Alternative pattern for table rows with | separators
-            elif '|' in line and re.search(r'\d+\.\d{2}', line):
-                print(f"TABLE ROW: {line}")
-                parts = [p.strip() for p in line.split('|')]
-                if len(parts) >= 5:
-                    try:
-                        # Assume format: trans_date | post_date | description | category | amount
-                        trans_date_str = parts[0]
-                        description = parts[2] if len(parts) > 2 else ""
-                        category_str = parts[3] if len(parts) > 3 else ""
-                        amount_str = parts[-1]  # Last part should be amount
-                        
-                        # Extract numeric amount
-                        amount_match = re.search(r'(\d+\.\d{2})', amount_str)
-                        if amount_match:
-                            amount = float(amount_match.group(1))
-                            
-                            transaction_date = parse_date_string(trans_date_str, statement_year)
-                            if transaction_date and amount > 0.01:
-                                # Create enhanced source name
-                                enhanced_source = generate_source_name(user_name, 'credit', source_filename)
-                                
-                                transaction = {
-                                    'date': transaction_date.isoformat(),
-                                    'description': description.strip(),
-                                    'category': category,
-                                    'amount': amount,
-                                    'account_type': 'credit_card',
-                                    'user_id': user_id,
-                                    'pdf_source': enhanced_source,
-                                    'user_name': user_name
-                                }
-                                
-                                transactions.append(transaction)
-                                print(f"✅ TABLE ADDED: {description} -> ${amount} on {transaction_date}")
-                                
-                    except Exception as e:
-                        print(f"❌ Error processing table row: {e}")
-                        continue
-    
-    print(f"\n=== TOTAL TRANSACTIONS FOUND: {len(transactions)} ===")
+        # Categorize transaction
+        category = clean_category("", description)
+        
+        stats["matches"] += 1
+        if debug:
+            parser_logger.debug("DEBIT ADDED: %s -> $%s on %s (%s)", description, transaction_amount, transaction_date, category)
+        
+        yield {
+            'date': transaction_date.isoformat(),
+            'description': description,
+            'category': category,
+            'amount': transaction_amount,
+            'account_type': 'debit',
+            'user_id': user_id,
+            'pdf_source': enhanced_source,
+            'user_name': user_name
+        }
+
+def iter_unique_transactions(transactions, state: dict):
+    """Drop repeated transactions as they stream past"""
+    seen = state["seen"]
+    skipped = state["stats"]["skipped"]
     
-    # Remove duplicates
-    unique_transactions = remove_duplicates(transactions)
+    for transaction in transactions:
+        # Create key using date, first few words of description, and amount
+        desc_key = ' '.join(transaction['description'].split()[:3])
+        key = (transaction['date'], desc_key, transaction['amount'])
+        
+        if key in seen:
+            skipped["duplicate"] += 1
+            continue
+        seen.add(key)
+        yield transaction
+
+def iter_statement_transactions(pages, user_id: str, source_filename: str = None,
+                                state: Optional[dict] = None, final: bool = True):
+    """Stream transactions out of extracted pages: pages -> lines -> rows -> transactions.
+
+    Metadata and the statement format come from the header: pages are held
+    back until they cover the lines extract_pdf_metadata reads and contain a
+    format indicator, so a cover page or a short first page falls through to
+    the next pages. Passing the same state to the next call continues the same
+    statement, so a PDF can be parsed one page batch at a time; final marks
+    the last batch, which parses whatever header was found.
+    """
+    state = state if state is not None else new_parse_state()
+    pages = iter(pages)
+    
+    if state["metadata"] is None:
+        header_pages = state["header_pages"]
+        for page in pages:
+            header_pages.append(page)
+            header = "".join(header_pages)
+            if header.count("\n") >= STATEMENT_HEADER_LINES and statement_format_scores(header) != (0, 0):
+                break
+        else:
+            if not final:
+                return
+        state["header_pages"] = []
+        header = "".join(header_pages)
+        if not header.strip():
+            return
+        pages = itertools.chain(header_pages, pages)
+        
+        # Extract metadata first
+        state["metadata"] = extract_pdf_metadata(header)
+        parser_logger.debug("Extracted metadata: User: %s, Year: %s",
+                            state["metadata"].get('user_name', 'Unknown User'),
+                            state["metadata"].get('statement_year', datetime.now().year))
+        
+        # Detect statement format
+        state["format"] = detect_statement_format(header)
+        parser_logger.debug("Detected format: %s", state["format"])
+    
+    lines = iter_statement_lines(pages, state)
+    if state["format"] == 'debit':
+        parser_logger.debug("Parsing CIBC debit format...")
+        transactions = iter_debit_transactions(iter_debit_rows(lines, state), user_id, source_filename, state)
+    else:
+        transactions = iter_credit_transactions(iter_credit_rows(lines, state), user_id, source_filename, state)
     
-    return unique_transactions
+    yield from iter_unique_transactions(transactions, state)
+
+def parse_transactions_from_text(text: str, user_id: str, source_filename: str = None, stats: Optional[dict] = None) -> List[dict]:
+    """Parse transactions from extracted PDF text - enhanced for multiple CIBC formats"""
+    transactions = list(iter_statement_transactions([text], user_id, source_filename, new_parse_state(stats)))
+    parser_logger.debug("TOTAL TRANSACTIONS FOUND: %d", len(transactions))
+    return transactions
 
 def parse_date_string(date_str: str, statement_year: int) -> date:
     """Parse date string like 'Oct 22' with given year"""
     try:
-        month_map = {
-            'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-            'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-        }
-        
         parts = date_str.strip().split()
         if len(parts) == 2:
             month_name, day = parts
-            month = month_map.get(month_name[:3], None)
+            month = MONTH_MAP.get(month_name[:3], None)
             if month:
                 # If no statement year provided, use current year or 2024 for reasonable defaults
                 year = statement_year if statement_year else 2024
@@ -959,62 +1366,217 @@ def parse_date_string(date_str: str, statement_year: int) -> date:
                         year = current_year
                 
                 # Create date object - this should be the EXACT transaction date
-                parsed_date = date(year, month, int(day))
-                print(f"Date parsing: '{date_str}' -> {parsed_date} (year context: {year})")
-                return parsed_date
+                return date(year, month, int(day))
     except Exception as e:
-        print(f"Date parsing error for '{date_str}': {e}")
+        parser_logger.debug("Date parsing error for '%s': %s", date_str, e)
     return None
 
+# Built-in keyword rules, in priority order: the first category with a keyword in the description wins
+DEFAULT_CATEGORY_RULES = {
+    'Retail and Grocery': ['superstore', 'grocery', 'dollarama', 'walmart', 'costco', 'loblaws', 'metro', 'sobeys', 'john & ross', 't&t'],
+    'Restaurants': ['restaurant', 'coffee', 'starbucks', 'tim hortons', 'mcdonalds', 'pizza', 'food', 'dining', 'cafe', 'a&w', 'forest lawn'],
+    'Transportation': ['lyft', 'uber', 'taxi', 'gas', 'petro', 'shell', 'esso', 'transit', 'ride'],
+    'Home and Office Improvement': ['home depot', 'lowes', 'staples', 'canadian tire', 'ikea', 'office', 'stokes'],
+    'Hotel, Entertainment and Recreation': ['hotel', 'movie', 'netflix', 'spotify', 'apple.com', 'entertainment', 'apple.com/bill'],
+    'Professional and Financial Services': ['bank', 'fee', 'transfer', 'mortgage', 'insurance', 'legal', 'openai', 'chatgpt'],
+    'Health and Education': ['pharmacy', 'doctor', 'dental', 'hospital', 'school', 'university'],
+    'Foreign Currency Transactions': ['foreign', 'currency', 'exchange', 'international', 'usd']
+}
+
+class CategoryMatcher:
+    """Ordered (keyword, category) rules compiled into an Aho-Corasick automaton.
+
+    One pass over a description visits every keyword occurrence; each state
+    records the best (lowest) rule index among the keywords ending there, so
+    the result is the first rule whose keyword appears anywhere.
+    """
+
+    def __init__(self, rules: List[tuple]):
+        self.categories = [category for _, category in rules]
+        no_match = len(rules)
+        
+        # Keyword trie
+        transitions = [{}]
+        best_rule = [no_match]
+        for index, (keyword, _) in enumerate(rules):
+            state = 0
+            for char in keyword.lower():
+                if char not in transitions[state]:
+                    transitions.append({})
+                    best_rule.append(no_match)
+                    transitions[state][char] = len(transitions) - 1
+                state = transitions[state][char]
+            best_rule[state] = min(best_rule[state], index)
+        
+        # Breadth-first, fold each state's failure link into its transitions
+        # and best rule so matching is a single dict lookup per character
+        fail = [0] * len(transitions)
+        self.transitions = [None] * len(transitions)
+        self.transitions[0] = dict(transitions[0])
+        queue = deque(transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            best_rule[state] = min(best_rule[state], best_rule[fail[state]])
+            self.transitions[state] = {**self.transitions[fail[state]], **transitions[state]}
+            for char, child in transitions[state].items():
+                fail[child] = self.transitions[fail[state]].get(char, 0)
+                queue.append(child)
+        self.best_rule = best_rule
+        self.no_match = no_match
+
+    def match(self, description: str) -> Optional[str]:
+        transitions = self.transitions
+        best_rule = self.best_rule
+        best = self.no_match
+        state = 0
+        for char in description.lower():
+            state = transitions[state].get(char, 0)
+            if best_rule[state] < best:
+                best = best_rule[state]
+                if best == 0:
+                    break
+        return self.categories[best] if best < self.no_match else None
+
+DEFAULT_CATEGORY_MATCHER = CategoryMatcher([
+    (keyword, category) for category, keywords in DEFAULT_CATEGORY_RULES.items() for keyword in keywords
+])
+
 def clean_category(category_str: str, description: str) -> str:
     """Clean and standardize category"""
-    # Category mapping
-    category_keywords = {
-        'Retail and Grocery': ['superstore', 'grocery', 'dollarama', 'walmart', 'costco', 'loblaws', 'metro', 'sobeys', 'john & ross', 't&t'],
-        'Restaurants': ['restaurant', 'coffee', 'starbucks', 'tim hortons', 'mcdonalds', 'pizza', 'food', 'dining', 'cafe', 'a&w', 'forest lawn'],
-        'Transportation': ['lyft', 'uber', 'taxi', 'gas', 'petro', 'shell', 'esso', 'transit', 'ride'],
-        'Home and Office Improvement': ['home depot', 'lowes', 'staples', 'canadian tire', 'ikea', 'office', 'stokes'],
-        'Hotel, Entertainment and Recreation': ['hotel', 'movie', 'netflix', 'spotify', 'apple.com', 'entertainment', 'apple.com/bill'],
-        'Professional and Financial Services': ['bank', 'fee', 'transfer', 'mortgage', 'insurance', 'legal', 'openai', 'chatgpt'],
-        'Health and Education': ['pharmacy', 'doctor', 'dental', 'hospital', 'school', 'university'],
-        'Foreign Currency Transactions': ['foreign', 'currency', 'exchange', 'international', 'usd']
-    }
-    
     # First try to use provided category if it looks valid
     if category_str and len(category_str.strip()) > 2:
-        category_clean = category_str.strip()
+        category_clean = category_str.strip().lower()
         # Check if it matches known categories
-        for known_cat in category_keywords.keys():
-            if known_cat.lower() in category_clean.lower():
+        for known_cat in DEFAULT_CATEGORY_RULES:
+            if known_cat.lower() in category_clean:
                 return known_cat
-    
+
     # Auto-categorize based on description
-    description_lower = description.lower()
-    
-    for cat, keywords in category_keywords.items():
-        if any(keyword in description_lower for keyword in keywords):
-            return cat
-    
-    return 'Personal and Household Expenses'  # Default
+    return DEFAULT_CATEGORY_MATCHER.match(description) or 'Personal and Household Expenses'  # Default
 
-def remove_duplicates(transactions: List[dict]) -> List[dict]:
-    """Remove duplicate transactions"""
-    seen = set()
-    unique_transactions = []
-    
-    for transaction in transactions:
-        # Create key using date, first few words of description, and amount
-        desc_key = ' '.join(transaction['description'].split()[:3])
-        key = (transaction['date'], desc_key, transaction['amount'])
-        
-        if key not in seen:
-            seen.add(key)
-            unique_transactions.append(transaction)
-        else:
-            print(f"Skipping duplicate: {transaction['description']} on {transaction['date']}")
-    
-    print(f"Total parsed: {len(transactions)}, Unique: {len(unique_transactions)}")
-    return unique_transactions
+# PDF extraction worker pool
+pdf_executor: Optional[ProcessPoolExecutor] = None
+pdf_pool_slots = asyncio.Semaphore(PDF_QUEUE_LIMIT)
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """Create the PDF worker pool on first use"""
+    global pdf_executor
+    if pdf_executor is None:
+        pdf_executor = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    return pdf_executor
+
+def pdf_page_count_task(file_content: bytes) -> dict:
+    """Count PDF pages inside a worker process.
+
+    HTTPException can't be pickled back to the parent, so extraction failures
+    are returned as an error string instead of raised.
+    """
+    try:
+        return {"page_count": count_pdf_pages(file_content)}
+    except HTTPException as e:
+        return {"error": e.detail}
+
+def pdf_page_range_task(file_content: bytes, start_page: int, end_page: int,
+                        user_id: str, source_filename: str, state: Optional[dict] = None, final: bool = True) -> dict:
+    """Stream one page range through extraction and parsing inside a worker process.
+
+    Pages are parsed as they are extracted, so a batch never holds more than
+    one page of text. The returned state is handed to the next batch.
+    """
+    state = state if state is not None else new_parse_state()
+    try:
+        pages = iter_pdf_pages(file_content, start_page, end_page, state["stats"])
+        transactions = list(iter_statement_transactions(pages, user_id, source_filename, state, final))
+    except HTTPException as e:
+        return {"error": e.detail}
+    return {"transactions": transactions, "state": state}
+
+def pdf_page_text_task(file_content: bytes, start_page: int, end_page: int) -> dict:
+    """Extract one page range inside a worker process, opening the PDF bytes independently"""
+    stats = {}
+    try:
+        pages = list(iter_pdf_pages(file_content, start_page, end_page, stats))
+    except HTTPException as e:
+        return {"error": e.detail}
+    return {"pages": pages, "table_pass_pages": stats["table_pass_pages"]}
+
+def pdf_parse_pages_task(pages: List[str], user_id: str, source_filename: str, state: dict, final: bool = True) -> dict:
+    """Parse already extracted pages inside a worker process, continuing from the given state"""
+    transactions = list(iter_statement_transactions(pages, user_id, source_filename, state, final))
+    return {"transactions": transactions, "state": state}
+
+async def run_in_pdf_pool(func, *args):
+    """Run a PDF task on the worker pool without blocking the event loop.
+
+    Only called from import jobs, which were already admitted by
+    queue_import_job, so a busy pool makes the task wait for a slot rather
+    than fail the job halfway through.
+    """
+    async with pdf_pool_slots:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(get_pdf_executor(), func, *args)
+
+    if isinstance(result, dict) and "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+# Extracted PDF cache
+class PdfExtractionCache:
+    """Parsed statement rows keyed by the SHA-256 of the uploaded bytes.
+
+    Entries live in a size-bounded in-memory LRU, backed by an optional
+    on-disk tier so re-uploads are still cheap after a restart.
+    """
+
+    def __init__(self, max_entries: int, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.entries: OrderedDict = OrderedDict()
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}.json"
+
+    def _read(self, digest: str) -> Optional[dict]:
+        try:
+            with open(self._path(digest)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, digest: str, entry: dict):
+        tmp_path = self._path(digest).with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(digest))
+
+    def _remember(self, digest: str, entry: dict):
+        self.entries[digest] = entry
+        self.entries.move_to_end(digest)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def get(self, digest: str) -> Optional[dict]:
+        entry = self.entries.get(digest)
+        if entry is not None:
+            self.entries.move_to_end(digest)
+            return entry
+        if self.cache_dir:
+            entry = await asyncio.to_thread(self._read, digest)
+            if entry is not None:
+                self._remember(digest, entry)
+        return entry
+
+    async def put(self, digest: str, entry: dict):
+        self._remember(digest, entry)
+        if self.cache_dir:
+            try:
+                await asyncio.to_thread(self._write, digest, entry)
+            except OSError as e:
+                logging.warning(f"Could not write PDF cache entry {digest}: {e}")
+
+pdf_cache = PdfExtractionCache(PDF_CACHE_SIZE, PDF_CACHE_DIR)
 
 # Initialize default categories
 DEFAULT_CATEGORIES = [
@@ -1092,6 +1654,7 @@ async def create_category(category: CategoryCreate, user_id: str = Depends(get_c
     category_dict['created_at'] = category_dict['created_at'].isoformat()
     
     await db.categories.insert_one(category_dict)
+    await analytics_cache.invalidate(user_id)
     return category_obj
 
 @api_router.put("/categories/{category_id}", response_model=Category)
@@ -1106,6 +1669,7 @@ async def update_category(category_id: str, category_update: CategoryUpdate, use
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Category not found")
     
+    await analytics_cache.invalidate(user_id)
     updated_category = await db.categories.find_one({"id": category_id, "user_id": user_id})
     return Category(**updated_category)
 
@@ -1125,8 +1689,161 @@ async def delete_category(category_id: str, user_id: str = Depends(get_current_u
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Category not found or cannot delete default category")
     
+    await analytics_cache.invalidate(user_id)
     return {"message": "Category deleted successfully"}
 
+# Per-user categorization rules, applied to imported statements ahead of the built-in ones
+class CategoryRuleCache:
+    """Each user's rules compiled into a CategoryMatcher, kept until they are edited"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+
+    async def get(self, user_id: str) -> Optional[CategoryMatcher]:
+        if user_id in self.entries:
+            self.entries.move_to_end(user_id)
+            return self.entries[user_id]
+
+        rules = await db.category_rules.find(
+            {"user_id": user_id}, {"_id": 0, "keyword": 1, "category": 1}
+        ).sort("created_at", 1).to_list(None)
+        matcher = CategoryMatcher([(rule["keyword"], rule["category"]) for rule in rules]) if rules else None
+        self.entries[user_id] = matcher
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return matcher
+
+    def invalidate(self, user_id: str):
+        self.entries.pop(user_id, None)
+
+category_rule_cache = CategoryRuleCache(1024)
+
+MERCHANT_REFERENCE_RE = re.compile(r'#\S*')
+MERCHANT_NUMBER_RE = re.compile(r'[\d./-]*\d[\d./-]*')
+
+def merchant_key(description: str) -> str:
+    """Normalize a description to its merchant: lowercase, without store numbers or reference codes.
+
+    Dropped are number tokens ("33", "866-712-7753"), "#" references and
+    everything after a "*" ("LYFT *RIDE THU 2PM"). The first word is the
+    brand and is always kept, so "7-ELEVEN STORE 33" becomes "7-eleven store".
+    """
+    words = MERCHANT_REFERENCE_RE.sub(' ', description.lower().split('*', 1)[0]).split()
+    return ' '.join(words[:1] + [word for word in words[1:] if not MERCHANT_NUMBER_RE.fullmatch(word)])
+
+class MerchantCategoryMemory:
+    """The category each user last chose per merchant, loaded from merchant_categories on first use"""
+
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self.entries: OrderedDict = OrderedDict()
+
+    async def get(self, user_id: str) -> dict:
+        if user_id in self.entries:
+            self.entries.move_to_end(user_id)
+            return self.entries[user_id]
+
+        docs = await db.merchant_categories.find({"user_id": user_id}, {"_id": 0, "merchant": 1, "category": 1}).to_list(None)
+        memory = {doc["merchant"]: doc["category"] for doc in docs}
+        self.entries[user_id] = memory
+        while len(self.entries) > self.max_users:
+            self.entries.popitem(last=False)
+        return memory
+
+    async def learn(self, user_id: str, descriptions: List[str], category: str):
+        merchants = {merchant_key(description) for description in descriptions} - {""}
+        if not merchants:
+            return
+        updated_at = datetime.utcnow()
+        await db.merchant_categories.bulk_write([
+            UpdateOne(
+                {"user_id": user_id, "merchant": merchant},
+                {"$set": {"category": category, "updated_at": updated_at}},
+                upsert=True
+            )
+            for merchant in merchants
+        ], ordered=False)
+        if user_id in self.entries:
+            self.entries[user_id].update(dict.fromkeys(merchants, category))
+
+merchant_memory = MerchantCategoryMemory(1024)
+
+async def apply_category_rules(user_id: str, transactions: List[dict]) -> List[dict]:
+    """Recategorize parsed transactions from the user's corrections, then their rules.
+
+    A merchant the user has recategorized before gets that category; other
+    descriptions matching one of the user's rules get the rule's category.
+    """
+    memory = await merchant_memory.get(user_id)
+    matcher = await category_rule_cache.get(user_id)
+    if not memory and matcher is None:
+        return transactions
+    categorized = []
+    for transaction in transactions:
+        category = memory.get(merchant_key(transaction["description"])) if memory else None
+        if category is None and matcher is not None:
+            category = matcher.match(transaction["description"])
+        categorized.append({**transaction, "category": category} if category else transaction)
+    return categorized
+
+def rule_keyword(keyword: str) -> str:
+    keyword = WHITESPACE_RE.sub(' ', keyword.strip().lower())
+    if not keyword:
+        raise HTTPException(status_code=400, detail="Rule keyword cannot be empty")
+    return keyword
+
+async def rule_category(user_id: str, category: str) -> str:
+    """A rule's category, which must be one of the user's categories (built-in or their own)"""
+    category = category.strip()
+    if not category:
+        raise HTTPException(status_code=400, detail="Rule category cannot be empty")
+    if category not in DEFAULT_CATEGORIES and not await db.categories.find_one({"user_id": user_id, "name": category}, {"_id": 1}):
+        raise HTTPException(status_code=400, detail=f"Unknown category: {category}")
+    return category
+
+@api_router.get("/category-rules", response_model=List[CategoryRule])
+async def get_category_rules(user_id: str = Depends(get_current_user_id)):
+    rules = await db.category_rules.find({"user_id": user_id}, {"_id": 0}).sort("created_at", 1).to_list(None)
+    return [CategoryRule(**rule) for rule in rules]
+
+@api_router.post("/category-rules", response_model=CategoryRule)
+async def create_category_rule(rule: CategoryRuleCreate, user_id: str = Depends(get_current_user_id)):
+    """Add a rule; rules are tried in creation order, before the built-in keywords"""
+    rule_obj = CategoryRule(keyword=rule_keyword(rule.keyword), category=await rule_category(user_id, rule.category), user_id=user_id)
+    await db.category_rules.insert_one(rule_obj.dict())
+    category_rule_cache.invalidate(user_id)
+    return rule_obj
+
+@api_router.put("/category-rules/{rule_id}", response_model=CategoryRule)
+async def update_category_rule(rule_id: str, rule_update: CategoryRuleUpdate, user_id: str = Depends(get_current_user_id)):
+    update_data = {}
+    if rule_update.keyword is not None:
+        update_data["keyword"] = rule_keyword(rule_update.keyword)
+    if rule_update.category is not None:
+        update_data["category"] = await rule_category(user_id, rule_update.category)
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No update data provided")
+
+    updated_rule = await db.category_rules.find_one_and_update(
+        {"id": rule_id, "user_id": user_id},
+        {"$set": update_data},
+        {"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if updated_rule is None:
+        raise HTTPException(status_code=404, detail="Rule not found")
+    category_rule_cache.invalidate(user_id)
+    return CategoryRule(**updated_rule)
+
+@api_router.delete("/category-rules/{rule_id}")
+async def delete_category_rule(rule_id: str, user_id: str = Depends(get_current_user_id)):
+    result = await db.category_rules.delete_one({"id": rule_id, "user_id": user_id})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Rule not found")
+    category_rule_cache.invalidate(user_id)
+    return {"message": "Rule deleted successfully"}
+
 # Transaction Management (Enhanced)
 @api_router.post("/transactions")
 async def create_transaction(
@@ -1158,23 +1875,31 @@ async def create_transaction(
                 transaction_doc["amount"] = abs(transaction_doc["amount"])
         
         await db.transactions.insert_one(transaction_doc)
+        await update_monthly_rollups(added=[transaction_doc])
+        await analytics_cache.invalidate(current_user_id)
         
         return {"message": "Transaction created successfully", "id": transaction_doc["id"]}
     except Exception as e:
         logging.error(f"Error creating transaction: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@api_router.get("/transactions", response_model=List[Transaction])
-async def get_transactions(
+# Fields older transaction documents may lack, filled in the way the Transaction model would
+TRANSACTION_DEFAULTS = {"account_type": "credit_card", "household_id": None, "pdf_source": None, "user_name": None}
+TRANSACTIONS_PAGE_MAX = 1000
+# Page size the dashboard loads when the client doesn't ask for one
+TRANSACTIONS_PAGE_SIZE = 200
+# Only the fields the Transaction model returns are read back to clients
+TRANSACTION_PROJECTION = {"_id": 0, **{field: 1 for field in Transaction.model_fields}}
+
+def transaction_filter(
+    user_id: str,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     category: Optional[str] = None,
     pdf_source: Optional[str] = None,
-    account_type: Optional[str] = None,
-    sort_by: Optional[str] = "date",
-    sort_order: Optional[str] = "desc",
-    user_id: str = Depends(get_current_user_id)
-):
+    account_type: Optional[str] = None
+) -> dict:
+    """Mongo filter for the listing and export endpoints' shared query parameters"""
     filter_dict = {"user_id": user_id}
     
     if start_date:
@@ -1190,13 +1915,101 @@ async def get_transactions(
         filter_dict["pdf_source"] = pdf_source
     if account_type:
         filter_dict["account_type"] = account_type
+    return filter_dict
+
+def encode_transactions_cursor(sort_field: str, sort_order: str, transaction: dict) -> str:
+    """Opaque cursor pointing just past the given transaction in (sort_field, id) order"""
+    position = {"sort_by": sort_field, "sort_order": sort_order, "value": transaction[sort_field], "id": transaction["id"]}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def decode_transactions_cursor(cursor: str, sort_field: str, sort_order: str) -> dict:
+    """Turn a cursor back into a keyset filter, rejecting cursors from another ordering"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value, last_id = position["value"], position["id"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if position.get("sort_by") != sort_field or position.get("sort_order") != sort_order:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+
+    operator = "$lt" if sort_order == "desc" else "$gt"
+    return {"$or": [{sort_field: {operator: value}}, {sort_field: value, "id": {operator: last_id}}]}
+
+async def load_transactions_page(
+    user_id: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None,
+    pdf_source: Optional[str] = None,
+    account_type: Optional[str] = None,
+    sort_by: Optional[str] = "date",
+    sort_order: Optional[str] = "desc",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False
+) -> dict:
+    """One keyset page of transactions ordered by (sort_by, id), at most TRANSACTIONS_PAGE_MAX rows.
+
+    Returns {"transactions", "next_cursor", "total"}; total is only counted
+    when include_total is set.
+    """
+    filter_dict = transaction_filter(user_id, start_date, end_date, category, pdf_source, account_type)
     
-    # Handle sorting
+    # Handle sorting, with id as the tie-breaker so pages never overlap
+    sort_order = "desc" if sort_order == "desc" else "asc"
     sort_direction = -1 if sort_order == "desc" else 1
     sort_field = sort_by if sort_by in ["date", "amount", "description", "category"] else "date"
+    sort_spec = [(sort_field, sort_direction), ("id", sort_direction)]
+    
+    page_size = min(max(limit or TRANSACTIONS_PAGE_MAX, 1), TRANSACTIONS_PAGE_MAX)
+    page_filter = filter_dict
+    if cursor:
+        page_filter = {"$and": [filter_dict, decode_transactions_cursor(cursor, sort_field, sort_order)]}
     
-    transactions = await db.transactions.find(filter_dict).sort(sort_field, sort_direction).to_list(1000)
-    return [Transaction(**transaction) for transaction in transactions]
+    # Fetch one extra row to know whether another page follows
+    transactions = await db.transactions.find(page_filter, TRANSACTION_PROJECTION).sort(sort_spec).to_list(page_size + 1)
+    next_cursor = None
+    if len(transactions) > page_size:
+        transactions = transactions[:page_size]
+        next_cursor = encode_transactions_cursor(sort_field, sort_order, transactions[-1])
+    
+    return {
+        "transactions": [{**TRANSACTION_DEFAULTS, **transaction} for transaction in transactions],
+        "next_cursor": next_cursor,
+        "total": await db.transactions.count_documents(filter_dict) if include_total else None
+    }
+
+@api_router.get("/transactions", response_model=Union[List[Transaction], TransactionPage])
+async def get_transactions(
+    response: Response,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None,
+    pdf_source: Optional[str] = None,
+    account_type: Optional[str] = None,
+    sort_by: Optional[str] = "date",
+    sort_order: Optional[str] = "desc",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    user_id: str = Depends(get_current_user_id)
+):
+    """List transactions.
+
+    With limit and/or cursor this returns one keyset page:
+    {"transactions", "next_cursor", "total"}. Without them it returns the
+    first TRANSACTIONS_PAGE_MAX transactions as a plain list, with the cursor
+    of the next page in the X-Next-Cursor header when there are more.
+    """
+    page = await load_transactions_page(
+        user_id, start_date, end_date, category, pdf_source, account_type,
+        sort_by, sort_order, limit, cursor, include_total
+    )
+    if limit is None and cursor is None:
+        if page["next_cursor"]:
+            response.headers["X-Next-Cursor"] = page["next_cursor"]
+        return page["transactions"]
+    return page
 
 @api_router.get("/transactions/sources")
 async def get_pdf_sources(user_id: str = Depends(get_current_user_id)):
@@ -1206,9 +2019,11 @@ async def get_pdf_sources(user_id: str = Depends(get_current_user_id)):
 
 @api_router.delete("/transactions/{transaction_id}")
 async def delete_transaction(transaction_id: str, user_id: str = Depends(get_current_user_id)):
-    result = await db.transactions.delete_one({"id": transaction_id, "user_id": user_id})
-    if result.deleted_count == 0:
+    deleted = await db.transactions.find_one_and_delete({"id": transaction_id, "user_id": user_id}, ROLLUP_SOURCE_FIELDS)
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Transaction not found")
+    await update_monthly_rollups(removed=[deleted])
+    await analytics_cache.invalidate(user_id)
     return {"message": "Transaction deleted successfully"}
 
 class TransactionUpdate(BaseModel):
@@ -1265,17 +2080,23 @@ async def update_transaction(
     # Add update timestamp
     update_data["updated_at"] = datetime.utcnow()
     
-    result = await db.transactions.update_one(
+    previous_transaction = await db.transactions.find_one_and_update(
         {"id": transaction_id, "user_id": user_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        ROLLUP_SOURCE_FIELDS
     )
     
-    if result.modified_count == 0:
+    if previous_transaction is None:
         raise HTTPException(status_code=404, detail="Transaction not found or no changes made")
     
     # Return updated transaction
     updated_transaction = await db.transactions.find_one({"id": transaction_id, "user_id": user_id})
     if updated_transaction:
+        await update_monthly_rollups(added=[updated_transaction], removed=[previous_transaction])
+        await analytics_cache.invalidate(user_id)
+        # Remember the correction so future imports of this merchant get it right
+        if "category" in update_data and update_data["category"] != previous_transaction.get("category"):
+            await merchant_memory.learn(user_id, [updated_transaction["description"]], update_data["category"])
         # Remove MongoDB's _id field and convert datetime if needed
         if '_id' in updated_transaction:
             del updated_transaction['_id']
@@ -1299,16 +2120,157 @@ async def bulk_delete_transactions(
     if not request.transaction_ids:
         raise HTTPException(status_code=400, detail="No transaction IDs provided")
     
+    deleted = await db.transactions.find(
+        {"id": {"$in": request.transaction_ids}, "user_id": user_id},
+        {**ROLLUP_SOURCE_FIELDS, "id": 1}
+    ).to_list(None)
     result = await db.transactions.delete_many({
-        "id": {"$in": request.transaction_ids}, 
+        "id": {"$in": [transaction["id"] for transaction in deleted]}, 
         "user_id": user_id
     })
+    await update_monthly_rollups(removed=deleted)
+    await analytics_cache.invalidate(user_id)
     
     return {
         "message": f"Successfully deleted {result.deleted_count} transactions",
         "deleted_count": result.deleted_count
     }
 
+class BulkRecategorizeRequest(BaseModel):
+    category: str
+    transaction_ids: Optional[List[str]] = None
+    # Filter alternative to transaction_ids; description is a case-insensitive substring
+    description: Optional[str] = None
+    pdf_source: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+
+@api_router.post("/transactions/bulk-recategorize")
+async def bulk_recategorize_transactions(
+    request: BulkRecategorizeRequest,
+    user_id: str = Depends(get_current_user_id)
+):
+    """Set the category of the listed transactions, or of every transaction matching the filter.
+
+    The rows are changed in one bulk write; monthly rollups and the analytics
+    cache follow. Selections by id are remembered as merchant corrections for
+    future imports.
+    """
+    category = request.category.strip()
+    if not category:
+        raise HTTPException(status_code=400, detail="Category cannot be empty")
+    
+    has_filters = bool(request.description or request.pdf_source or request.start_date or request.end_date)
+    if request.transaction_ids and has_filters:
+        raise HTTPException(status_code=400, detail="Provide either transaction IDs or filters, not both")
+    if request.transaction_ids:
+        selection = {"user_id": user_id, "id": {"$in": request.transaction_ids}}
+    elif has_filters:
+        selection = transaction_filter(user_id, request.start_date, request.end_date, pdf_source=request.pdf_source)
+        if request.description:
+            selection["description"] = {"$regex": re.escape(request.description.strip()), "$options": "i"}
+    else:
+        raise HTTPException(status_code=400, detail="Provide transaction IDs or at least one filter")
+    
+    previous = await db.transactions.find(
+        {**selection, "category": {"$ne": category}},
+        {**ROLLUP_SOURCE_FIELDS, "id": 1, "description": 1}
+    ).to_list(None)
+    if not previous:
+        return {"message": "No transactions needed recategorizing", "updated_count": 0}
+    
+    # Each row only changes if it still holds the values the rollup deltas are
+    # computed from; a row edited since it was read is left to that edit
+    updated_at = datetime.utcnow()
+    updated_at = updated_at.replace(microsecond=updated_at.microsecond // 1000 * 1000)  # stored at ms precision
+    result = await db.transactions.bulk_write([
+        UpdateOne(
+            {"user_id": user_id, "id": transaction["id"], **{
+                field: transaction.get(field) for field in ROLLUP_SOURCE_FIELDS if field not in ("_id", "user_id")
+            }},
+            {"$set": {"category": category, "updated_at": updated_at}}
+        )
+        for transaction in previous
+    ], ordered=False)
+    if result.modified_count < len(previous):
+        # Some rows were skipped; apply deltas only for the rows this write changed
+        changed = await db.transactions.find(
+            {"user_id": user_id, "id": {"$in": [transaction["id"] for transaction in previous]},
+             "category": category, "updated_at": updated_at},
+            {"_id": 0, "id": 1}
+        ).to_list(None)
+        changed_ids = {transaction["id"] for transaction in changed}
+        previous = [transaction for transaction in previous if transaction["id"] in changed_ids]
+    await update_monthly_rollups(
+        added=[{**transaction, "category": category} for transaction in previous],
+        removed=previous
+    )
+    await analytics_cache.invalidate(user_id)
+    if request.transaction_ids:
+        await merchant_memory.learn(user_id, [transaction["description"] for transaction in previous], category)
+    
+    return {
+        "message": f"Successfully recategorized {result.modified_count} transactions",
+        "updated_count": result.modified_count
+    }
+
+# Spreadsheet exports
+EXPORT_HEADERS = ['Date', 'Description', 'Category', 'Amount', 'Account Type', 'Source', 'User']
+EXPORT_BATCH_SIZE = 1000
+EXPORT_SPOOL_BYTES = 8 * 1024 * 1024  # larger exports spill to a temporary file
+# Raw columns of the CSV and Parquet exports
+EXPORT_FIELDS = ("id", "date", "description", "category", "amount", "account_type", "pdf_source", "user_name")
+PARQUET_ROW_GROUP_SIZE = 50000
+PARQUET_SCHEMA = pa.schema([
+    (field, pa.float64() if field == "amount" else pa.string()) for field in EXPORT_FIELDS
+])
+
+def export_row(transaction: dict) -> list:
+    return [
+        transaction.get('date', ''),
+        transaction.get('description', ''),
+        transaction.get('category', ''),
+        transaction.get('amount', 0),
+        'Credit Card' if transaction.get('account_type') == 'credit_card' else 'Debit Account',
+        transaction.get('pdf_source', 'Manual'),
+        transaction.get('user_name', '')
+    ]
+
+def export_date_key(value) -> str:
+    """Comparable form of a stored date, which may be a string or a date/datetime"""
+    return str(value.isoformat() if hasattr(value, 'isoformat') else value)
+
+def append_export_rows(ws, rows: List[list]):
+    for row in rows:
+        amount = WriteOnlyCell(ws, value=row[3])
+        amount.number_format = '"$"#,##0.00'
+        ws.append([*row[:3], amount, *row[4:]])
+
+def append_spooled_rows(ws, rows_file):
+    """Write the row batches pickled into rows_file to the sheet, then close the file"""
+    with rows_file:
+        rows_file.seek(0)
+        while True:
+            try:
+                rows = pickle.load(rows_file)
+            except EOFError:
+                return
+            append_export_rows(ws, rows)
+
+def save_workbook(wb) -> tempfile.SpooledTemporaryFile:
+    excel_file = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    wb.save(excel_file)
+    excel_file.seek(0)
+    return excel_file
+
+def iter_file_chunks(file, chunk_size: int = 64 * 1024):
+    """Yield a file's contents for a StreamingResponse, closing it afterwards"""
+    try:
+        while chunk := file.read(chunk_size):
+            yield chunk
+    finally:
+        file.close()
+
 # Excel Export Endpoint
 @api_router.get("/transactions/export/excel")
 async def export_transactions_to_excel(
@@ -1320,296 +2282,789 @@ async def export_transactions_to_excel(
     user_id: str = Depends(get_current_user_id)
 ):
     """Export transactions to Excel file with filters"""
-    # Use the same filtering logic as get_transactions
-    filter_dict = {"user_id": user_id}
-    
-    if start_date:
-        filter_dict["date"] = {"$gte": start_date}
-    if end_date:
-        if "date" in filter_dict:
-            filter_dict["date"]["$lte"] = end_date
-        else:
-            filter_dict["date"] = {"$lte": end_date}
-    if category:
-        filter_dict["category"] = category
-    if pdf_source:
-        filter_dict["pdf_source"] = pdf_source
-    if account_type:
-        filter_dict["account_type"] = account_type
+    filter_dict = transaction_filter(user_id, start_date, end_date, category, pdf_source, account_type)
     
-    # Get transactions sorted by date (newest first)
-    transactions = await db.transactions.find(filter_dict).sort("date", -1).to_list(10000)
-    
-    if not transactions:
+    # Stream transactions sorted by date (newest first)
+    cursor = db.transactions.find(filter_dict, {"_id": 0}).sort("date", -1)
+    batch = await cursor.to_list(EXPORT_BATCH_SIZE)
+    if not batch:
         raise HTTPException(status_code=404, detail="No transactions found for export")
     
-    # Create Excel workbook
-    wb = Workbook()
-    
-    # Main transactions sheet
-    ws_main = wb.active
-    ws_main.title = "Transactions"
-    
-    # Convert transactions to DataFrame for easier manipulation
-    df_data = []
-    for transaction in transactions:
-        df_data.append({
-            'Date': transaction.get('date', ''),
-            'Description': transaction.get('description', ''),
-            'Category': transaction.get('category', ''),
-            'Amount': transaction.get('amount', 0),
-            'Account Type': 'Credit Card' if transaction.get('account_type') == 'credit_card' else 'Debit Account',
-            'Source': transaction.get('pdf_source', 'Manual'),
-            'User': transaction.get('user_name', '')
-        })
-    
-    df = pd.DataFrame(df_data)
+    # Read the rows batch by batch, collecting column widths (longest value + 2,
+    # at most 50) and summary statistics in the same pass. Write-only sheets need
+    # their widths before the first row, so the rows are spooled until then.
+    rows_file = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    longest = [len(header) for header in EXPORT_HEADERS]
+    transaction_count = 0
+    total_amount = 0
+    first_date = last_date = None
+    category_summary = defaultdict(lambda: [0, 0])
+    account_summary = defaultdict(lambda: [0, 0])
+    
+    while batch:
+        rows = [export_row(transaction) for transaction in batch]
+        for row in rows:
+            longest = [max(length, len(str(value))) for length, value in zip(longest, row)]
+            _, _, row_category, row_amount, row_account = row[:5]
+            row_date = export_date_key(row[0])
+            transaction_count += 1
+            total_amount += row_amount
+            first_date = row_date if first_date is None else min(first_date, row_date)
+            last_date = row_date if last_date is None else max(last_date, row_date)
+            for summary, key in ((category_summary, row_category), (account_summary, row_account)):
+                summary[key][0] += 1
+                summary[key][1] += row_amount
+        await asyncio.to_thread(pickle.dump, rows, rows_file)
+        batch = await cursor.to_list(EXPORT_BATCH_SIZE)
+    
+    wb = Workbook(write_only=True)
+    ws_main = wb.create_sheet("Transactions")
+    for col_num, length in enumerate(longest, 1):
+        ws_main.column_dimensions[get_column_letter(col_num)].width = min(length + 2, 50)
     
     # Add headers with styling
-    headers = ['Date', 'Description', 'Category', 'Amount', 'Account Type', 'Source', 'User']
-    for col_num, header in enumerate(headers, 1):
-        cell = ws_main.cell(row=1, column=col_num, value=header)
+    header_cells = []
+    for header in EXPORT_HEADERS:
+        cell = WriteOnlyCell(ws_main, value=header)
         cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center")
-    
-    # Add data rows
-    for row_num, (_, row_data) in enumerate(df.iterrows(), 2):
-        for col_num, value in enumerate(row_data, 1):
-            cell = ws_main.cell(row=row_num, column=col_num, value=value)
-            if col_num == 4:  # Amount column
-                cell.number_format = '"$"#,##0.00'
-    
-    # Auto-adjust column widths
-    for column in ws_main.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws_main.column_dimensions[column_letter].width = adjusted_width
-    
-    # Create summary sheet
-    ws_summary = wb.create_sheet("Summary")
-    
-    # Summary statistics
-    total_amount = df['Amount'].sum()
-    transaction_count = len(df)
-    date_range = f"{df['Date'].min()} to {df['Date'].max()}" if not df.empty else "No data"
-    
-    # Category breakdown
-    category_summary = df.groupby('Category')['Amount'].agg(['count', 'sum']).reset_index()
-    
-    # Account type breakdown
-    account_summary = df.groupby('Account Type')['Amount'].agg(['count', 'sum']).reset_index()
+        cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+        cell.alignment = Alignment(horizontal="center")
+        header_cells.append(cell)
+    ws_main.append(header_cells)
+    await asyncio.to_thread(append_spooled_rows, ws_main, rows_file)
     
-    # Add summary data
+    # Summary sheet
     summary_data = [
         ["Export Summary", ""],
         ["Total Transactions", transaction_count],
         ["Total Amount", f"${total_amount:,.2f}"],
-        ["Date Range", date_range],
+        ["Date Range", f"{first_date} to {last_date}"],
         ["Export Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
         ["", ""],
         ["Category Breakdown", ""],
         ["Category", "Count", "Total Amount"]
     ]
-    
-    # Add category data
-    for _, row in category_summary.iterrows():
-        summary_data.append([row['Category'], row['count'], f"${row['sum']:,.2f}"])
+    for name, (count, amount) in sorted(category_summary.items()):
+        summary_data.append([name, count, f"${amount:,.2f}"])
     
     summary_data.extend([
         ["", ""],
         ["Account Type Breakdown", ""],
         ["Account Type", "Count", "Total Amount"]
     ])
+    for name, (count, amount) in sorted(account_summary.items()):
+        summary_data.append([name, count, f"${amount:,.2f}"])
     
-    # Add account type data
-    for _, row in account_summary.iterrows():
-        summary_data.append([row['Account Type'], row['count'], f"${row['sum']:,.2f}"])
-    
-    # Write summary data
+    ws_summary = wb.create_sheet("Summary")
+    for col_num, column in enumerate(itertools.zip_longest(*summary_data, fillvalue=""), 1):
+        ws_summary.column_dimensions[get_column_letter(col_num)].width = min(max(len(str(value)) for value in column) + 2, 30)
     for row_num, row_data in enumerate(summary_data, 1):
-        for col_num, value in enumerate(row_data, 1):
-            cell = ws_summary.cell(row=row_num, column=col_num, value=value)
-            if row_num == 1 or (len(row_data) > 2 and value in ["Category Breakdown", "Account Type Breakdown"]):
+        if row_num == 1:
+            row_data = [WriteOnlyCell(ws_summary, value=value) for value in row_data]
+            for cell in row_data:
                 cell.font = Font(bold=True)
+        ws_summary.append(row_data)
     
-    # Auto-adjust summary column widths
-    for column in ws_summary.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 30)
-        ws_summary.column_dimensions[column_letter].width = adjusted_width
-    
-    # Save to BytesIO
-    excel_buffer = io.BytesIO()
-    wb.save(excel_buffer)
-    excel_buffer.seek(0)
-    
-    # Generate filename
-    filename = f"lifetracker_transactions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    
-    # Return as streaming response
+    excel_file = await asyncio.to_thread(save_workbook, wb)
+    
+    # Stream the saved workbook without copying it into memory again
     return StreamingResponse(
-        io.BytesIO(excel_buffer.getvalue()),
+        iter_file_chunks(excel_file),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        headers={"Content-Disposition": f"attachment; filename={export_filename('xlsx')}"}
+    )
+
+def export_filename(extension: str) -> str:
+    return f"lifetracker_transactions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+async def first_export_batch(cursor, batch_size: int) -> List[dict]:
+    batch = await cursor.to_list(batch_size)
+    if not batch:
+        raise HTTPException(status_code=404, detail="No transactions found for export")
+    return batch
+
+@api_router.get("/transactions/export/csv")
+async def export_transactions_to_csv(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None,
+    pdf_source: Optional[str] = None,
+    account_type: Optional[str] = None,
+    user_id: str = Depends(get_current_user_id)
+):
+    """Stream every matching transaction as CSV, one cursor batch at a time"""
+    filter_dict = transaction_filter(user_id, start_date, end_date, category, pdf_source, account_type)
+    cursor = db.transactions.find(filter_dict, {"_id": 0}).sort("date", -1)
+    batch = await first_export_batch(cursor, EXPORT_BATCH_SIZE)
+    
+    async def csv_chunks(batch):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        while batch:
+            for transaction in batch:
+                transaction = {**TRANSACTION_DEFAULTS, **transaction}
+                writer.writerow([transaction.get(field) for field in EXPORT_FIELDS])
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            batch = await cursor.to_list(EXPORT_BATCH_SIZE)
+    
+    return StreamingResponse(
+        csv_chunks(batch),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={export_filename('csv')}"}
+    )
+
+def parquet_table(transactions: List[dict]):
+    columns = {field: [] for field in EXPORT_FIELDS}
+    for transaction in transactions:
+        transaction = {**TRANSACTION_DEFAULTS, **transaction}
+        for field in EXPORT_FIELDS:
+            value = transaction.get(field)
+            if value is not None:
+                value = float(value) if field == "amount" else str(value)
+            columns[field].append(value)
+    return pa.Table.from_pydict(columns, schema=PARQUET_SCHEMA)
+
+def write_parquet_row_group(writer, transactions: List[dict]):
+    writer.write_table(parquet_table(transactions))
+
+@api_router.get("/transactions/export/parquet")
+async def export_transactions_to_parquet(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None,
+    pdf_source: Optional[str] = None,
+    account_type: Optional[str] = None,
+    user_id: str = Depends(get_current_user_id)
+):
+    """Export every matching transaction as Parquet, one row group per cursor batch"""
+    filter_dict = transaction_filter(user_id, start_date, end_date, category, pdf_source, account_type)
+    cursor = db.transactions.find(filter_dict, {"_id": 0}).sort("date", -1)
+    batch = await first_export_batch(cursor, PARQUET_ROW_GROUP_SIZE)
+    
+    parquet_file = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    writer = pq.ParquetWriter(parquet_file, PARQUET_SCHEMA, compression="snappy")
+    try:
+        while batch:
+            await asyncio.to_thread(write_parquet_row_group, writer, batch)
+            batch = await cursor.to_list(PARQUET_ROW_GROUP_SIZE)
+        await asyncio.to_thread(writer.close)
+    except BaseException:
+        parquet_file.close()
+        raise
+    parquet_file.seek(0)
+    
+    return StreamingResponse(
+        iter_file_chunks(parquet_file),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": f"attachment; filename={export_filename('parquet')}"}
     )
 
+# Statement import jobs
+import_jobs: dict = {}
+import_queue: asyncio.Queue = asyncio.Queue(maxsize=IMPORT_QUEUE_LIMIT)
+import_workers: List[asyncio.Task] = []
+
+def prune_import_jobs():
+    """Forget finished jobs older than IMPORT_JOB_TTL_MINUTES"""
+    cutoff = datetime.utcnow() - timedelta(minutes=IMPORT_JOB_TTL_MINUTES)
+    for job_id in [job_id for job_id, job in import_jobs.items() if job.finished_at and job.finished_at < cutoff]:
+        del import_jobs[job_id]
+
+def transaction_key(transaction: dict) -> tuple:
+    """Identity used to detect re-imported transactions"""
+    return (transaction["date"], transaction["description"], transaction["amount"])
+
+async def find_existing_transactions(user_id: str, transactions: List[dict], projection: Optional[dict] = None) -> List[dict]:
+    """Stored transactions that may match the given ones, fetched in a single query"""
+    if not transactions:
+        return []
+
+    dates = [t["date"] for t in transactions]
+    return await db.transactions.find(
+        {
+            "user_id": user_id,
+            "date": {"$gte": min(dates), "$lte": max(dates)},
+            "description": {"$in": list({t["description"] for t in transactions})}
+        },
+        projection or {"_id": 0, "date": 1, "description": 1, "amount": 1}
+    ).to_list(None)
+
+async def find_existing_transaction_keys(user_id: str, transactions: List[dict]) -> set:
+    """Look up which of the given transactions are already stored, in a single query"""
+    return {transaction_key(doc) for doc in await find_existing_transactions(user_id, transactions)}
+
+async def parse_page_ranges(content: bytes, pages_total: int, user_id: str, source_filename: str, state: dict):
+    """Yield (end_page, parsed range) for each page range of a statement, in page order.
+
+    With PDF_PARALLEL_RANGES > 1, up to that many ranges are extracted at once,
+    each worker opening the PDF on its own. Parsing still runs range by range in
+    page order with the carried state, so the rows don't depend on worker count.
+    """
+    if PDF_PARALLEL_RANGES == 1:
+        for start_page in range(0, pages_total, PDF_PAGE_BATCH):
+            end_page = min(start_page + PDF_PAGE_BATCH, pages_total)
+            parsed = await run_in_pdf_pool(
+                pdf_page_range_task, content, start_page, end_page, user_id, source_filename, state, end_page == pages_total
+            )
+            state = parsed["state"]
+            yield end_page, parsed
+        return
+
+    # Smaller ranges for short statements so every worker gets a share
+    batch = max(1, min(PDF_PAGE_BATCH, -(-pages_total // PDF_PARALLEL_RANGES)))
+    ranges = [(start_page, min(start_page + batch, pages_total)) for start_page in range(0, pages_total, batch)]
+    extractions = deque()
+    submitted = 0
+    try:
+        for index, (start_page, end_page) in enumerate(ranges):
+            # Keep up to PDF_PARALLEL_RANGES extractions running ahead of the parser
+            while submitted < min(len(ranges), index + PDF_PARALLEL_RANGES):
+                extractions.append(asyncio.ensure_future(run_in_pdf_pool(pdf_page_text_task, content, *ranges[submitted])))
+                submitted += 1
+
+            extracted = await extractions.popleft()
+            state["stats"]["table_pass_pages"] += extracted["table_pass_pages"]
+            parsed = await run_in_pdf_pool(
+                pdf_parse_pages_task, extracted["pages"], user_id, source_filename, state, end_page == pages_total
+            )
+            state = parsed["state"]
+            yield end_page, parsed
+    finally:
+        for extraction in extractions:
+            extraction.cancel()
+
+async def extract_statement(job: ImportJob, filename: str, content: bytes) -> tuple:
+    """Extract and parse a statement, reusing cached results for previously seen PDFs.
+
+    Returns the parsed transactions, the parse stats, a preview of the text and
+    whether the cache served it. Progress is added to the job's counters so the
+    statements of a batch can share one job.
+    """
+    digest = (await asyncio.to_thread(hashlib.sha256, content)).hexdigest()
+    cached = await pdf_cache.get(digest)
+
+    if cached:
+        job.pages_total += cached["pages"]
+        job.pages_done += cached["pages"]
+        # Parsed rows don't depend on the user or the upload name, only the source name does
+        transactions = [
+            {
+                **t,
+                "user_id": job.user_id,
+                "pdf_source": generate_source_name(t["user_name"], 'debit' if t["account_type"] == 'debit' else 'credit', filename)
+            }
+            for t in cached["transactions"]
+        ]
+        job.transactions_found += len(transactions)
+        return transactions, cached["stats"], cached.get("text_preview", ""), True
+
+    # Parse page ranges in order, carrying the parser state between them,
+    # so pages_done and transactions_found track progress
+    pages_total = (await run_in_pdf_pool(pdf_page_count_task, content))["page_count"]
+    job.pages_total += pages_total
+    pages_done = 0
+    transactions = []
+    state = new_parse_state()
+    async for end_page, page_range in parse_page_ranges(content, pages_total, job.user_id, filename, state):
+        state = page_range["state"]
+        transactions.extend(page_range["transactions"])
+        job.pages_done += end_page - pages_done
+        pages_done = end_page
+        job.transactions_found += len(page_range["transactions"])
+
+    if not state["has_text"]:
+        raise HTTPException(status_code=400, detail="Could not extract text from PDF")
+
+    text_preview = state["text_preview"]
+    stats = state["stats"]
+    await pdf_cache.put(digest, {
+        "pages": pages_total,
+        "text_preview": text_preview,
+        "transactions": transactions,
+        "stats": stats
+    })
+    return transactions, stats, text_preview, False
+
+async def process_import_job(job: ImportJob, uploads: List[tuple]):
+    """Extract, parse, dedup and insert a batch of (filename, content) PDF statements.
+
+    Statements are extracted concurrently, deduplicated against each other and
+    the database, and written with a single insert_many. A statement that fails
+    is reported in job.files; the job only fails when every statement does.
+    """
+    job.status = "processing"
+
+    # Statements and their page ranges share the pool; run_in_pdf_pool bounds the
+    # tasks queued on it, this only bounds how many statements are held in memory
+    statement_slots = asyncio.Semaphore(PDF_WORKERS)
+
+    async def extract(filename: str, content: bytes):
+        async with statement_slots:
+            return await extract_statement(job, filename, content)
+
+    results = await asyncio.gather(*(extract(filename, content) for filename, content in uploads), return_exceptions=True)
+
+    parsed_transactions = []
+    parsed_stats = []
+    text_preview = ""
+    for (filename, _), result in zip(uploads, results):
+        if isinstance(result, Exception):
+            if isinstance(result, HTTPException):
+                error = result.detail
+            else:
+                logging.error(f"PDF processing error for {filename}: {str(result)}")
+                error = f"Error processing PDF: {str(result)}"
+            job.files.append({"filename": filename, "status": "failed", "error": error})
+            continue
+
+        transactions, stats, preview, cache_hit = result
+        parsed_transactions.extend(await apply_category_rules(job.user_id, transactions))
+        parsed_stats.append(stats)
+        text_preview = text_preview or preview
+        job.cache_hit = job.cache_hit or cache_hit
+        job.files.append({
+            "filename": filename,
+            "status": "completed",
+            "transactions_found": len(transactions),
+            "cache_hit": cache_hit
+        })
+
+    if not parsed_stats:
+        raise results[0]
+
+    job.summary = merge_parse_stats(parsed_stats)
+
+    if not parsed_transactions:
+        job.message = "No transactions found in PDF"
+        job.extracted_text_preview = text_preview[:500] + "..." if len(text_preview) > 500 else text_preview
+        return
+
+    # Check for duplicates, including rows repeated across overlapping statements,
+    # and insert new transactions
+    new_transactions = []
+    existing_keys = await find_existing_transaction_keys(job.user_id, parsed_transactions)
+    
+    for trans_data in parsed_transactions:
+        key = transaction_key(trans_data)
+        if key not in existing_keys:
+            existing_keys.add(key)
+            transaction_obj = Transaction(**trans_data)
+            trans_dict = transaction_obj.dict()
+            trans_dict['date'] = trans_dict['date'].isoformat() if hasattr(trans_dict['date'], 'isoformat') else trans_dict['date']
+            trans_dict['created_at'] = trans_dict['created_at'].isoformat()
+            new_transactions.append(trans_dict)
+        else:
+            job.duplicate_count += 1
+    
+    # Insert new transactions
+    if new_transactions:
+        await db.transactions.insert_many(new_transactions)
+        await update_monthly_rollups(added=new_transactions)
+        await analytics_cache.invalidate(job.user_id)
+    
+    job.imported_count = len(new_transactions)
+    if len(uploads) == 1:
+        job.message = f"Successfully processed PDF: {job.filename}"
+    else:
+        job.message = f"Successfully processed {len(parsed_stats)} of {len(uploads)} PDFs"
+
+async def import_worker():
+    """Consume queued PDF imports for the lifetime of the app"""
+    while True:
+        job_id, uploads = await import_queue.get()
+        job = import_jobs[job_id]
+        started = time.perf_counter()
+        try:
+            await process_import_job(job, uploads)
+            job.status = "completed"
+        except HTTPException as e:
+            job.status = "failed"
+            job.error = e.detail
+        except Exception as e:
+            logging.error(f"PDF processing error: {str(e)}")
+            job.status = "failed"
+            job.error = f"Error processing PDF: {str(e)}"
+        finally:
+            job.finished_at = datetime.utcnow()
+            job.summary = {
+                "job_id": job.id,
+                "source_file": job.filename,
+                "status": job.status,
+                "pages": job.pages_done,
+                "lines_scanned": 0,
+                "matches": 0,
+                "skipped": {},
+                **(job.summary or {}),
+                "imported_count": job.imported_count,
+                "duplicate_count": job.duplicate_count,
+                "cache_hit": job.cache_hit,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+            }
+            import_logger.info("PDF import summary %s", json.dumps(job.summary))
+            import_queue.task_done()
+
+def queue_import_job(job: ImportJob, uploads: List[tuple]):
+    """Register a job and hand its (filename, content) uploads to the import workers"""
+    prune_import_jobs()
+    try:
+        import_queue.put_nowait((job.id, uploads))
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PDF import queue is full, please try again shortly"
+        )
+    import_jobs[job.id] = job
+
 # PDF Processing Endpoint
 @api_router.post("/transactions/pdf-import")
 async def import_transactions_from_pdf(
     file: UploadFile = File(...),
     user_id: str = Depends(get_current_user_id)
 ):
+    """Queue a PDF statement for import and return the job id to poll"""
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
-    try:
-        # Read PDF content
-        content = await file.read()
-        
-        # Extract text from PDF
-        text = extract_text_from_pdf(content)
-        
-        if not text.strip():
-            raise HTTPException(status_code=400, detail="Could not extract text from PDF")
-        
-        # Parse transactions from text - pass the filename
-        parsed_transactions = parse_transactions_from_text(text, user_id, file.filename)
-        
-        if not parsed_transactions:
-            return {
-                "message": "No transactions found in PDF", 
-                "imported_count": 0,
-                "extracted_text_preview": text[:500] + "..." if len(text) > 500 else text
-            }
-        
-        # Check for duplicates and insert new transactions
-        new_transactions = []
-        duplicate_count = 0
-        
-        for trans_data in parsed_transactions:
-            # Check if transaction already exists
-            existing = await db.transactions.find_one({
-                "user_id": user_id,
-                "date": trans_data["date"],
-                "description": trans_data["description"],
-                "amount": trans_data["amount"]
-            })
-            
-            if not existing:
-                transaction_obj = Transaction(**trans_data)
-                trans_dict = transaction_obj.dict()
-                trans_dict['date'] = trans_dict['date'].isoformat() if hasattr(trans_dict['date'], 'isoformat') else trans_dict['date']
-                trans_dict['created_at'] = trans_dict['created_at'].isoformat()
-                new_transactions.append(trans_dict)
-            else:
-                duplicate_count += 1
-        
-        # Insert new transactions
-        if new_transactions:
-            await db.transactions.insert_many(new_transactions)
-        
-        return {
-            "message": f"Successfully processed PDF: {file.filename}",
-            "imported_count": len(new_transactions),
-            "duplicate_count": duplicate_count,
-            "total_found": len(parsed_transactions),
-            "source_file": file.filename
-        }
-        
-    except Exception as e:
-        logging.error(f"PDF processing error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error processing PDF: {str(e)}")
+    # Read PDF content
+    content = await file.read()
+
+    job = ImportJob(user_id=user_id, filename=file.filename)
+    queue_import_job(job, [(file.filename, content)])
+
+    return {
+        "message": f"PDF queued for import: {file.filename}",
+        "job_id": job.id,
+        "status": job.status,
+        "source_file": file.filename
+    }
+
+@api_router.post("/transactions/pdf-import/batch")
+async def import_transactions_from_pdf_batch(
+    files: List[UploadFile] = File(...),
+    user_id: str = Depends(get_current_user_id)
+):
+    """Queue several PDF statements as one import job, deduplicated across the whole batch"""
+    if len(files) > IMPORT_BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {IMPORT_BATCH_MAX_FILES} PDFs can be imported at once")
+    for file in files:
+        if not file.filename.lower().endswith('.pdf'):
+            raise HTTPException(status_code=400, detail=f"Only PDF files are supported: {file.filename}")
+
+    uploads = [(file.filename, await file.read()) for file in files]
+    filenames = [filename for filename, _ in uploads]
+
+    job = ImportJob(user_id=user_id, filename=", ".join(filenames))
+    queue_import_job(job, uploads)
+
+    return {
+        "message": f"{len(uploads)} PDFs queued for import",
+        "job_id": job.id,
+        "status": job.status,
+        "source_files": filenames
+    }
+
+@api_router.get("/imports/{job_id}")
+async def get_import_job(job_id: str, user_id: str = Depends(get_current_user_id)):
+    """Report progress and results of a queued PDF import"""
+    job = import_jobs.get(job_id)
+    if not job or job.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    return {
+        **job.dict(exclude={"user_id"}),
+        "job_id": job.id,
+        "total_found": job.transactions_found,
+        "source_file": job.filename
+    }
 
 # Enhanced Analytics (with user filtering)
+# Aggregation expressions shared by the analytics pipelines; dates are stored as YYYY-MM-DD strings
+MONTH_EXPR = {"$substrCP": ["$date", 0, 7]}
+ACCOUNT_KIND_EXPR = {"$cond": [{"$eq": ["$account_type", "debit"]}, "debit", "credit"]}
+
+# Monthly rollups: per-user spending totals by month, category, account type and source,
+# kept in step with every transaction write so analytics don't rescan history
+ROLLUP_KEY_FIELDS = ("user_id", "month", "category", "account_type", "pdf_source")
+ROLLUP_SOURCE_FIELDS = {"_id": 0, "user_id": 1, "date": 1, "category": 1, "account_type": 1, "pdf_source": 1, "amount": 1}
+
+def rollup_key(transaction: dict) -> tuple:
+    return (
+        transaction["user_id"],
+        str(transaction["date"])[:7],
+        transaction["category"],
+        transaction.get("account_type", "credit_card"),
+        transaction.get("pdf_source")
+    )
+
+async def update_monthly_rollups(added: List[dict] = (), removed: List[dict] = ()):
+    """Apply the net effect of inserted and deleted transactions to monthly_rollups"""
+    deltas = defaultdict(lambda: [0.0, 0])
+    for sign, transactions in ((1, added), (-1, removed)):
+        for transaction in transactions:
+            delta = deltas[rollup_key(transaction)]
+            delta[0] += sign * abs(transaction["amount"])
+            delta[1] += sign
+
+    operations = [
+        UpdateOne(dict(zip(ROLLUP_KEY_FIELDS, key)), {"$inc": {"total": total, "count": count}}, upsert=True)
+        for key, (total, count) in deltas.items()
+        if total or count
+    ]
+    if operations:
+        await db.monthly_rollups.bulk_write(operations, ordered=False)
+    if removed:
+        await db.monthly_rollups.delete_many({
+            "user_id": {"$in": list({transaction["user_id"] for transaction in removed})},
+            "count": {"$lte": 0}
+        })
+
+async def rebuild_monthly_rollups(user_id: Optional[str] = None) -> int:
+    """Regenerate monthly_rollups from scratch, for one user or everyone; returns the row count"""
+    match = {"user_id": user_id} if user_id else {}
+    groups = await db.transactions.aggregate([
+        {"$match": match},
+        {"$group": {
+            "_id": {
+                "user_id": "$user_id",
+                "month": MONTH_EXPR,
+                "category": "$category",
+                "account_type": {"$ifNull": ["$account_type", "credit_card"]},
+                "pdf_source": {"$ifNull": ["$pdf_source", None]}
+            },
+            "total": {"$sum": {"$abs": "$amount"}},
+            "count": {"$sum": 1}
+        }}
+    ]).to_list(None)
+
+    await db.monthly_rollups.delete_many(match)
+    if groups:
+        await db.monthly_rollups.insert_many([{**group["_id"], "total": group["total"], "count": group["count"]} for group in groups])
+    return len(groups)
+
+def whole_month_range(start_date: Optional[str], end_date: Optional[str]) -> Optional[tuple]:
+    """(first_month, last_month) when the date filters fall on month boundaries, else None"""
+    try:
+        if start_date and date.fromisoformat(start_date).day != 1:
+            return None
+        if end_date and (date.fromisoformat(end_date) + timedelta(days=1)).day != 1:
+            return None
+    except ValueError:
+        return None
+    return (start_date[:7] if start_date else None, end_date[:7] if end_date else None)
+
+def analytics_scan(user_id: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> dict:
+    """Choose what an analytics pipeline reads.
+
+    Whole-month ranges are answered from monthly_rollups, anything else from
+    the transactions. Pipelines $sum scan["amount"] and scan["count"] and
+    group months by scan["month"], which mean the same in both collections.
+    """
+    match = {"user_id": user_id}
+    months = whole_month_range(start_date, end_date)
+
+    if months is not None:
+        first_month, last_month = months
+        if first_month or last_month:
+            match["month"] = {}
+            if first_month:
+                match["month"]["$gte"] = first_month
+            if last_month:
+                match["month"]["$lte"] = last_month
+        return {"collection": db.monthly_rollups, "match": match, "amount": "$total", "count": "$count", "month": "$month"}
+
+    if start_date or end_date:
+        match["date"] = {}
+        if start_date:
+            match["date"]["$gte"] = start_date
+        if end_date:
+            match["date"]["$lte"] = end_date
+    return {"collection": db.transactions, "match": match, "amount": {"$abs": "$amount"}, "count": 1, "month": MONTH_EXPR}
+
+# Analytics response cache: serialized results keyed by user, data version,
+# endpoint and parameters. Every transaction write bumps the user's version,
+# so entries from before a write are never served again and just age out.
+class MemoryAnalyticsBackend:
+    """Process-local TTL + LRU store, bounded by entry count and total body size.
+
+    Versions are drawn from one increasing counter and only kept for the
+    max_entries users who wrote most recently. Any other user reads the
+    floor, the highest version evicted so far, which is never lower than a
+    version the user was given, so entries from before a write stay unreachable.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.entries: OrderedDict = OrderedDict()
+        self.size = 0
+        self.versions: OrderedDict = OrderedDict()
+        self.version_counter = itertools.count(1)
+        self.version_floor = 0
+
+    async def version(self, user_id: str) -> int:
+        return self.versions.get(user_id, self.version_floor)
+
+    async def bump(self, user_id: str):
+        self.versions[user_id] = next(self.version_counter)
+        self.versions.move_to_end(user_id)
+        while len(self.versions) > self.max_entries:
+            _, evicted = self.versions.popitem(last=False)
+            self.version_floor = max(self.version_floor, evicted)
+
+    def evict(self, key: str):
+        _, body = self.entries.pop(key)
+        self.size -= len(body)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, body = entry
+        if expires_at < time.monotonic():
+            self.evict(key)
+            return None
+        self.entries.move_to_end(key)
+        return body
+
+    async def put(self, key: str, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        if key in self.entries:
+            self.evict(key)
+        self.entries[key] = (time.monotonic() + self.ttl_seconds, body)
+        self.size += len(body)
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            self.evict(next(iter(self.entries)))
+
+class MongoAnalyticsBackend:
+    """Store shared by every server process; expired entries are removed by a TTL index"""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+
+    async def version(self, user_id: str) -> int:
+        doc = await db.analytics_versions.find_one({"user_id": user_id}, {"_id": 0, "version": 1})
+        return doc["version"] if doc else 0
+
+    async def bump(self, user_id: str):
+        await db.analytics_versions.update_one({"user_id": user_id}, {"$inc": {"version": 1}}, upsert=True)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        doc = await db.analytics_cache.find_one({"key": key, "expires_at": {"$gt": datetime.utcnow()}}, {"_id": 0, "body": 1})
+        return doc["body"] if doc else None
+
+    async def put(self, key: str, body: bytes):
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        await db.analytics_cache.update_one({"key": key}, {"$set": {"body": body, "expires_at": expires_at}}, upsert=True)
+
+class AnalyticsCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    async def fetch(self, user_id: str, endpoint: str, params: dict, compute) -> bytes:
+        """JSON body for the request, computed at most once per data version"""
+        version = await self.backend.version(user_id)
+        key = f"{user_id}:{version}:{endpoint}:{json.dumps(params, sort_keys=True, default=str)}"
+        body = await self.backend.get(key)
+        if body is not None:
+            self.hits += 1
+            return body
+
+        self.misses += 1
+        body = json.dumps(jsonable_encoder(await compute())).encode()
+        try:
+            await self.backend.put(key, body)
+        except Exception as e:
+            logging.warning(f"Could not cache {endpoint} for user {user_id}: {e}")
+        return body
+
+    async def invalidate(self, user_id: str):
+        await self.backend.bump(user_id)
+
+if ANALYTICS_CACHE_BACKEND == "mongo":
+    analytics_cache = AnalyticsCache(MongoAnalyticsBackend(ANALYTICS_CACHE_TTL_SECONDS))
+else:
+    analytics_cache = AnalyticsCache(MemoryAnalyticsBackend(ANALYTICS_CACHE_SIZE, ANALYTICS_CACHE_MAX_BYTES, ANALYTICS_CACHE_TTL_SECONDS))
+
+def cached_analytics(endpoint: str):
+    """Serve an analytics endpoint from analytics_cache; the uncached function stays available as __wrapped__"""
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            user_id = params.pop("user_id")
+            body = await analytics_cache.fetch(user_id, endpoint, params, lambda: func(*args, **kwargs))
+            return Response(content=body, media_type="application/json")
+        return wrapper
+    return decorator
+
 @api_router.get("/analytics/monthly-report")
+@cached_analytics("monthly-report")
 async def get_monthly_report(year: Optional[int] = None, user_id: str = Depends(get_current_user_id)):
     current_year = year or datetime.now().year
     
-    # Get all transactions for the year
+    # Get the year's totals per month and category
     start_date = f"{current_year}-01-01"
     end_date = f"{current_year}-12-31"
     
-    transactions = await db.transactions.find({
-        "user_id": user_id,
-        "date": {"$gte": start_date, "$lte": end_date}
-    }).to_list(1000)
+    scan = analytics_scan(user_id, start_date, end_date)
+    groups = await scan["collection"].aggregate([
+        {"$match": scan["match"]},
+        {"$group": {
+            "_id": {"month": scan["month"], "category": "$category"},
+            "amount": {"$sum": scan["amount"]},
+            "count": {"$sum": scan["count"]}
+        }},
+        {"$sort": {"_id.month": 1}}
+    ]).to_list(None)
     
     # Group by month
-    monthly_data = defaultdict(lambda: {
-        "categories": defaultdict(float),
-        "total_spent": 0,
-        "transaction_count": 0
-    })
-    
-    for transaction in transactions:
-        trans_date = datetime.fromisoformat(transaction["date"]).date()
-        month_key = f"{trans_date.year}-{trans_date.month:02d}"
-        
-        monthly_data[month_key]["categories"][transaction["category"]] += abs(transaction["amount"])
-        monthly_data[month_key]["total_spent"] += abs(transaction["amount"])
-        monthly_data[month_key]["transaction_count"] += 1
-    
-    # Convert to list format
-    reports = []
-    for month_key, data in monthly_data.items():
-        year, month = month_key.split("-")
-        reports.append({
+    monthly_data = {}
+    for group in groups:
+        month_key = group["_id"]["month"]
+        data = monthly_data.setdefault(month_key, {
             "month": month_key,
-            "year": int(year),
-            "categories": dict(data["categories"]),
-            "total_spent": data["total_spent"],
-            "transaction_count": data["transaction_count"]
+            "year": int(month_key[:4]),
+            "categories": {},
+            "total_spent": 0,
+            "transaction_count": 0
         })
+        data["categories"][group["_id"]["category"]] = group["amount"]
+        data["total_spent"] += group["amount"]
+        data["transaction_count"] += group["count"]
     
-    return sorted(reports, key=lambda x: x["month"])
+    return list(monthly_data.values())
 
 @api_router.get("/analytics/category-breakdown")
+@cached_analytics("category-breakdown")
 async def get_category_breakdown(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     user_id: str = Depends(get_current_user_id)
 ):
-    filter_dict = {"user_id": user_id}
-    if start_date:
-        filter_dict["date"] = {"$gte": start_date}
-    if end_date:
-        if "date" in filter_dict:
-            filter_dict["date"]["$lte"] = end_date
-        else:
-            filter_dict["date"] = {"$lte": end_date}
-    
-    transactions = await db.transactions.find(filter_dict).to_list(1000)
-    
-    category_data = defaultdict(lambda: {"amount": 0, "count": 0})
-    total_spending = 0
-    
-    for transaction in transactions:
-        amount = abs(transaction["amount"])
-        category_data[transaction["category"]]["amount"] += amount
-        category_data[transaction["category"]]["count"] += 1
-        total_spending += amount
+    scan = analytics_scan(user_id, start_date, end_date)
+    category_data = await scan["collection"].aggregate([
+        {"$match": scan["match"]},
+        {"$group": {"_id": "$category", "amount": {"$sum": scan["amount"]}, "count": {"$sum": scan["count"]}}}
+    ]).to_list(None)
+    total_spending = sum(data["amount"] for data in category_data)
     
     # Calculate percentages and format response
     result = []
-    for category, data in category_data.items():
+    for data in category_data:
         percentage = (data["amount"] / total_spending * 100) if total_spending > 0 else 0
         result.append({
-            "category": category,
+            "category": data["_id"],
             "amount": data["amount"],
             "count": data["count"],
             "percentage": round(percentage, 2)
@@ -1617,125 +3072,306 @@ async def get_category_breakdown(
     
     return sorted(result, key=lambda x: x["amount"], reverse=True)
 
-# Enhanced bulk import with user support
+# CSV bulk import: validated and inserted one chunk at a time
+CSV_REQUIRED_COLUMNS = ['date', 'description', 'category', 'amount']
+CSV_ERRORS_PER_CHUNK = 20  # rejected rows listed per chunk; the rest are only counted
+# What to do with rows already stored (same date, description and amount) or repeated in the file
+CSV_DUPLICATE_MODES = ("skip", "overwrite", "keep_both")
+CSV_OVERWRITE_FIELDS = ("category", "account_type")
+
+def parse_csv_dates(values: pd.Series) -> pd.Series:
+    """ISO dates first, then whatever else pandas can recognise; NaT when neither works"""
+    dates = pd.to_datetime(values, errors='coerce', format='ISO8601')
+    unparsed = dates.isna() & values.notna()
+    if unparsed.any():
+        dates[unparsed] = pd.to_datetime(values[unparsed], errors='coerce', format='mixed')
+    return dates
+
+def normalize_csv_chunk(chunk: pd.DataFrame, user_id: str) -> tuple:
+    """Validate and normalize a chunk column by column.
+
+    Returns (transactions, errors, invalid_count); errors lists the first
+    rejected rows by data row number. Rows are CSV records counted from 1
+    after the header, so blank lines are skipped and a quoted multi-line
+    field is one row; they are not text line numbers.
+    """
+    dates = parse_csv_dates(chunk['date'])
+    amounts = pd.to_numeric(chunk['amount'].str.replace(r'[$,\s]', '', regex=True), errors='coerce')
+    descriptions = chunk['description'].str.strip()
+    categories = chunk['category'].str.strip()
+    if 'account_type' in chunk:
+        account_types = chunk['account_type'].str.strip().fillna('credit_card').replace('', 'credit_card')
+    else:
+        account_types = pd.Series('credit_card', index=chunk.index)
+    
+    problems = [
+        (dates.isna(), "invalid date"),
+        (amounts.isna() | (amounts.abs() == float('inf')), "invalid amount"),
+        (descriptions.isna() | (descriptions == ''), "missing description"),
+        (categories.isna() | (categories == ''), "missing category"),
+    ]
+    invalid = pd.Series(False, index=chunk.index)
+    for mask, _ in problems:
+        invalid |= mask
+    
+    errors = []
+    for index in chunk.index[invalid][:CSV_ERRORS_PER_CHUNK]:
+        errors.append({
+            "row": int(index) + 1,
+            "error": ", ".join(message for mask, message in problems if mask[index])
+        })
+    
+    valid = ~invalid
+    created_at = datetime.utcnow().isoformat()
+    transactions = [
+        {
+            "id": str(uuid.uuid4()),
+            "date": transaction_date,
+            "description": description,
+            "category": category,
+            "amount": amount,
+            "account_type": account_type,
+            "user_id": user_id,
+            "household_id": None,
+            "pdf_source": None,
+            "user_name": None,
+            "created_at": created_at
+        }
+        for transaction_date, description, category, amount, account_type in zip(
+            dates[valid].dt.strftime('%Y-%m-%d').tolist(),
+            descriptions[valid].tolist(),
+            categories[valid].tolist(),
+            amounts[valid].astype(float).tolist(),
+            account_types[valid].tolist()
+        )
+    ]
+    return transactions, errors, int(invalid.sum())
+
+async def dedupe_csv_chunk(user_id: str, transactions: List[dict], duplicates: str) -> tuple:
+    """Match a chunk against stored transactions and earlier rows with one query.
+
+    Returns (rows to insert, duplicate count, stored transactions updated).
+    "skip" drops duplicates, "keep_both" inserts them anyway, and "overwrite"
+    copies the row's category and account type onto the matching transactions.
+    """
+    projection = {**ROLLUP_SOURCE_FIELDS, "id": 1, "description": 1}
+    stored = defaultdict(list)
+    for doc in await find_existing_transactions(user_id, transactions, projection):
+        stored[transaction_key(doc)].append(doc)
+    
+    pending = {}
+    to_insert = []
+    overwrites = {}
+    duplicate_count = 0
+    for transaction in transactions:
+        key = transaction_key(transaction)
+        if key not in stored and key not in pending:
+            pending[key] = transaction
+            to_insert.append(transaction)
+            continue
+        
+        duplicate_count += 1
+        if duplicates == "keep_both":
+            to_insert.append(transaction)
+        elif duplicates == "overwrite":
+            changes = {field: transaction[field] for field in CSV_OVERWRITE_FIELDS}
+            if key in pending:
+                pending[key].update(changes)
+            for doc in stored.get(key, []):
+                if any(doc.get(field) != value for field, value in changes.items()):
+                    overwrites[doc["id"]] = (doc, changes)
+    
+    if overwrites:
+        updated_at = datetime.utcnow()
+        await db.transactions.bulk_write([
+            UpdateOne({"id": transaction_id, "user_id": user_id}, {"$set": {**changes, "updated_at": updated_at}})
+            for transaction_id, (_, changes) in overwrites.items()
+        ], ordered=False)
+        await update_monthly_rollups(
+            added=[{**doc, **changes} for doc, changes in overwrites.values()],
+            removed=[doc for doc, _ in overwrites.values()]
+        )
+    return to_insert, duplicate_count, len(overwrites)
+
+async def insert_imported_transactions(transactions: List[dict]) -> int:
+    """insert_many plus rollup maintenance; returns how many rows were stored"""
+    try:
+        await db.transactions.insert_many(transactions)
+    except BulkWriteError as e:
+        # Ordered inserts stop at the first failure; keep rollups in step with what landed
+        inserted = transactions[:e.details.get("nInserted", 0)]
+        await update_monthly_rollups(added=inserted)
+        raise
+    await update_monthly_rollups(added=transactions)
+    return len(transactions)
+
 @api_router.post("/transactions/bulk-import")
-async def bulk_import_transactions(file: UploadFile = File(...), user_id: str = Depends(get_current_user_id)):
+async def bulk_import_transactions(
+    file: UploadFile = File(...),
+    duplicates: str = "skip",
+    user_id: str = Depends(get_current_user_id)
+):
+    """Import transactions from a CSV file.
+
+    The file is read CSV_IMPORT_CHUNK_SIZE rows at a time; each chunk is
+    validated, deduplicated, inserted and reported on its own, so bad rows
+    are listed instead of failing the whole upload. duplicates is one of
+    CSV_DUPLICATE_MODES.
+    """
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    if duplicates not in CSV_DUPLICATE_MODES:
+        raise HTTPException(status_code=400, detail=f"duplicates must be one of: {', '.join(CSV_DUPLICATE_MODES)}")
     
     try:
-        content = await file.read()
-        df = pd.read_csv(io.StringIO(content.decode('utf-8')))
-        
-        # Expected columns: date, description, category, amount
-        required_columns = ['date', 'description', 'category', 'amount']
-        if not all(col in df.columns for col in required_columns):
-            raise HTTPException(
-                status_code=400, 
-                detail=f"CSV must contain columns: {', '.join(required_columns)}"
-            )
-        
-        transactions = []
-        for _, row in df.iterrows():
-            # Convert date to string if it's a datetime object
-            date_value = row['date']
-            if hasattr(date_value, 'isoformat'):
-                date_value = date_value.isoformat()
-            elif hasattr(date_value, 'strftime'):
-                date_value = date_value.strftime('%Y-%m-%d')
+        reader = await asyncio.to_thread(
+            pd.read_csv, file.file, dtype=str, encoding='utf-8-sig', chunksize=CSV_IMPORT_CHUNK_SIZE
+        )
+    except (pd.errors.EmptyDataError, pd.errors.ParserError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not read CSV file: {e}")
+    
+    chunks = []
+    imported_count = 0
+    invalid_count = 0
+    duplicate_count = 0
+    updated_count = 0
+    try:
+        while True:
+            chunk_number = len(chunks) + 1
+            try:
+                chunk = await asyncio.to_thread(next, reader, None)
+            except (pd.errors.ParserError, UnicodeDecodeError) as e:
+                chunks.append({"chunk": chunk_number, "error": f"Could not read CSV: {e}"})
+                break
+            if chunk is None:
+                break
             
-            transaction_data = {
-                "date": str(date_value),
-                "description": str(row['description']),
-                "category": str(row['category']),
-                "amount": float(row['amount']),
-                "account_type": str(row.get('account_type', 'credit_card')),
-                "user_id": user_id
+            chunk.columns = chunk.columns.str.strip().str.lower()
+            missing_columns = [col for col in CSV_REQUIRED_COLUMNS if col not in chunk.columns]
+            if missing_columns:
+                raise HTTPException(
+                    status_code=400, 
+                    detail=f"CSV must contain columns: {', '.join(CSV_REQUIRED_COLUMNS)}"
+                )
+            
+            transactions, errors, chunk_invalid = await asyncio.to_thread(normalize_csv_chunk, chunk, user_id)
+            report = {
+                "chunk": chunk_number, "rows": len(chunk), "imported": 0, "invalid": chunk_invalid,
+                "duplicates": 0, "updated": 0, "errors": errors
             }
-            transaction_obj = Transaction(**transaction_data)
-            transaction_dict = transaction_obj.dict()
-            # Ensure dates are strings for MongoDB
-            if hasattr(transaction_dict['date'], 'isoformat'):
-                transaction_dict['date'] = transaction_dict['date'].isoformat()
-            if hasattr(transaction_dict['created_at'], 'isoformat'):
-                transaction_dict['created_at'] = transaction_dict['created_at'].isoformat()
-            transactions.append(transaction_dict)
-        
-        # Insert all transactions
-        if transactions:
-            await db.transactions.insert_many(transactions)
-        
-        return {"message": f"Successfully imported {len(transactions)} transactions"}
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+            if transactions:
+                try:
+                    transactions, report["duplicates"], report["updated"] = await dedupe_csv_chunk(user_id, transactions, duplicates)
+                    if transactions:
+                        report["imported"] = await insert_imported_transactions(transactions)
+                except Exception as e:
+                    if isinstance(e, BulkWriteError):
+                        report["imported"] = e.details.get("nInserted", 0)
+                    logging.error(f"CSV import chunk {chunk_number} failed: {e}")
+                    report["error"] = f"Could not save rows: {e}"
+            
+            imported_count += report["imported"]
+            invalid_count += chunk_invalid
+            duplicate_count += report["duplicates"]
+            updated_count += report["updated"]
+            chunks.append(report)
+    finally:
+        reader.close()
+        if imported_count or updated_count:
+            await analytics_cache.invalidate(user_id)
+    
+    save_failures = [report for report in chunks if "error" in report and "rows" in report]
+    read_failure = chunks and "rows" not in chunks[-1]
+    complete = not save_failures and not read_failure
+    if complete:
+        message = f"Successfully imported {imported_count} transactions"
+    else:
+        message = f"Import incomplete: imported {imported_count} transactions"
+    if duplicate_count:
+        if duplicates == "skip":
+            message += f", skipped {duplicate_count} duplicates"
+        elif duplicates == "overwrite":
+            message += f", updated {updated_count} existing transactions from {duplicate_count} duplicates"
+        else:
+            message += f" including {duplicate_count} duplicates"
+    if invalid_count:
+        message += f", skipped {invalid_count} invalid rows"
+    if save_failures:
+        message += f"; rows from {len(save_failures)} of {len(chunks)} chunks could not be saved"
+    if read_failure:
+        rows_read = sum(report["rows"] for report in chunks[:-1])
+        message += f"; the file could not be read past row {rows_read}"
+    return {
+        "message": message,
+        "complete": complete,
+        "imported_count": imported_count,
+        "duplicate_count": duplicate_count,
+        "updated_count": updated_count,
+        "invalid_count": invalid_count,
+        "chunks": chunks
+    }
 
 @api_router.get("/analytics/spending-trends")
+@cached_analytics("spending-trends")
 async def get_spending_trends(months: int = 12, user_id: str = Depends(get_current_user_id)):
     # Get transactions from the last N months
     end_date = datetime.now().date()
     start_date = end_date.replace(month=end_date.month - months + 1 if end_date.month > months else 12 - (months - end_date.month - 1), 
                                   year=end_date.year if end_date.month > months else end_date.year - 1)
     
-    transactions = await db.transactions.find({
-        "user_id": user_id,
-        "date": {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()}
-    }).to_list(1000)
+    scan = analytics_scan(user_id, start_date.isoformat(), end_date.isoformat())
+    groups = await scan["collection"].aggregate([
+        {"$match": scan["match"]},
+        {"$group": {"_id": {"month": scan["month"], "category": "$category"}, "amount": {"$sum": scan["amount"]}}}
+    ]).to_list(None)
     
     # Group by month for trend analysis
-    monthly_trends = defaultdict(lambda: {"total": 0, "categories": defaultdict(float)})
+    monthly_trends = defaultdict(lambda: {"total": 0, "categories": {}})
     
-    for transaction in transactions:
-        trans_date = datetime.fromisoformat(transaction["date"]).date()
-        month_key = f"{trans_date.year}-{trans_date.month:02d}"
-        amount = abs(transaction["amount"])
-        
-        monthly_trends[month_key]["total"] += amount
-        monthly_trends[month_key]["categories"][transaction["category"]] += amount
+    for group in groups:
+        month_key = group["_id"]["month"]
+        monthly_trends[month_key]["total"] += group["amount"]
+        monthly_trends[month_key]["categories"][group["_id"]["category"]] = group["amount"]
     
     return dict(monthly_trends)
 
 # Account Type Analytics
 @api_router.get("/analytics/account-type-breakdown")
+@cached_analytics("account-type-breakdown")
 async def get_account_type_breakdown(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     user_id: str = Depends(get_current_user_id)
 ):
     """Get spending breakdown by account type (debit vs credit)"""
-    filter_dict = {"user_id": user_id}
-    
-    if start_date:
-        filter_dict["date"] = {"$gte": start_date}
-    if end_date:
-        if "date" in filter_dict:
-            filter_dict["date"]["$lte"] = end_date
-        else:
-            filter_dict["date"] = {"$lte": end_date}
-    
-    transactions = await db.transactions.find(filter_dict).to_list(10000)
-    
-    if not transactions:
+    scan = analytics_scan(user_id, start_date, end_date)
+    groups = await scan["collection"].aggregate([
+        {"$match": scan["match"]},
+        {"$group": {
+            "_id": {"account_type": ACCOUNT_KIND_EXPR, "category": "$category"},
+            "amount": {"$sum": scan["amount"]},
+            "count": {"$sum": scan["count"]}
+        }}
+    ]).to_list(None)
+    
+    if not groups:
         return {
             "debit": {"total": 0, "count": 0, "categories": {}},
             "credit": {"total": 0, "count": 0, "categories": {}}
         }
     
     account_breakdown = {
-        "debit": {"total": 0, "count": 0, "categories": defaultdict(float)},
-        "credit": {"total": 0, "count": 0, "categories": defaultdict(float)}
+        "debit": {"total": 0, "count": 0, "categories": {}},
+        "credit": {"total": 0, "count": 0, "categories": {}}
     }
     
-    for transaction in transactions:
-        amount = abs(transaction["amount"])
-        account_type = "debit" if transaction.get("account_type") == "debit" else "credit"
-        category = transaction["category"]
-        
-        account_breakdown[account_type]["total"] += amount
-        account_breakdown[account_type]["count"] += 1
-        account_breakdown[account_type]["categories"][category] += amount
+    for group in groups:
+        account_type = group["_id"]["account_type"]
+        account_breakdown[account_type]["total"] += group["amount"]
+        account_breakdown[account_type]["count"] += group["count"]
+        account_breakdown[account_type]["categories"][group["_id"]["category"]] = group["amount"]
     
-    # Convert defaultdict to regular dict and calculate percentages
+    # Calculate percentages
     result = {}
     total_spending = sum(acc["total"] for acc in account_breakdown.values())
     
@@ -1745,12 +3381,13 @@ async def get_account_type_breakdown(
             "total": data["total"],
             "count": data["count"],
             "percentage": round(percentage, 2),
-            "categories": dict(data["categories"])
+            "categories": data["categories"]
         }
     
     return result
 
 @api_router.get("/analytics/monthly-by-account-type")
+@cached_analytics("monthly-by-account-type")
 async def get_monthly_breakdown_by_account_type(
     year: Optional[int] = None,
     user_id: str = Depends(get_current_user_id)
@@ -1759,15 +3396,15 @@ async def get_monthly_breakdown_by_account_type(
     if year is None:
         year = datetime.now().year
     
-    filter_dict = {
-        "user_id": user_id,
-        "date": {
-            "$gte": f"{year}-01-01",
-            "$lte": f"{year}-12-31"
-        }
-    }
-    
-    transactions = await db.transactions.find(filter_dict).to_list(10000)
+    scan = analytics_scan(user_id, f"{year}-01-01", f"{year}-12-31")
+    groups = await scan["collection"].aggregate([
+        {"$match": scan["match"]},
+        {"$group": {
+            "_id": {"month": scan["month"], "account_type": ACCOUNT_KIND_EXPR},
+            "total": {"$sum": scan["amount"]},
+            "count": {"$sum": scan["count"]}
+        }}
+    ]).to_list(None)
     
     # Group by month and account type
     monthly_data = defaultdict(lambda: {
@@ -1775,14 +3412,8 @@ async def get_monthly_breakdown_by_account_type(
         "credit": {"total": 0, "count": 0}
     })
     
-    for transaction in transactions:
-        trans_date = datetime.fromisoformat(transaction["date"]).date()
-        month_key = f"{trans_date.year}-{trans_date.month:02d}"
-        amount = abs(transaction["amount"])
-        account_type = "debit" if transaction.get("account_type") == "debit" else "credit"
-        
-        monthly_data[month_key][account_type]["total"] += amount
-        monthly_data[month_key][account_type]["count"] += 1
+    for group in groups:
+        monthly_data[group["_id"]["month"]][group["_id"]["account_type"]] = {"total": group["total"], "count": group["count"]}
     
     # Convert to list format
     reports = []
@@ -1799,46 +3430,33 @@ async def get_monthly_breakdown_by_account_type(
     return sorted(reports, key=lambda x: x["month"])
 
 @api_router.get("/analytics/source-breakdown")
+@cached_analytics("source-breakdown")
 async def get_source_breakdown(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     user_id: str = Depends(get_current_user_id)
 ):
     """Get spending breakdown by transaction source (e.g., Jane's Debit, John's Credit)"""
-    filter_dict = {"user_id": user_id}
-    
-    if start_date:
-        filter_dict["date"] = {"$gte": start_date}
-    if end_date:
-        if "date" in filter_dict:
-            filter_dict["date"]["$lte"] = end_date
-        else:
-            filter_dict["date"] = {"$lte": end_date}
-    
-    transactions = await db.transactions.find(filter_dict).to_list(10000)
-    
-    if not transactions:
-        return []
-    
-    source_breakdown = defaultdict(lambda: {"total": 0, "count": 0, "account_type": ""})
-    
-    for transaction in transactions:
-        amount = abs(transaction["amount"])
-        source = transaction.get("pdf_source", "Manual")
-        account_type = transaction.get("account_type", "unknown")
-        
-        source_breakdown[source]["total"] += amount
-        source_breakdown[source]["count"] += 1
-        source_breakdown[source]["account_type"] = account_type
-    
-    # Convert to list and calculate percentages
-    total_spending = sum(data["total"] for data in source_breakdown.values())
+    scan = analytics_scan(user_id, start_date, end_date)
+    source_breakdown = await scan["collection"].aggregate([
+        {"$match": scan["match"]},
+        {"$group": {
+            "_id": {"$ifNull": ["$pdf_source", "Manual"]},
+            "total": {"$sum": scan["amount"]},
+            "count": {"$sum": scan["count"]},
+            # Order-independent, so rollups and transactions agree; missing types count as credit_card like in the rollups
+            "account_type": {"$max": {"$ifNull": ["$account_type", "credit_card"]}}
+        }}
+    ]).to_list(None)
+    
+    # Calculate percentages
+    total_spending = sum(data["total"] for data in source_breakdown)
     
     result = []
-    for source, data in source_breakdown.items():
+    for data in source_breakdown:
         percentage = (data["total"] / total_spending * 100) if total_spending > 0 else 0
         result.append({
-            "source": source,
+            "source": data["_id"],
             "total": data["total"],
             "count": data["count"],
             "percentage": round(percentage, 2),
@@ -1847,6 +3465,75 @@ async def get_source_breakdown(
     
     return sorted(result, key=lambda x: x["total"], reverse=True)
 
+# Combined dashboard payload
+DASHBOARD_FIELDS = (
+    "transactions", "monthly_report", "category_breakdown", "account_type_breakdown",
+    "source_breakdown", "categories", "sources"
+)
+
+@api_router.get("/dashboard")
+async def get_dashboard(
+    fields: Optional[str] = None,
+    year: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None,
+    pdf_source: Optional[str] = None,
+    account_type: Optional[str] = None,
+    sort_by: Optional[str] = "date",
+    sort_order: Optional[str] = "desc",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    user_id: str = Depends(get_current_user_id)
+):
+    """Everything the dashboard loads, authenticated once and queried concurrently.
+
+    fields is a comma-separated subset of DASHBOARD_FIELDS (all by default).
+    transactions is one keyset page, as on GET /transactions with a limit
+    (TRANSACTIONS_PAGE_SIZE by default), with its total; follow next_cursor
+    on GET /transactions for more. year selects the monthly report. Only
+    the aggregate fields go through analytics_cache; the page is read fresh.
+    """
+    selected = [field.strip() for field in fields.split(",") if field.strip()] if fields else list(DASHBOARD_FIELDS)
+    unknown = set(selected) - set(DASHBOARD_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown dashboard fields: {', '.join(sorted(unknown))}")
+    
+    loaders = {
+        "transactions": lambda: load_transactions_page(
+            user_id, start_date, end_date, category, pdf_source, account_type,
+            sort_by, sort_order, limit or TRANSACTIONS_PAGE_SIZE, cursor, include_total=True
+        ),
+        "monthly_report": lambda: get_monthly_report.__wrapped__(year=year, user_id=user_id),
+        "category_breakdown": lambda: get_category_breakdown.__wrapped__(start_date=None, end_date=None, user_id=user_id),
+        "account_type_breakdown": lambda: get_account_type_breakdown.__wrapped__(start_date=None, end_date=None, user_id=user_id),
+        "source_breakdown": lambda: get_source_breakdown.__wrapped__(start_date=None, end_date=None, user_id=user_id),
+        "categories": lambda: get_categories(user_id=user_id),
+        "sources": lambda: get_pdf_sources(user_id=user_id),
+    }
+    
+    analytics_fields = [field for field in selected if field != "transactions"]
+    
+    async def load_analytics():
+        results = await asyncio.gather(*(loaders[field]() for field in analytics_fields))
+        payload = dict(zip(analytics_fields, results))
+        if "sources" in payload:
+            payload["sources"] = payload["sources"]["sources"]
+        return payload
+    
+    async def load_cached_analytics():
+        if not analytics_fields:
+            return {}
+        params = {"fields": sorted(analytics_fields), "year": year}
+        return json.loads(await analytics_cache.fetch(user_id, "dashboard", params, load_analytics))
+    
+    async def load_transactions():
+        return await loaders["transactions"]() if "transactions" in selected else None
+    
+    analytics, transactions = await asyncio.gather(load_cached_analytics(), load_transactions())
+    payload = {**analytics, "transactions": transactions}
+    return {field: payload[field] for field in selected}
+
 # Authentication endpoints
 auth_router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -1870,7 +3557,7 @@ async def register_user(user_data: UserCreate):
         username = f"{username}_{str(uuid.uuid4())[:8]}"
     
     # Hash password
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await run_in_password_pool(get_password_hash, user_data.password)
     
     # Create user document
     user_doc = {
@@ -1891,7 +3578,8 @@ async def register_user(user_data: UserCreate):
     return User(**{k: v for k, v in user_doc.items() if k != "password_hash"})
 
 @auth_router.post("/login", response_model=Token)
-async def login_user(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_user(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    login_rate_limiter.check(get_client_ip(request))
     user = await authenticate_user(form_data.username, form_data.password)  # username field contains email
     if not user:
         raise HTTPException(
@@ -1933,6 +3621,7 @@ async def create_household(household_data: HouseholdCreate, current_user: dict =
         {"id": current_user["id"]},
         {"$set": {"household_id": household_doc["id"]}}
     )
+    principal_cache.invalidate(current_user["email"])
     
     return Household(**household_doc)
 
@@ -1985,6 +3674,7 @@ async def invite_household_member(
             {"id": existing_user["id"]},
             {"$set": {"household_id": current_user["household_id"], "role": role}}
         )
+        principal_cache.invalidate(existing_user["email"])
         
         # Add user to household members list
         await db.households.update_one(
@@ -2067,11 +3757,12 @@ async def reset_password(request: PasswordResetConfirm):
         )
     
     # Update user password
-    hashed_password = get_password_hash(request.new_password)
+    hashed_password = await run_in_password_pool(get_password_hash, request.new_password)
     await db.users.update_one(
         {"email": request.email},
         {"$set": {"password_hash": hashed_password}}
     )
+    principal_cache.invalidate(request.email)
     
     # Remove used reset code
     await db.password_resets.delete_many({"email": request.email})
@@ -2107,6 +3798,7 @@ async def update_user_profile(
             {"id": current_user["id"]},
             {"$set": update_data}
         )
+        principal_cache.invalidate(current_user["email"])
         
         # Get updated user
         updated_user = await db.users.find_one({"id": current_user["id"]})
@@ -2120,18 +3812,19 @@ async def change_password(
     current_user: dict = Depends(get_current_user)
 ):
     # Verify current password
-    if not verify_password(password_request.current_password, current_user["password_hash"]):
+    if not await run_in_password_pool(verify_password, password_request.current_password, current_user["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
     # Update password
-    hashed_password = get_password_hash(password_request.new_password)
+    hashed_password = await run_in_password_pool(get_password_hash, password_request.new_password)
     await db.users.update_one(
         {"id": current_user["id"]},
         {"$set": {"password_hash": hashed_password}}
     )
+    principal_cache.invalidate(current_user["email"])
     
     return {"message": "Password successfully changed"}
 
@@ -2269,7 +3962,7 @@ async def google_callback(request: Request):
                 "email": email,
                 "username": username,
                 "full_name": full_name,
-                "password_hash": get_password_hash(str(uuid.uuid4())),  # Random password for OAuth users
+                "password_hash": await run_in_password_pool(get_password_hash, str(uuid.uuid4())),  # Random password for OAuth users
                 "role": "user",
                 "household_id": None,
                 "created_at": datetime.utcnow(),
@@ -2329,6 +4022,7 @@ app.add_middleware(
     ],
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # List-mode continuation cursor
 )
 
 # Configure logging
@@ -2338,6 +4032,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+for logger_name, level in (item.split("=", 1) for item in LOG_LEVELS.split(",") if "=" in item):
+    logging.getLogger(logger_name.strip()).setLevel(level.strip().upper())
+
+@app.on_event("startup")
+async def reconcile_indexes():
+    await ensure_indexes()
+
+@app.on_event("startup")
+async def bootstrap_monthly_rollups():
+    # Databases from before the rollups existed start with a full rebuild
+    if not await db.monthly_rollups.estimated_document_count() and await db.transactions.estimated_document_count():
+        rows = await rebuild_monthly_rollups()
+        db_logger.info(f"Built {rows} monthly rollup rows")
+
+@app.on_event("startup")
+async def start_import_workers():
+    for _ in range(IMPORT_JOB_WORKERS):
+        import_workers.append(asyncio.create_task(import_worker()))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for worker in import_workers:
+        worker.cancel()
     client.close()
+    if pdf_executor is not None:
+        pdf_executor.shutdown(wait=False, cancel_futures=True)
+    if password_executor is not None:
+        password_executor.shutdown(wait=False, cancel_futures=True)
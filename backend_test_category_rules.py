@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for /api/category-rules validation: rules must name a non-empty
+category that the user has, built in or created by them, both when the
+rule is created and when it is updated.
+
+Set BACKEND_URL to test a server other than http://localhost:8001.
+"""
+import requests
+import json
+import os
+import sys
+import uuid
+
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8001")
+API_URL = f"{BACKEND_URL}/api"
+print(f"Using API URL: {API_URL}")
+
+# Helper function to print test results
+def print_test_result(test_name, success, response=None, error=None):
+    print(f"\n{'=' * 80}")
+    print(f"TEST: {test_name}")
+    print(f"STATUS: {'SUCCESS' if success else 'FAILURE'}")
+
+    if response is not None:
+        print(f"RESPONSE STATUS: {response.status_code}")
+        try:
+            print(f"RESPONSE BODY: {json.dumps(response.json(), indent=2)[:2000]}")
+        except ValueError:
+            print(f"RESPONSE BODY: {response.text[:2000]}")
+
+    if error:
+        print(f"ERROR: {error}")
+
+    print(f"{'=' * 80}\n")
+    return success
+
+# Helper function to register a test user and return its auth headers
+def register_and_login_user():
+    random_id = uuid.uuid4().hex[:8]
+    email = f"test_user_{random_id}@example.com"
+    password = "Test@123456"
+    requests.post(f"{API_URL}/auth/register", json={
+        "email": email,
+        "password": password,
+        "full_name": f"Test User {random_id}"
+    })
+    login_response = requests.post(f"{API_URL}/auth/login", data={"username": email, "password": password})
+    if login_response.status_code != 200:
+        print(f"Login failed: {login_response.text}")
+        return None
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+# Test 1: Built-in and user-created categories are accepted
+def test_known_categories_accepted():
+    test_name = "Known Categories Accepted"
+    try:
+        headers = register_and_login_user()
+        if not headers:
+            return print_test_result(test_name, False, error="Failed to create test user")
+
+        response = requests.post(f"{API_URL}/category-rules", json={"keyword": "Corner Cafe", "category": " Restaurants "}, headers=headers)
+        if response.status_code != 200 or response.json()["category"] != "Restaurants":
+            return print_test_result(test_name, False, response, "Built-in category was not accepted")
+        rule_id = response.json()["id"]
+
+        requests.post(f"{API_URL}/categories", json={"name": "Pets"}, headers=headers)
+        response = requests.put(f"{API_URL}/category-rules/{rule_id}", json={"category": "Pets"}, headers=headers)
+        if response.status_code != 200 or response.json()["category"] != "Pets":
+            return print_test_result(test_name, False, response, "User-created category was not accepted")
+
+        return print_test_result(test_name, True, response)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+# Test 2: Empty, blank and unknown categories are rejected on create and update
+def test_invalid_categories_rejected():
+    test_name = "Invalid Categories Rejected"
+    try:
+        headers = register_and_login_user()
+        if not headers:
+            return print_test_result(test_name, False, error="Failed to create test user")
+
+        for category in ["", "   ", "Not A Category", "restaurants"]:
+            response = requests.post(f"{API_URL}/category-rules", json={"keyword": "corner cafe", "category": category}, headers=headers)
+            if response.status_code != 400:
+                return print_test_result(test_name, False, response, f"Rule with category {category!r} was created")
+
+        rule_id = requests.post(f"{API_URL}/category-rules", json={"keyword": "corner cafe", "category": "Restaurants"}, headers=headers).json()["id"]
+        for category in ["", "   ", "Not A Category"]:
+            response = requests.put(f"{API_URL}/category-rules/{rule_id}", json={"category": category}, headers=headers)
+            if response.status_code != 400:
+                return print_test_result(test_name, False, response, f"Rule was updated to category {category!r}")
+
+        rules = requests.get(f"{API_URL}/category-rules", headers=headers).json()
+        if [rule["category"] for rule in rules] != ["Restaurants"]:
+            return print_test_result(test_name, False, error=f"Unexpected rules stored: {rules}")
+
+        # Another user's categories don't count
+        other_headers = register_and_login_user()
+        requests.post(f"{API_URL}/categories", json={"name": "Private Category"}, headers=other_headers)
+        response = requests.post(f"{API_URL}/category-rules", json={"keyword": "corner cafe", "category": "Private Category"}, headers=headers)
+        if response.status_code != 400:
+            return print_test_result(test_name, False, response, "Another user's category was accepted")
+
+        return print_test_result(test_name, True)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+def run_all_tests():
+    results = {
+        "Known Categories Accepted": test_known_categories_accepted(),
+        "Invalid Categories Rejected": test_invalid_categories_rejected()
+    }
+
+    print("\n" + "=" * 80)
+    print("CATEGORY RULES TEST SUMMARY")
+    for name, success in results.items():
+        print(f"{'✅' if success else '❌'} {name}")
+    print("=" * 80)
+    return all(results.values())
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
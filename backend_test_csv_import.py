@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Tests for POST /api/transactions/bulk-import duplicate handling: the skip,
+overwrite and keep_both modes against stored transactions and rows repeated
+within the file, plus the data row numbers reported for rejected rows.
+
+Set BACKEND_URL to test a server other than http://localhost:8001.
+"""
+import requests
+import json
+import os
+import sys
+import uuid
+
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8001")
+API_URL = f"{BACKEND_URL}/api"
+print(f"Using API URL: {API_URL}")
+
+# Helper function to print test results
+def print_test_result(test_name, success, response=None, error=None):
+    print(f"\n{'=' * 80}")
+    print(f"TEST: {test_name}")
+    print(f"STATUS: {'SUCCESS' if success else 'FAILURE'}")
+
+    if response is not None:
+        print(f"RESPONSE STATUS: {response.status_code}")
+        try:
+            print(f"RESPONSE BODY: {json.dumps(response.json(), indent=2)[:2000]}")
+        except ValueError:
+            print(f"RESPONSE BODY: {response.text[:2000]}")
+
+    if error:
+        print(f"ERROR: {error}")
+
+    print(f"{'=' * 80}\n")
+    return success
+
+# Helper function to register a test user and return its auth headers
+def register_and_login_user():
+    random_id = uuid.uuid4().hex[:8]
+    email = f"test_user_{random_id}@example.com"
+    password = "Test@123456"
+    requests.post(f"{API_URL}/auth/register", json={
+        "email": email,
+        "password": password,
+        "full_name": f"Test User {random_id}"
+    })
+    login_response = requests.post(f"{API_URL}/auth/login", data={"username": email, "password": password})
+    if login_response.status_code != 200:
+        print(f"Login failed: {login_response.text}")
+        return None
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+INITIAL_CSV = """date,description,category,amount,account_type
+2024-03-01,Coffee Shop,Restaurants,4.50,credit_card
+2024-03-02,Grocery Store,Retail and Grocery,82.10,credit_card
+"""
+
+# Both stored rows again with new categories, one new row, and that new row repeated
+REIMPORT_CSV = """date,description,category,amount,account_type
+2024-03-01,Coffee Shop,Other,4.50,credit_card
+2024-03-02,Grocery Store,Other,82.10,debit
+2024-03-03,Book Store,Education,15.00,credit_card
+2024-03-03,Book Store,Education,15.00,credit_card
+"""
+
+def import_csv(headers, content, duplicates=None):
+    url = f"{API_URL}/transactions/bulk-import"
+    if duplicates:
+        url += f"?duplicates={duplicates}"
+    return requests.post(url, files={"file": ("transactions.csv", content, "text/csv")}, headers=headers)
+
+def stored_transactions(headers):
+    transactions = requests.get(f"{API_URL}/transactions", headers=headers).json()
+    return sorted((t["date"], t["description"], t["category"], t["account_type"]) for t in transactions)
+
+def import_twice(duplicates):
+    """Import INITIAL_CSV, then REIMPORT_CSV in the given mode"""
+    headers = register_and_login_user()
+    if not headers:
+        raise RuntimeError("Failed to create test user")
+    response = import_csv(headers, INITIAL_CSV)
+    if response.status_code != 200 or response.json()["imported_count"] != 2:
+        raise RuntimeError(f"Initial import failed: {response.text}")
+    return headers, import_csv(headers, REIMPORT_CSV, duplicates)
+
+# Test 1: skip (the default) imports only the new row, once
+def test_skip_mode():
+    test_name = "Duplicates Skipped"
+    try:
+        headers, response = import_twice(None)
+        result = response.json()
+        if (result["imported_count"], result["duplicate_count"], result["updated_count"]) != (1, 3, 0):
+            return print_test_result(test_name, False, response, "Expected 1 imported, 3 duplicates, 0 updated")
+
+        expected = [
+            ("2024-03-01", "Coffee Shop", "Restaurants", "credit_card"),
+            ("2024-03-02", "Grocery Store", "Retail and Grocery", "credit_card"),
+            ("2024-03-03", "Book Store", "Education", "credit_card")
+        ]
+        if stored_transactions(headers) != expected:
+            return print_test_result(test_name, False, error=f"Stored transactions changed: {stored_transactions(headers)}")
+
+        return print_test_result(test_name, True, response)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+# Test 2: overwrite updates the stored rows' category and account type in place
+def test_overwrite_mode():
+    test_name = "Duplicates Overwrite Stored Rows"
+    try:
+        headers, response = import_twice("overwrite")
+        result = response.json()
+        if (result["imported_count"], result["duplicate_count"], result["updated_count"]) != (1, 3, 2):
+            return print_test_result(test_name, False, response, "Expected 1 imported, 3 duplicates, 2 updated")
+
+        expected = [
+            ("2024-03-01", "Coffee Shop", "Other", "credit_card"),
+            ("2024-03-02", "Grocery Store", "Other", "debit"),
+            ("2024-03-03", "Book Store", "Education", "credit_card")
+        ]
+        if stored_transactions(headers) != expected:
+            return print_test_result(test_name, False, error=f"Unexpected stored transactions: {stored_transactions(headers)}")
+
+        # Rollup-backed analytics follow the moved amounts
+        categories = {c["category"]: c["amount"] for c in requests.get(f"{API_URL}/analytics/category-breakdown", headers=headers).json()}
+        if categories.get("Other") != 86.6 or "Restaurants" in categories:
+            return print_test_result(test_name, False, error=f"Category breakdown not updated: {categories}")
+
+        return print_test_result(test_name, True, response)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+# Test 3: keep_both inserts every row and still counts the duplicates
+def test_keep_both_mode():
+    test_name = "Duplicates Kept"
+    try:
+        headers, response = import_twice("keep_both")
+        result = response.json()
+        if (result["imported_count"], result["duplicate_count"], result["updated_count"]) != (4, 3, 0):
+            return print_test_result(test_name, False, response, "Expected 4 imported, 3 duplicates, 0 updated")
+        if len(stored_transactions(headers)) != 6:
+            return print_test_result(test_name, False, error=f"Expected 6 stored transactions: {stored_transactions(headers)}")
+
+        return print_test_result(test_name, True, response)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+# Test 4: Unknown modes are rejected and bad rows are reported by data row
+def test_invalid_mode_and_rows():
+    test_name = "Invalid Mode And Rows Reported"
+    try:
+        headers = register_and_login_user()
+        if not headers:
+            return print_test_result(test_name, False, error="Failed to create test user")
+
+        response = import_csv(headers, INITIAL_CSV, "replace")
+        if response.status_code != 400:
+            return print_test_result(test_name, False, response, "Unknown duplicates mode was accepted")
+
+        # A blank line and a quoted multi-line field don't shift the row numbers
+        content = 'date,description,category,amount\n\n2024-03-01,"Two\nlines",Restaurants,4.50\n2024-03-02,Missing Category,,1.00\n'
+        response = import_csv(headers, content)
+        result = response.json()
+        errors = [error for chunk in result["chunks"] for error in chunk["errors"]]
+        if result["imported_count"] != 1 or errors != [{"row": 2, "error": "missing category"}] or not result["complete"]:
+            return print_test_result(test_name, False, response, "Expected row 2 to be rejected and row 1 imported")
+
+        return print_test_result(test_name, True, response)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+def run_all_tests():
+    results = {
+        "Duplicates Skipped": test_skip_mode(),
+        "Duplicates Overwrite Stored Rows": test_overwrite_mode(),
+        "Duplicates Kept": test_keep_both_mode(),
+        "Invalid Mode And Rows Reported": test_invalid_mode_and_rows()
+    }
+
+    print("\n" + "=" * 80)
+    print("CSV IMPORT TEST SUMMARY")
+    for name, success in results.items():
+        print(f"{'✅' if success else '❌'} {name}")
+    print("=" * 80)
+    return all(results.values())
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
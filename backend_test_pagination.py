@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for GET /api/transactions pagination: keyset pages that follow
+next_cursor, the bounded plain-list mode and the Transaction response schema.
+
+Set BACKEND_URL to test a server other than http://localhost:8001.
+"""
+import requests
+import json
+import os
+import random
+import sys
+import uuid
+
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8001")
+API_URL = f"{BACKEND_URL}/api"
+print(f"Using API URL: {API_URL}")
+
+TRANSACTION_FIELDS = {
+    "id", "date", "description", "category", "amount", "account_type",
+    "user_id", "household_id", "pdf_source", "user_name", "created_at"
+}
+
+# Helper function to print test results
+def print_test_result(test_name, success, response=None, error=None):
+    print(f"\n{'=' * 80}")
+    print(f"TEST: {test_name}")
+    print(f"STATUS: {'SUCCESS' if success else 'FAILURE'}")
+
+    if response is not None:
+        print(f"RESPONSE STATUS: {response.status_code}")
+        try:
+            print(f"RESPONSE BODY: {json.dumps(response.json(), indent=2)[:2000]}")
+        except ValueError:
+            print(f"RESPONSE BODY: {response.text[:2000]}")
+
+    if error:
+        print(f"ERROR: {error}")
+
+    print(f"{'=' * 80}\n")
+    return success
+
+# Helper function to register a test user and return its auth headers
+def register_and_login_user():
+    random_id = uuid.uuid4().hex[:8]
+    email = f"test_user_{random_id}@example.com"
+    password = "Test@123456"
+    requests.post(f"{API_URL}/auth/register", json={
+        "email": email,
+        "password": password,
+        "full_name": f"Test User {random_id}"
+    })
+    login_response = requests.post(f"{API_URL}/auth/login", data={"username": email, "password": password})
+    if login_response.status_code != 200:
+        print(f"Login failed: {login_response.text}")
+        return None
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+def create_transactions(headers, count):
+    for i in range(count):
+        transaction = {
+            "date": f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+            "description": f"Pagination Test {i}",
+            "category": random.choice(["Retail and Grocery", "Restaurants"]),
+            # Repeated amounts check that the id tie-breaker keeps pages apart
+            "amount": random.choice([5.0, 12.5, 40.0]),
+            "account_type": "credit_card"
+        }
+        response = requests.post(f"{API_URL}/transactions", json=transaction, headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to create transaction: {response.text}")
+
+# Test 1: Following next_cursor visits every transaction exactly once, in order
+def test_cursor_pages_cover_every_transaction():
+    test_name = "Cursor Pages Cover Every Transaction"
+    try:
+        headers = register_and_login_user()
+        if not headers:
+            return print_test_result(test_name, False, error="Failed to create test user")
+        create_transactions(headers, 25)
+
+        for sort_by, sort_order in [("date", "desc"), ("amount", "asc"), ("description", "desc")]:
+            full = requests.get(f"{API_URL}/transactions?sort_by={sort_by}&sort_order={sort_order}", headers=headers).json()
+
+            paged, cursor, pages = [], None, 0
+            while True:
+                url = f"{API_URL}/transactions?sort_by={sort_by}&sort_order={sort_order}&limit=10&include_total=true"
+                response = requests.get(url + (f"&cursor={cursor}" if cursor else ""), headers=headers)
+                if response.status_code != 200:
+                    return print_test_result(test_name, False, response, "Page request failed")
+                page = response.json()
+                paged += page["transactions"]
+                cursor = page["next_cursor"]
+                pages += 1
+                if not cursor:
+                    break
+
+            if page["total"] != 25 or pages != 3:
+                return print_test_result(test_name, False, response, f"Expected 3 pages of 25 rows, got {pages} pages, total {page['total']}")
+            if [t["id"] for t in paged] != [t["id"] for t in full]:
+                return print_test_result(test_name, False, error=f"Pages sorted by {sort_by} {sort_order} differ from the full listing")
+            print(f"{sort_by} {sort_order}: {pages} pages, {len(paged)} unique rows in order")
+
+        return print_test_result(test_name, True)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+# Test 2: The plain list is bounded and only returns Transaction fields
+def test_list_mode_is_bounded_and_typed():
+    test_name = "List Mode Is Bounded And Typed"
+    try:
+        headers = register_and_login_user()
+        if not headers:
+            return print_test_result(test_name, False, error="Failed to create test user")
+        create_transactions(headers, 3)
+
+        response = requests.get(f"{API_URL}/transactions", headers=headers)
+        transactions = response.json()
+        if not isinstance(transactions, list) or len(transactions) != 3:
+            return print_test_result(test_name, False, response, "Expected a list of 3 transactions")
+        if "X-Next-Cursor" in response.headers:
+            return print_test_result(test_name, False, response, "X-Next-Cursor set although every row was returned")
+
+        unexpected = set(transactions[0]) - TRANSACTION_FIELDS
+        if unexpected:
+            return print_test_result(test_name, False, response, f"Fields outside the Transaction model leaked: {unexpected}")
+
+        page = requests.get(f"{API_URL}/transactions?limit=100000", headers=headers).json()
+        if len(page["transactions"]) != 3 or page["next_cursor"] is not None:
+            return print_test_result(test_name, False, error="Oversized limit was not clamped to a single page")
+
+        return print_test_result(test_name, True)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+# Test 3: Bad or mismatched cursors are rejected
+def test_invalid_cursor_rejected():
+    test_name = "Invalid Cursor Rejected"
+    try:
+        headers = register_and_login_user()
+        if not headers:
+            return print_test_result(test_name, False, error="Failed to create test user")
+        create_transactions(headers, 3)
+
+        response = requests.get(f"{API_URL}/transactions?limit=1&cursor=not-a-cursor", headers=headers)
+        if response.status_code != 400:
+            return print_test_result(test_name, False, response, "Garbage cursor was accepted")
+
+        cursor = requests.get(f"{API_URL}/transactions?limit=1&sort_by=date", headers=headers).json()["next_cursor"]
+        response = requests.get(f"{API_URL}/transactions?limit=1&sort_by=amount&cursor={cursor}", headers=headers)
+        if response.status_code != 400:
+            return print_test_result(test_name, False, response, "Cursor from another sort order was accepted")
+
+        return print_test_result(test_name, True)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+def run_all_tests():
+    results = {
+        "Cursor Pages Cover Every Transaction": test_cursor_pages_cover_every_transaction(),
+        "List Mode Is Bounded And Typed": test_list_mode_is_bounded_and_typed(),
+        "Invalid Cursor Rejected": test_invalid_cursor_rejected()
+    }
+
+    print("\n" + "=" * 80)
+    print("PAGINATION TEST SUMMARY")
+    for name, success in results.items():
+        print(f"{'✅' if success else '❌'} {name}")
+    print("=" * 80)
+    return all(results.values())
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
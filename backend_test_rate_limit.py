@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the login rate limit behind a proxy: clients that reach the server
+through the same proxy get separate buckets, keyed on the address the proxy
+appends to X-Forwarded-For, and a client can't escape its bucket by adding
+its own X-Forwarded-For entries.
+
+Run the server with TRUSTED_PROXY_HOPS=1 and the default LOGIN_RATE_LIMIT=10.
+Start uvicorn with --no-proxy-headers when testing against localhost, otherwise
+uvicorn itself trusts X-Forwarded-For from 127.0.0.1 and hides what the
+server does behind a remote proxy.
+Set BACKEND_URL to test a server other than http://localhost:8001.
+"""
+import requests
+import json
+import os
+import sys
+import uuid
+
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8001")
+API_URL = f"{BACKEND_URL}/api"
+LOGIN_RATE_LIMIT = int(os.environ.get("LOGIN_RATE_LIMIT", 10))
+print(f"Using API URL: {API_URL}")
+
+# Helper function to print test results
+def print_test_result(test_name, success, response=None, error=None):
+    print(f"\n{'=' * 80}")
+    print(f"TEST: {test_name}")
+    print(f"STATUS: {'SUCCESS' if success else 'FAILURE'}")
+
+    if response is not None:
+        print(f"RESPONSE STATUS: {response.status_code}")
+        try:
+            print(f"RESPONSE BODY: {json.dumps(response.json(), indent=2)[:2000]}")
+        except ValueError:
+            print(f"RESPONSE BODY: {response.text[:2000]}")
+
+    if error:
+        print(f"ERROR: {error}")
+
+    print(f"{'=' * 80}\n")
+    return success
+
+def random_ip():
+    """Documentation-range address that no other test run uses"""
+    random_bytes = uuid.uuid4().bytes
+    return f"198.{18 + random_bytes[0] % 2}.{random_bytes[1]}.{random_bytes[2]}"
+
+def failed_login(forwarded_for):
+    """Attempt a login with a wrong password from the given X-Forwarded-For chain"""
+    return requests.post(
+        f"{API_URL}/auth/login",
+        data={"username": f"nobody_{uuid.uuid4().hex[:8]}@example.com", "password": "wrong"},
+        headers={"X-Forwarded-For": forwarded_for}
+    )
+
+# Test 1: Two clients behind the same proxy are limited independently
+def test_clients_get_separate_buckets():
+    test_name = "Clients Get Separate Buckets"
+    try:
+        client_a, client_b = random_ip(), random_ip()
+
+        for _ in range(LOGIN_RATE_LIMIT):
+            response = failed_login(client_a)
+            if response.status_code != 401:
+                return print_test_result(test_name, False, response, "Attempt within the limit was not a plain 401")
+
+        response = failed_login(client_a)
+        if response.status_code != 429 or "Retry-After" not in response.headers:
+            return print_test_result(test_name, False, response, "Client A was not limited after using its attempts")
+
+        response = failed_login(client_b)
+        if response.status_code != 401:
+            return print_test_result(test_name, False, response, "Client B was limited by client A's attempts")
+
+        return print_test_result(test_name, True)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+# Test 2: Entries the client prepends to X-Forwarded-For don't give it a new bucket
+def test_spoofed_forwarded_for_ignored():
+    test_name = "Spoofed X-Forwarded-For Ignored"
+    try:
+        client = random_ip()
+
+        for _ in range(LOGIN_RATE_LIMIT):
+            failed_login(f"{random_ip()}, {client}")
+
+        response = failed_login(f"{random_ip()}, {client}")
+        if response.status_code != 429:
+            return print_test_result(test_name, False, response, "Client escaped its limit with forged X-Forwarded-For entries")
+
+        return print_test_result(test_name, True)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+def run_all_tests():
+    results = {
+        "Clients Get Separate Buckets": test_clients_get_separate_buckets(),
+        "Spoofed X-Forwarded-For Ignored": test_spoofed_forwarded_for_ignored()
+    }
+
+    print("\n" + "=" * 80)
+    print("LOGIN RATE LIMIT TEST SUMMARY")
+    for name, success in results.items():
+        print(f"{'✅' if success else '❌'} {name}")
+    print("=" * 80)
+    return all(results.values())
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
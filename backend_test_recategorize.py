@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Tests for POST /api/transactions/bulk-recategorize: selection by ids or by
+filters (never both), the counts it reports, and that rollup-backed
+analytics still agree with the transactions afterwards.
+
+Set BACKEND_URL to test a server other than http://localhost:8001.
+"""
+import requests
+import json
+import os
+import sys
+import threading
+import uuid
+
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8001")
+API_URL = f"{BACKEND_URL}/api"
+print(f"Using API URL: {API_URL}")
+
+# Helper function to print test results
+def print_test_result(test_name, success, response=None, error=None):
+    print(f"\n{'=' * 80}")
+    print(f"TEST: {test_name}")
+    print(f"STATUS: {'SUCCESS' if success else 'FAILURE'}")
+
+    if response is not None:
+        print(f"RESPONSE STATUS: {response.status_code}")
+        try:
+            print(f"RESPONSE BODY: {json.dumps(response.json(), indent=2)[:2000]}")
+        except ValueError:
+            print(f"RESPONSE BODY: {response.text[:2000]}")
+
+    if error:
+        print(f"ERROR: {error}")
+
+    print(f"{'=' * 80}\n")
+    return success
+
+# Helper function to register a test user and return its auth headers
+def register_and_login_user():
+    random_id = uuid.uuid4().hex[:8]
+    email = f"test_user_{random_id}@example.com"
+    password = "Test@123456"
+    requests.post(f"{API_URL}/auth/register", json={
+        "email": email,
+        "password": password,
+        "full_name": f"Test User {random_id}"
+    })
+    login_response = requests.post(f"{API_URL}/auth/login", data={"username": email, "password": password})
+    if login_response.status_code != 200:
+        print(f"Login failed: {login_response.text}")
+        return None
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+# Whole-month ranges are answered from monthly_rollups, others from the transactions.
+# Test transactions fall on days 1-28, so both ranges below cover the same rows.
+ROLLUP_RANGE = "start_date=2024-01-01&end_date=2024-12-31"
+SCAN_RANGE = "start_date=2024-01-01&end_date=2024-12-30"
+ROLLUP_ENDPOINTS = ["category-breakdown", "account-type-breakdown"]
+
+def rounded(value):
+    if isinstance(value, float):
+        return round(value, 2)
+    if isinstance(value, list):
+        return [rounded(item) for item in value]
+    if isinstance(value, dict):
+        return {key: rounded(item) for key, item in value.items()}
+    return value
+
+def rollups_match_transactions(headers):
+    """Return the first endpoint whose rollup answer differs from the transaction scan, or None"""
+    for endpoint in ROLLUP_ENDPOINTS:
+        from_rollups = requests.get(f"{API_URL}/analytics/{endpoint}?{ROLLUP_RANGE}", headers=headers).json()
+        from_scan = requests.get(f"{API_URL}/analytics/{endpoint}?{SCAN_RANGE}", headers=headers).json()
+        if rounded(from_rollups) != rounded(from_scan):
+            return f"{endpoint}: {from_rollups} != {from_scan}"
+    return None
+
+def create_transactions(headers):
+    ids = []
+    for i, (description, category) in enumerate([
+        ("Corner Cafe", "Restaurants"), ("Corner Cafe", "Restaurants"), ("CORNER CAFE #2", "Retail and Grocery"),
+        ("Gas Station", "Transportation"), ("Book Store", "Health and Education"), ("Book Store", "Other")
+    ]):
+        response = requests.post(f"{API_URL}/transactions", json={
+            "date": f"2024-0{i % 3 + 1}-1{i}",
+            "description": description,
+            "category": category,
+            "amount": 10.0 + i,
+            "account_type": "debit" if i % 2 else "credit_card"
+        }, headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to create transaction: {response.text}")
+        ids.append(response.json()["id"])
+    return ids
+
+def categories_by_id(headers):
+    return {t["id"]: t["category"] for t in requests.get(f"{API_URL}/transactions", headers=headers).json()}
+
+# Test 1: Ambiguous or empty requests are rejected without changing anything
+def test_invalid_requests_rejected():
+    test_name = "Invalid Requests Rejected"
+    try:
+        headers = register_and_login_user()
+        if not headers:
+            return print_test_result(test_name, False, error="Failed to create test user")
+        ids = create_transactions(headers)
+        before = categories_by_id(headers)
+
+        for body in [
+            {"category": "Restaurants", "transaction_ids": ids[:2], "description": "book"},
+            {"category": "Restaurants", "transaction_ids": ids[:2], "start_date": "2024-01-01"},
+            {"category": "Restaurants"},
+            {"category": "   ", "transaction_ids": ids[:2]}
+        ]:
+            response = requests.post(f"{API_URL}/transactions/bulk-recategorize", json=body, headers=headers)
+            if response.status_code != 400:
+                return print_test_result(test_name, False, response, f"Request was accepted: {body}")
+
+        if categories_by_id(headers) != before:
+            return print_test_result(test_name, False, error="A rejected request changed transactions")
+
+        return print_test_result(test_name, True)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+# Test 2: Selecting by ids changes only those rows and counts only real changes
+def test_recategorize_by_ids():
+    test_name = "Recategorize By IDs"
+    try:
+        headers = register_and_login_user()
+        if not headers:
+            return print_test_result(test_name, False, error="Failed to create test user")
+        ids = create_transactions(headers)
+
+        # ids[0] and ids[1] are already Restaurants
+        response = requests.post(f"{API_URL}/transactions/bulk-recategorize", json={
+            "category": "Restaurants", "transaction_ids": ids[:3] + ["missing-id"]
+        }, headers=headers)
+        if response.status_code != 200 or response.json()["updated_count"] != 1:
+            return print_test_result(test_name, False, response, "Expected exactly one transaction to change")
+
+        categories = categories_by_id(headers)
+        expected = ["Restaurants", "Restaurants", "Restaurants", "Transportation", "Health and Education", "Other"]
+        if [categories[transaction_id] for transaction_id in ids] != expected:
+            return print_test_result(test_name, False, error=f"Unexpected categories: {categories}")
+
+        mismatch = rollups_match_transactions(headers)
+        if mismatch:
+            return print_test_result(test_name, False, error=f"Rollups out of step: {mismatch}")
+
+        return print_test_result(test_name, True, response)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+# Test 3: Selecting by filters matches descriptions case-insensitively within the dates
+def test_recategorize_by_filters():
+    test_name = "Recategorize By Filters"
+    try:
+        headers = register_and_login_user()
+        if not headers:
+            return print_test_result(test_name, False, error="Failed to create test user")
+        ids = create_transactions(headers)
+
+        # Corner Cafe rows are on 2024-01-10, 2024-02-11 and 2024-03-12
+        response = requests.post(f"{API_URL}/transactions/bulk-recategorize", json={
+            "category": "Other", "description": "corner cafe", "start_date": "2024-02-01"
+        }, headers=headers)
+        if response.status_code != 200 or response.json()["updated_count"] != 2:
+            return print_test_result(test_name, False, response, "Expected the two Corner Cafe rows from February on to change")
+
+        categories = categories_by_id(headers)
+        expected = ["Restaurants", "Other", "Other", "Transportation", "Health and Education", "Other"]
+        if [categories[transaction_id] for transaction_id in ids] != expected:
+            return print_test_result(test_name, False, error=f"Unexpected categories: {categories}")
+
+        # Repeating the request finds nothing left to change
+        response = requests.post(f"{API_URL}/transactions/bulk-recategorize", json={
+            "category": "Other", "description": "corner cafe", "start_date": "2024-02-01"
+        }, headers=headers)
+        if response.json()["updated_count"] != 0:
+            return print_test_result(test_name, False, response, "Repeated request changed transactions")
+
+        mismatch = rollups_match_transactions(headers)
+        if mismatch:
+            return print_test_result(test_name, False, error=f"Rollups out of step: {mismatch}")
+
+        return print_test_result(test_name, True)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+# Test 4: Rows edited while a recategorization runs are skipped without skewing the rollups
+def test_concurrent_edits_during_recategorize():
+    test_name = "Concurrent Edits During Recategorize"
+    try:
+        headers = register_and_login_user()
+        if not headers:
+            return print_test_result(test_name, False, error="Failed to create test user")
+
+        content = "date,description,category,amount\n" + "".join(
+            f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d},Concurrent {i},Restaurants,{i + 1}.00\n" for i in range(200)
+        )
+        requests.post(f"{API_URL}/transactions/bulk-import", files={"file": ("concurrent.csv", content, "text/csv")}, headers=headers)
+        ids = list(categories_by_id(headers))
+
+        updated_count = 0
+        partial_rounds = 0
+        for round_number, category in enumerate(["Transportation", "Other", "Restaurants", "Transportation", "Other"]):
+            pending = sum(1 for current in categories_by_id(headers).values() if current != category)
+
+            # Amount edits race the recategorization's read and write of the same rows
+            def edit_amounts(offset):
+                for transaction_id in ids[offset::4]:
+                    requests.put(f"{API_URL}/transactions/{transaction_id}", json={"amount": round_number + offset + 0.5}, headers=headers)
+            editors = [threading.Thread(target=edit_amounts, args=(offset,)) for offset in range(4)]
+            for editor in editors:
+                editor.start()
+            response = requests.post(f"{API_URL}/transactions/bulk-recategorize", json={"category": category, "description": "concurrent"}, headers=headers)
+            for editor in editors:
+                editor.join()
+
+            updated = response.json()["updated_count"]
+            changed = sum(1 for current in categories_by_id(headers).values() if current == category) - (len(ids) - pending)
+            if updated != changed:
+                return print_test_result(test_name, False, response, f"Reported {updated} updates but {changed} rows changed")
+            partial_rounds += updated < pending
+
+            mismatch = rollups_match_transactions(headers)
+            if mismatch:
+                return print_test_result(test_name, False, error=f"Rollups out of step after round {round_number + 1}: {mismatch}")
+
+        print(f"{partial_rounds} of 5 rounds skipped rows edited concurrently")
+        return print_test_result(test_name, True)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+def run_all_tests():
+    results = {
+        "Invalid Requests Rejected": test_invalid_requests_rejected(),
+        "Recategorize By IDs": test_recategorize_by_ids(),
+        "Recategorize By Filters": test_recategorize_by_filters(),
+        "Concurrent Edits During Recategorize": test_concurrent_edits_during_recategorize()
+    }
+
+    print("\n" + "=" * 80)
+    print("BULK RECATEGORIZE TEST SUMMARY")
+    for name, success in results.items():
+        print(f"{'✅' if success else '❌'} {name}")
+    print("=" * 80)
+    return all(results.values())
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Tests for the monthly rollups: after a mix of creates, edits, deletes, CSV
+imports and recategorizations, analytics answered from monthly_rollups
+(whole-month ranges) must match the same analytics scanned from the
+transactions.
+
+Set BACKEND_URL to test a server other than http://localhost:8001.
+"""
+import requests
+import json
+import os
+import random
+import sys
+import uuid
+
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8001")
+API_URL = f"{BACKEND_URL}/api"
+print(f"Using API URL: {API_URL}")
+
+# Helper function to print test results
+def print_test_result(test_name, success, response=None, error=None):
+    print(f"\n{'=' * 80}")
+    print(f"TEST: {test_name}")
+    print(f"STATUS: {'SUCCESS' if success else 'FAILURE'}")
+
+    if response is not None:
+        print(f"RESPONSE STATUS: {response.status_code}")
+        try:
+            print(f"RESPONSE BODY: {json.dumps(response.json(), indent=2)[:2000]}")
+        except ValueError:
+            print(f"RESPONSE BODY: {response.text[:2000]}")
+
+    if error:
+        print(f"ERROR: {error}")
+
+    print(f"{'=' * 80}\n")
+    return success
+
+# Helper function to register a test user and return its auth headers
+def register_and_login_user():
+    random_id = uuid.uuid4().hex[:8]
+    email = f"test_user_{random_id}@example.com"
+    password = "Test@123456"
+    requests.post(f"{API_URL}/auth/register", json={
+        "email": email,
+        "password": password,
+        "full_name": f"Test User {random_id}"
+    })
+    login_response = requests.post(f"{API_URL}/auth/login", data={"username": email, "password": password})
+    if login_response.status_code != 200:
+        print(f"Login failed: {login_response.text}")
+        return None
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+# Whole-month ranges are answered from monthly_rollups, others from the transactions.
+# Test transactions fall on days 1-28, so both ranges below cover the same rows.
+ROLLUP_RANGE = "start_date=2024-01-01&end_date=2024-12-31"
+SCAN_RANGE = "start_date=2024-01-01&end_date=2024-12-30"
+ROLLUP_ENDPOINTS = ["category-breakdown", "account-type-breakdown", "source-breakdown"]
+
+def rounded(value):
+    if isinstance(value, float):
+        return round(value, 2)
+    if isinstance(value, list):
+        return [rounded(item) for item in value]
+    if isinstance(value, dict):
+        return {key: rounded(item) for key, item in value.items()}
+    return value
+
+def rollups_match_transactions(headers):
+    """Return the first endpoint whose rollup answer differs from the transaction scan, or None"""
+    for endpoint in ROLLUP_ENDPOINTS:
+        from_rollups = requests.get(f"{API_URL}/analytics/{endpoint}?{ROLLUP_RANGE}", headers=headers).json()
+        from_scan = requests.get(f"{API_URL}/analytics/{endpoint}?{SCAN_RANGE}", headers=headers).json()
+        if rounded(from_rollups) != rounded(from_scan):
+            return f"{endpoint}: {from_rollups} != {from_scan}"
+    return None
+
+def create_transaction(headers, **fields):
+    transaction = {
+        "date": f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+        "description": f"Rollup Test {uuid.uuid4().hex[:6]}",
+        "category": random.choice(["Restaurants", "Transportation", "Retail and Grocery"]),
+        "amount": random.choice([4.5, 12.25, 80.0, -25.0]),
+        "account_type": random.choice(["credit_card", "debit"]),
+        **fields
+    }
+    response = requests.post(f"{API_URL}/transactions", json=transaction, headers=headers)
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to create transaction: {response.text}")
+    return response.json()["id"]
+
+def import_csv(headers, rows, duplicates="skip"):
+    content = "date,description,category,amount,account_type\n" + "".join(
+        f"{row['date']},{row['description']},{row['category']},{row['amount']},{row['account_type']}\n" for row in rows
+    )
+    response = requests.post(
+        f"{API_URL}/transactions/bulk-import?duplicates={duplicates}",
+        files={"file": ("rollups.csv", content, "text/csv")},
+        headers=headers
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"CSV import failed: {response.text}")
+    return response.json()
+
+# Test 1: Every kind of write keeps the rollups in step with the transactions
+def test_rollups_follow_writes():
+    test_name = "Rollups Follow Writes"
+    try:
+        headers = register_and_login_user()
+        if not headers:
+            return print_test_result(test_name, False, error="Failed to create test user")
+        random.seed(14)
+
+        def check(step):
+            mismatch = rollups_match_transactions(headers)
+            print(f"{'✅' if not mismatch else '❌'} after {step}")
+            return mismatch
+
+        steps = []
+        ids = [create_transaction(headers) for _ in range(30)]
+        steps.append(("creating transactions", check("creating transactions")))
+
+        requests.put(f"{API_URL}/transactions/{ids[0]}", json={"category": "Health and Education"}, headers=headers)
+        requests.put(f"{API_URL}/transactions/{ids[1]}", json={"amount": 333.33}, headers=headers)
+        requests.put(f"{API_URL}/transactions/{ids[2]}", json={"is_inflow": True}, headers=headers)
+        requests.put(f"{API_URL}/transactions/{ids[3]}", json={"description": "Renamed", "amount": 1.0, "is_inflow": False}, headers=headers)
+        steps.append(("editing transactions", check("editing transactions")))
+
+        requests.delete(f"{API_URL}/transactions/{ids[4]}", headers=headers)
+        requests.delete(f"{API_URL}/transactions/{ids[4]}", headers=headers)
+        requests.post(f"{API_URL}/transactions/bulk-delete", json={"transaction_ids": ids[5:10] + ["missing-id"]}, headers=headers)
+        steps.append(("deleting transactions", check("deleting transactions")))
+
+        rows = [{
+            "date": f"2024-{month:02d}-15", "description": f"Imported {month}", "category": "Restaurants",
+            "amount": 10.0 * month, "account_type": "debit"
+        } for month in range(1, 13)]
+        import_csv(headers, rows)
+        import_csv(headers, [{**row, "category": "Transportation", "account_type": "credit_card"} for row in rows[:6]], "overwrite")
+        import_csv(headers, rows[6:], "keep_both")
+        steps.append(("CSV imports", check("CSV imports")))
+
+        requests.post(f"{API_URL}/transactions/bulk-recategorize", json={"category": "Restaurants", "transaction_ids": ids[10:20]}, headers=headers)
+        requests.post(f"{API_URL}/transactions/bulk-recategorize", json={"category": "Health and Education", "description": "imported"}, headers=headers)
+        steps.append(("recategorizing", check("recategorizing")))
+
+        failed = [(step, mismatch) for step, mismatch in steps if mismatch]
+        if failed:
+            return print_test_result(test_name, False, error=f"Rollups out of step after {failed[0][0]}: {failed[0][1]}")
+
+        return print_test_result(test_name, True)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+# Test 2: A source mixing account types reports the same account type either way
+def test_mixed_source_account_type():
+    test_name = "Mixed Source Account Type"
+    try:
+        headers = register_and_login_user()
+        if not headers:
+            return print_test_result(test_name, False, error="Failed to create test user")
+
+        for account_type in ["credit_card", "debit", "credit_card"]:
+            create_transaction(headers, date="2024-05-10", account_type=account_type)
+
+        mismatch = rollups_match_transactions(headers)
+        if mismatch:
+            return print_test_result(test_name, False, error=mismatch)
+
+        return print_test_result(test_name, True)
+    except Exception as e:
+        return print_test_result(test_name, False, error=str(e))
+
+def run_all_tests():
+    results = {
+        "Rollups Follow Writes": test_rollups_follow_writes(),
+        "Mixed Source Account Type": test_mixed_source_account_type()
+    }
+
+    print("\n" + "=" * 80)
+    print("MONTHLY ROLLUP TEST SUMMARY")
+    for name, success in results.items():
+        print(f"{'✅' if success else '❌'} {name}")
+    print("=" * 80)
+    return all(results.values())
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -9,15 +9,23 @@ import AdvancedFilters from './components/AdvancedFilters';
 import OptimizedTransactionTable from './components/OptimizedTransactionTable';
 import AnalyticsDashboard from './components/AnalyticsDashboard';
 
+// Transactions loaded per page; further pages follow the server's next_cursor
+const TRANSACTIONS_PAGE_SIZE = 200;
+
 // Main Dashboard Component (wrapped with authentication)
 function Dashboard() {
   const API = process.env.REACT_APP_BACKEND_URL + '/api' || 'http://localhost:8001/api';
   const { getCurrentUserId, viewMode, getViewModeLabel } = useAuth();
   
   const [transactions, setTransactions] = useState([]);
+  const [transactionsCursor, setTransactionsCursor] = useState(null);
+  const [transactionsTotal, setTransactionsTotal] = useState(0);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [categories, setCategories] = useState([]);
   const [monthlyReports, setMonthlyReports] = useState([]);
   const [categoryBreakdown, setCategoryBreakdown] = useState([]);
+  const [accountTypeBreakdown, setAccountTypeBreakdown] = useState(null);
+  const [sourceBreakdown, setSourceBreakdown] = useState([]);
   const [activeTab, setActiveTab] = useState('overview');
   const [loading, setLoading] = useState(true);
   const [uploadingPDF, setUploadingPDF] = useState(false);
@@ -86,41 +94,63 @@ function Dashboard() {
     fetchData();
   }, []);
 
+  // Build query parameters for transactions
+  const buildTransactionParams = () => {
+    const transactionParams = new URLSearchParams();
+    if (filters.startDate) transactionParams.append('start_date', filters.startDate);
+    if (filters.endDate) transactionParams.append('end_date', filters.endDate);
+    if (filters.category) transactionParams.append('category', filters.category);
+    if (filters.pdfSource) transactionParams.append('pdf_source', filters.pdfSource);
+    if (filters.accountType) transactionParams.append('account_type', filters.accountType);
+    transactionParams.append('sort_by', sortConfig.field);
+    transactionParams.append('sort_order', sortConfig.direction);
+    return transactionParams;
+  };
+
   const fetchData = async () => {
     setLoading(true);
     try {
-      // Build query parameters for transactions
-      const transactionParams = new URLSearchParams();
-      if (filters.startDate) transactionParams.append('start_date', filters.startDate);
-      if (filters.endDate) transactionParams.append('end_date', filters.endDate);
-      if (filters.category) transactionParams.append('category', filters.category);
-      if (filters.pdfSource) transactionParams.append('pdf_source', filters.pdfSource);
-      if (filters.accountType) transactionParams.append('account_type', filters.accountType);
-      transactionParams.append('sort_by', sortConfig.field);
-      transactionParams.append('sort_order', sortConfig.direction);
-
-      const currentYear = new Date().getFullYear();
-      
-      const [transactionsRes, monthlyRes, categoryRes, categoriesRes, sourcesRes] = await Promise.all([
-        axios.get(`${API}/transactions?${transactionParams.toString()}`),
-        axios.get(`${API}/analytics/monthly-report?year=${currentYear}`),
-        axios.get(`${API}/analytics/category-breakdown`),
-        axios.get(`${API}/categories`),
-        axios.get(`${API}/transactions/sources`)
-      ]);
-      
-      console.log('Monthly data received:', monthlyRes.data);
-      setTransactions(transactionsRes.data);
-      setMonthlyReports(monthlyRes.data);
-      setCategoryBreakdown(categoryRes.data);
-      setCategories(categoriesRes.data);
-      setPdfSources(sourcesRes.data.sources || []);
+      const transactionParams = buildTransactionParams();
+      transactionParams.append('limit', TRANSACTIONS_PAGE_SIZE);
+      transactionParams.append('year', new Date().getFullYear());
+
+      // The dashboard returns the first page of transactions; loadMoreTransactions follows next_cursor
+      const dashboardRes = await axios.get(`${API}/dashboard?${transactionParams.toString()}`);
+      const dashboard = dashboardRes.data;
+
+      console.log('Monthly data received:', dashboard.monthly_report);
+      setTransactions(dashboard.transactions.transactions);
+      setTransactionsCursor(dashboard.transactions.next_cursor);
+      setTransactionsTotal(dashboard.transactions.total);
+      setMonthlyReports(dashboard.monthly_report);
+      setCategoryBreakdown(dashboard.category_breakdown);
+      setAccountTypeBreakdown(dashboard.account_type_breakdown);
+      setSourceBreakdown(dashboard.source_breakdown);
+      setCategories(dashboard.categories);
+      setPdfSources(dashboard.sources || []);
     } catch (error) {
       console.error('Error fetching data:', error);
     }
     setLoading(false);
   };
 
+  const loadMoreTransactions = async () => {
+    if (!transactionsCursor) return;
+    setLoadingMore(true);
+    try {
+      const transactionParams = buildTransactionParams();
+      transactionParams.append('limit', TRANSACTIONS_PAGE_SIZE);
+      transactionParams.append('cursor', transactionsCursor);
+
+      const response = await axios.get(`${API}/transactions?${transactionParams.toString()}`);
+      setTransactions(prev => [...prev, ...response.data.transactions]);
+      setTransactionsCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error('Error loading more transactions:', error);
+    }
+    setLoadingMore(false);
+  };
+
   const handleAddTransaction = async (e) => {
     e.preventDefault();
     try {
@@ -232,22 +262,35 @@ function Dashboard() {
     }
   };
 
+  const waitForImportJob = async (jobId) => {
+    // Poll the import job until the backend worker finishes it
+    while (true) {
+      const response = await axios.get(`${API}/imports/${jobId}`);
+      if (response.data.status === 'completed') return response.data;
+      if (response.data.status === 'failed') throw new Error(response.data.error);
+      await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+  };
+
   const handlePDFUpload = async (event) => {
-    const file = event.target.files[0];
-    if (!file) return;
+    const files = Array.from(event.target.files);
+    if (files.length === 0) return;
 
     setUploadingPDF(true);
     const formData = new FormData();
-    formData.append('file', file);
+    // Several statements go up as one batch so duplicates are checked across all of them
+    const endpoint = files.length > 1 ? `${API}/transactions/pdf-import/batch` : `${API}/transactions/pdf-import`;
+    files.forEach(file => formData.append(files.length > 1 ? 'files' : 'file', file));
 
     try {
-      const response = await axios.post(`${API}/transactions/pdf-import`, formData, {
+      const queued = await axios.post(endpoint, formData, {
         headers: {
           'Content-Type': 'multipart/form-data',
         },
       });
+      const result = await waitForImportJob(queued.data.job_id);
 
-      alert(`PDF processed successfully!\n${response.data.message}\nImported: ${response.data.imported_count} transactions\nDuplicates skipped: ${response.data.duplicate_count || 0}`);
+      alert(`PDF processed successfully!\n${result.message}\nImported: ${result.imported_count} transactions\nDuplicates skipped: ${result.duplicate_count || 0}`);
       fetchData(); // Refresh data
       event.target.value = ''; // Reset file input
     } catch (error) {
@@ -412,7 +455,7 @@ function Dashboard() {
             </div>
             <div className="text-right">
               <p className="text-sm text-gray-600">Total Transactions</p>
-              <p className="text-2xl font-bold text-blue-600">{transactions.length}</p>
+              <p className="text-2xl font-bold text-blue-600">{transactionsTotal}</p>
               <p className="text-xs text-gray-500">Welcome, {currentUser.name}</p>
             </div>
           </div>
@@ -500,7 +543,7 @@ function Dashboard() {
                   <div className="ml-4">
                     <p className="text-sm font-medium text-gray-600">PDF Imports</p>
                     <p className="text-2xl font-bold text-gray-900">
-                      {transactions.filter(t => t.pdf_source).length}
+                      {sourceBreakdown.filter(s => s.source !== 'Manual').reduce((sum, s) => sum + s.count, 0)}
                     </p>
                   </div>
                 </div>
@@ -589,6 +632,7 @@ function Dashboard() {
                     <input
                       type="file"
                       accept=".pdf"
+                      multiple
                       onChange={handlePDFUpload}
                       disabled={uploadingPDF}
                       className="block w-full text-sm text-gray-500 file:mr-4 file:py-2 file:px-4 file:rounded-full file:border-0 file:text-sm file:font-semibold file:bg-blue-50 file:text-blue-700 hover:file:bg-blue-100 disabled:opacity-50"
@@ -784,9 +828,18 @@ function Dashboard() {
               <div className="flex justify-between items-center">
                 <div className="flex items-center space-x-4">
                   <div className="text-sm text-gray-600">
-                    Showing {transactions.length} transactions
+                    Showing {transactions.length} of {transactionsTotal} transactions
                     {filters.startDate || filters.endDate || filters.category || filters.pdfSource ? ' (filtered)' : ''}
                   </div>
+                  {transactionsCursor && (
+                    <button
+                      onClick={loadMoreTransactions}
+                      disabled={loadingMore}
+                      className="px-3 py-1 text-sm text-blue-600 border border-blue-600 rounded-md hover:bg-blue-50 disabled:opacity-50 transition-colors"
+                    >
+                      {loadingMore ? 'Loading...' : 'Load more'}
+                    </button>
+                  )}
                 </div>
                 <div className="flex items-center space-x-3">
                   <button
@@ -815,7 +868,8 @@ function Dashboard() {
           <AnalyticsDashboard
             categoryBreakdown={categoryBreakdown}
             monthlyReports={monthlyReports}
-            transactions={transactions}
+            accountTypeBreakdown={accountTypeBreakdown}
+            sourceBreakdown={sourceBreakdown}
             formatCurrency={formatCurrency}
             getMonthName={getMonthName}
           />
@@ -923,7 +977,10 @@ function Dashboard() {
                       const formData = new FormData();
                       formData.append('file', file);
                       try {
-                        await axios.post(`${API}/transactions/bulk-import`, formData);
+                        const response = await axios.post(`${API}/transactions/bulk-import`, formData);
+                        if (!response.data.complete) {
+                          alert(response.data.message);
+                        }
                         fetchData();
                         e.target.value = '';
                       } catch (error) {
@@ -42,7 +42,8 @@ function SortableWidget({ widget, widgetId, children }) {
 const AnalyticsDashboard = ({ 
   categoryBreakdown, 
   monthlyReports, 
-  transactions,
+  accountTypeBreakdown,
+  sourceBreakdown,
   formatCurrency,
   getMonthName 
 }) => {
@@ -92,15 +93,15 @@ const AnalyticsDashboard = ({
                 <div>
                   <h4 className="font-medium text-blue-900">Debit Accounts</h4>
                   <p className="text-sm text-blue-700">
-                    {transactions.filter(t => t.account_type === 'debit').length} transactions
+                    {accountTypeBreakdown?.debit.count || 0} transactions
                   </p>
                 </div>
                 <div className="text-right">
                   <p className="text-lg font-semibold text-blue-900">
-                    {formatCurrency(Math.abs(transactions.filter(t => t.account_type === 'debit').reduce((sum, t) => sum + t.amount, 0)))}
+                    {formatCurrency(accountTypeBreakdown?.debit.total || 0)}
                   </p>
                   <p className="text-xs text-blue-600">
-                    {transactions.length > 0 ? ((Math.abs(transactions.filter(t => t.account_type === 'debit').reduce((sum, t) => sum + t.amount, 0)) / Math.abs(transactions.reduce((sum, t) => sum + t.amount, 0))) * 100).toFixed(1) : 0}%
+                    {(accountTypeBreakdown?.debit.percentage || 0).toFixed(1)}%
                   </p>
                 </div>
               </div>
@@ -112,15 +113,15 @@ const AnalyticsDashboard = ({
                 <div>
                   <h4 className="font-medium text-purple-900">Credit Cards</h4>
                   <p className="text-sm text-purple-700">
-                    {transactions.filter(t => t.account_type === 'credit_card').length} transactions
+                    {accountTypeBreakdown?.credit.count || 0} transactions
                   </p>
                 </div>
                 <div className="text-right">
                   <p className="text-lg font-semibold text-purple-900">
-                    {formatCurrency(Math.abs(transactions.filter(t => t.account_type === 'credit_card').reduce((sum, t) => sum + t.amount, 0)))}
+                    {formatCurrency(accountTypeBreakdown?.credit.total || 0)}
                   </p>
                   <p className="text-xs text-purple-600">
-                    {transactions.length > 0 ? ((Math.abs(transactions.filter(t => t.account_type === 'credit_card').reduce((sum, t) => sum + t.amount, 0)) / Math.abs(transactions.reduce((sum, t) => sum + t.amount, 0))) * 100).toFixed(1) : 0}%
+                    {(accountTypeBreakdown?.credit.percentage || 0).toFixed(1)}%
                   </p>
                 </div>
               </div>
@@ -134,12 +135,8 @@ const AnalyticsDashboard = ({
       component: 'custom',
       render: () => (
         <div className="space-y-3">
-          {Array.from(new Set(transactions.map(t => t.pdf_source || 'Manual')))
-            .map(source => {
-              const sourceTransactions = transactions.filter(t => (t.pdf_source || 'Manual') === source);
-              const totalAmount = Math.abs(sourceTransactions.reduce((sum, t) => sum + t.amount, 0));
-              const percentage = transactions.length > 0 ? (totalAmount / Math.abs(transactions.reduce((sum, t) => sum + t.amount, 0))) * 100 : 0;
-              
+          {sourceBreakdown
+            .map(({ source, total: totalAmount, count, percentage }) => {
               return (
                 <div key={source} className="flex items-center justify-between p-3 border rounded-lg hover:bg-gray-50 transition-colors">
                   <div className="flex items-center space-x-3">
@@ -149,7 +146,7 @@ const AnalyticsDashboard = ({
                     }`}></div>
                     <div>
                       <p className="font-medium text-gray-900">{source}</p>
-                      <p className="text-sm text-gray-500">{sourceTransactions.length} transactions</p>
+                      <p className="text-sm text-gray-500">{count} transactions</p>
                     </div>
                   </div>
                   <div className="text-right">
@@ -204,6 +201,8 @@ const AnalyticsDashboard = ({
     }
   }
 
+  const transactionCount = categoryBreakdown.reduce((sum, cat) => sum + cat.count, 0);
+
   return (
     <div className="space-y-6">
       {/* Dashboard Controls */}
@@ -290,7 +289,7 @@ const AnalyticsDashboard = ({
         <h3 className="text-lg font-semibold mb-4">📈 Quick Insights</h3>
         <div className="grid grid-cols-2 md:grid-cols-4 gap-4 text-center">
           <div>
-            <div className="text-2xl font-bold">{transactions.length}</div>
+            <div className="text-2xl font-bold">{transactionCount}</div>
             <div className="text-sm opacity-90">Total Transactions</div>
           </div>
           <div>
@@ -305,8 +304,8 @@ const AnalyticsDashboard = ({
           </div>
           <div>
             <div className="text-2xl font-bold">
-              {transactions.length > 0 
-                ? formatCurrency(Math.abs(categoryBreakdown.reduce((sum, cat) => sum + cat.amount, 0)) / transactions.length)
+              {transactionCount > 0 
+                ? formatCurrency(Math.abs(categoryBreakdown.reduce((sum, cat) => sum + cat.amount, 0)) / transactionCount)
                 : '$0.00'
               }
             </div>
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Checks for the in-memory analytics cache: it stays within its entry and byte
+budgets, keeps a bounded number of per-user versions, and never serves a
+response computed before the user's last write, even once that user's
+version counter has been evicted.
+"""
+import asyncio
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "lifetracker_test")
+
+from server import AnalyticsCache, MemoryAnalyticsBackend
+
+def test_cache_bounds():
+    """Entries are evicted by count and by total size; oversized bodies are not stored"""
+    print("🧪 Testing analytics cache bounds")
+    print("=" * 60)
+
+    async def run():
+        backend = MemoryAnalyticsBackend(max_entries=3, max_bytes=100, ttl_seconds=60)
+        for i in range(10):
+            await backend.put(f"key{i}", b"x" * 30)
+        assert len(backend.entries) == 3 and backend.size == 90, (len(backend.entries), backend.size)
+
+        await backend.put("key9", b"x" * 60)
+        assert backend.size <= 100, backend.size
+
+        await backend.put("huge", b"x" * 101)
+        assert "huge" not in backend.entries
+
+        for user in range(50):
+            await backend.bump(f"user{user}")
+        assert len(backend.versions) == 3, len(backend.versions)
+
+    asyncio.run(run())
+    print("✅ Entry, byte and version budgets respected")
+    return True
+
+def test_no_stale_responses_after_version_eviction():
+    """A write always hides earlier responses, including for users whose version was evicted"""
+    print("\n🧪 Testing invalidation across version evictions")
+    print("=" * 60)
+
+    async def run():
+        cache = AnalyticsCache(MemoryAnalyticsBackend(max_entries=2, max_bytes=1024, ttl_seconds=60))
+        computed = []
+
+        async def compute():
+            computed.append(1)
+            return {"computed": len(computed)}
+
+        first = await cache.fetch("jane", "summary", {}, compute)
+        assert await cache.fetch("jane", "summary", {}, compute) == first, "second read was not a cache hit"
+
+        # A response computed before a write, stored after it (a request racing the write)
+        version_before_write = await cache.backend.version("jane")
+        await cache.invalidate("jane")
+        stale_key = f"jane:{version_before_write}:summary:{{}}"
+        await cache.backend.put(stale_key, b'{"computed": "stale"}')
+
+        # Other users' writes push jane's version counter out
+        for user in range(10):
+            await cache.invalidate(f"user{user}")
+        assert "jane" not in cache.backend.versions
+
+        body = await cache.fetch("jane", "summary", {}, compute)
+        assert body not in (first, b'{"computed": "stale"}'), body
+
+    asyncio.run(run())
+    print("✅ Responses from before a write are never served")
+    return True
+
+if __name__ == "__main__":
+    test_cache_bounds()
+    test_no_stale_responses_after_version_eviction()
+    print("\n" + "=" * 60)
+    print("✅ Analytics cache checks passed")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Checks that the compiled CategoryMatcher categorizes exactly like the
+keyword scan clean_category used before it, on generated statement-like
+descriptions, and that user rule sets resolve overlapping keywords by rule
+order.
+"""
+import os
+import random
+import sys
+import time
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "lifetracker_test")
+
+from server import CategoryMatcher, DEFAULT_CATEGORY_RULES, clean_category
+
+def reference_clean_category(category_str: str, description: str) -> str:
+    """clean_category as it was before the matcher: scan every keyword of every category"""
+    category_keywords = {
+        'Retail and Grocery': ['superstore', 'grocery', 'dollarama', 'walmart', 'costco', 'loblaws', 'metro', 'sobeys', 'john & ross', 't&t'],
+        'Restaurants': ['restaurant', 'coffee', 'starbucks', 'tim hortons', 'mcdonalds', 'pizza', 'food', 'dining', 'cafe', 'a&w', 'forest lawn'],
+        'Transportation': ['lyft', 'uber', 'taxi', 'gas', 'petro', 'shell', 'esso', 'transit', 'ride'],
+        'Home and Office Improvement': ['home depot', 'lowes', 'staples', 'canadian tire', 'ikea', 'office', 'stokes'],
+        'Hotel, Entertainment and Recreation': ['hotel', 'movie', 'netflix', 'spotify', 'apple.com', 'entertainment', 'apple.com/bill'],
+        'Professional and Financial Services': ['bank', 'fee', 'transfer', 'mortgage', 'insurance', 'legal', 'openai', 'chatgpt'],
+        'Health and Education': ['pharmacy', 'doctor', 'dental', 'hospital', 'school', 'university'],
+        'Foreign Currency Transactions': ['foreign', 'currency', 'exchange', 'international', 'usd']
+    }
+
+    if category_str and len(category_str.strip()) > 2:
+        category_clean = category_str.strip()
+        for known_cat in category_keywords.keys():
+            if known_cat.lower() in category_clean.lower():
+                return known_cat
+
+    description_lower = description.lower()
+    for cat, keywords in category_keywords.items():
+        if any(keyword in description_lower for keyword in keywords):
+            return cat
+
+    return 'Personal and Household Expenses'
+
+def generated_descriptions(count, seed=23):
+    """Statement-like descriptions mixing keywords, keyword fragments and noise"""
+    rng = random.Random(seed)
+    keywords = [keyword for keywords in DEFAULT_CATEGORY_RULES.values() for keyword in keywords]
+    fragments = [keyword[:rng.randint(1, len(keyword))] for keyword in keywords]
+    noise = ["SQ *", "POS", "#1234", "CALGARY AB", "VANCOUVER BC", "866-712-7753 ON", "PURCHASE", "*RIDE THU 2PM", "&", "/"]
+    alphabet = "abcdefghijklmnopqrstuvwxyz &*/.#-0123456789"
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 6)):
+            pick = rng.random()
+            if pick < 0.25:
+                parts.append(rng.choice(keywords))
+            elif pick < 0.5:
+                parts.append(rng.choice(fragments))
+            elif pick < 0.75:
+                parts.append(rng.choice(noise))
+            else:
+                parts.append("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 8))))
+        description = rng.choice(["", " ", "-"]).join(parts)
+        yield description.upper() if rng.random() < 0.5 else description
+
+def test_matches_reference_scan():
+    """clean_category agrees with the old keyword scan on generated descriptions"""
+    print("🧪 Testing CategoryMatcher against the old keyword scan")
+    print("=" * 60)
+
+    categories = ["", "N/A", "Retail and Grocery", "RESTAURANTS", "Spend: Transportation", "Misc"]
+    mismatches = []
+    descriptions = list(generated_descriptions(50000))
+    for index, description in enumerate(descriptions):
+        category_str = categories[index % len(categories)]
+        expected = reference_clean_category(category_str, description)
+        actual = clean_category(category_str, description)
+        if actual != expected:
+            mismatches.append((category_str, description, expected, actual))
+
+    for category_str, description, expected, actual in mismatches[:10]:
+        print(f"❌ {description!r} ({category_str!r}): expected {expected}, got {actual}")
+    assert not mismatches, f"{len(mismatches)} of {len(descriptions)} descriptions categorized differently"
+
+    start = time.perf_counter()
+    for description in descriptions:
+        reference_clean_category("", description)
+    reference_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for description in descriptions:
+        clean_category("", description)
+    matcher_seconds = time.perf_counter() - start
+
+    print(f"✅ {len(descriptions)} descriptions categorized identically "
+          f"({reference_seconds:.2f}s keyword scan, {matcher_seconds:.2f}s matcher)")
+    return True
+
+def test_rule_order():
+    """The first rule whose keyword appears wins, wherever in the description it occurs"""
+    print("\n🧪 Testing rule order with overlapping keywords")
+    print("=" * 60)
+
+    matcher = CategoryMatcher([
+        ("apple.com/bill", "Subscriptions"),
+        ("apple", "Groceries"),
+        ("pineapple express", "Restaurants"),
+        ("he", "Other")
+    ])
+    cases = {
+        "APPLE.COM/BILL 866-712-7753": "Subscriptions",
+        "pineapple express downtown": "Groceries",
+        "the corner store": "Other",
+        "APPL": None,
+        "": None
+    }
+    for description, expected in cases.items():
+        actual = matcher.match(description)
+        print(f"{'✅' if actual == expected else '❌'} {description!r}: {actual}")
+        assert actual == expected, f"{description!r}: expected {expected}, got {actual}"
+    assert CategoryMatcher([]).match("anything") is None
+    return True
+
+if __name__ == "__main__":
+    test_matches_reference_scan()
+    test_rule_order()
+    print("\n" + "=" * 60)
+    print("✅ Category matcher checks passed")
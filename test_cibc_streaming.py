@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Regression check for the streamed PDF parser: a statement parsed page by page
+(as the import workers do) must give the same metadata, format and transactions
+as the same statement parsed from its full extracted text, including when the
+header or the format indicators are not on page 1.
+"""
+import io
+import os
+import sys
+
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "lifetracker_test")
+
+from server import (
+    extract_text_from_pdf,
+    extract_pdf_metadata,
+    detect_statement_format,
+    iter_pdf_pages,
+    iter_statement_transactions,
+    new_parse_state,
+    parse_transactions_from_text
+)
+
+# Sample rows from test_cibc_parsing.py / test_cibc_debit.py
+CREDIT_TRANSACTIONS = [
+    "Oct 25   Oct 26   PAYMENT THANK YOU/PAIEMENT MERCI                                       1,085.99",
+    "Oct 26   Oct 28   JOHN & ROSS / AC CALG   CALG      AB      Retail and Grocery          90.34",
+    "Oct 31   Nov 01   LYFT *RIDE THU 2PM      VANCOUVER BC      Transportation              14.09",
+    "Oct 31   Nov 01   STOKES                  ROCKVIEW  AB      Home and Office Improvement 73.48",
+    "Nov 01   Nov 01   WINNERSHOMESENSE4160    ROCKY VIEW AB     Retail and Grocery          15.74",
+    "Nov 05   Nov 06   APPLE.COM/BILL          866-712-7753 ON   Retail and Grocery          52.49",
+    "Nov 06   Nov 07   STAPLES STORE #253      CALGARY   AB      Retail and Grocery          0.57",
+    "Nov 07   Nov 08   LYFT *RIDE THU 12PM     VANCOUVER BC      Transportation              20.87",
+    "Nov 07   Nov 12   SKY 360                 CALGARY   AB      Restaurants                 23.16",
+    "Nov 14   Nov 15   DOLLARAMA #504          CALGARY   AB      Retail and Grocery          54.34"
+]
+
+DEBIT_TRANSACTIONS = [
+    "Oct 01   Opening balance                                                            1000.00",
+    "Oct 05   VISA DEBIT RETAIL PURCHASE                      25.99                      974.01",
+    "         TIM HORTONS #1234",
+    "Oct 08   E-TRANSFER    RENT PAYMENT                      800.00                     174.01",
+    "         TO: LANDLORD PROPERTIES",
+    "Oct 12   VISA DEBIT RETAIL PURCHASE                      67.50                      106.51",
+    "         GROCERY STORE SUPERMARKET"
+]
+
+def build_pdf(pages):
+    """Render each page (a list of lines) onto its own PDF page"""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    c.setFont("Helvetica", 10)
+    for lines in pages:
+        y_position = 750
+        for line in lines:
+            c.drawString(50, y_position, line)
+            y_position -= 15
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+CREDIT_HEADER = [
+    "CIBC",
+    "Prepared for: JANE OGHENERUEMU AGBAOHWO - October 16 to November 15, 2024",
+    "Account number: 4500 XXXX XXXX 8519",
+    "Your new charges and credits",
+    "Trans    Post     Description                 Spend Categories          Amount($)"
+]
+
+DEBIT_HEADER = [
+    "CIBC",
+    "CIBC Account Statement",
+    "SARAH JOHNSON                           For Oct 1 to Oct 31, 2024",
+    "Account number: 56-12345"
+]
+
+SAMPLE_STATEMENTS = {
+    "credit, one page": [CREDIT_HEADER + CREDIT_TRANSACTIONS],
+    "credit, split over two pages": [CREDIT_HEADER + CREDIT_TRANSACTIONS[:5], CREDIT_TRANSACTIONS[5:]],
+    "credit, cover page first": [["CIBC", "Important information about your account"], CREDIT_HEADER + CREDIT_TRANSACTIONS],
+    "debit, one page": [DEBIT_HEADER + [
+        "Transaction details",
+        "Date     Description                              Withdrawals ($)  Deposits ($)   Balance ($)"
+    ] + DEBIT_TRANSACTIONS],
+    "debit, details on page 2": [DEBIT_HEADER, [
+        "Transaction details",
+        "Date     Description                              Withdrawals ($)  Deposits ($)   Balance ($)"
+    ] + DEBIT_TRANSACTIONS]
+}
+
+def parse_streamed(content, page_count, pages_per_batch):
+    """Parse the PDF batch by batch with a carried state, like the import workers"""
+    state = new_parse_state()
+    transactions = []
+    for start_page in range(0, page_count, pages_per_batch):
+        end_page = min(start_page + pages_per_batch, page_count)
+        pages = iter_pdf_pages(content, start_page, end_page)
+        transactions.extend(iter_statement_transactions(pages, "test_user", "statement.pdf", state, end_page == page_count))
+    return state, transactions
+
+def test_streamed_parsing_matches_full_text():
+    """Compare full-text parsing with page-by-page streaming for every sample statement"""
+    print("🧪 Testing streamed parsing against full-text parsing")
+    print("=" * 60)
+
+    all_match = True
+    for name, pages in SAMPLE_STATEMENTS.items():
+        content = build_pdf(pages)
+        text = extract_text_from_pdf(content)
+        expected_metadata = extract_pdf_metadata(text)
+        expected_format = detect_statement_format(text)
+        expected = parse_transactions_from_text(text, "test_user", "statement.pdf")
+
+        for pages_per_batch in (1, len(pages)):
+            state, streamed = parse_streamed(content, len(pages), pages_per_batch)
+            match = (
+                state["metadata"] == expected_metadata
+                and state["format"] == expected_format
+                and streamed == expected
+            )
+            all_match = all_match and match
+            print(f"{'✅' if match else '❌'} {name} ({pages_per_batch} page(s) per batch): "
+                  f"{state['format']} / {expected_format}, {len(streamed)} / {len(expected)} transactions")
+            if not match:
+                print(f"   metadata: {state['metadata']} / {expected_metadata}")
+
+    assert all_match, "streamed parsing differs from full-text parsing"
+    return all_match
+
+if __name__ == "__main__":
+    success = test_streamed_parsing_matches_full_text()
+    print("\n" + "=" * 60)
+    print("✅ All sample statements parse the same when streamed" if success else "❌ Streamed parsing differs")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Checks for the startup index reconciliation: every query shape server.py
+declares is covered by an index it creates, and a MongoDB error on one
+collection or index is recorded in the report instead of aborting the rest.
+"""
+import asyncio
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "lifetracker_test")
+
+import server
+from server import INDEX_SPECS, QUERY_SHAPES, index_covers
+
+def test_query_shapes_covered():
+    """Every declared query shape has an index in INDEX_SPECS"""
+    print("🧪 Testing that INDEX_SPECS covers every query shape")
+    print("=" * 60)
+
+    uncovered = []
+    for collection_name, shapes in QUERY_SHAPES.items():
+        index_fields = [tuple(field for field, _ in keys) for keys, _ in INDEX_SPECS.get(collection_name, [])]
+        for shape in shapes:
+            if not any(index_covers(fields, shape) for fields in index_fields):
+                uncovered.append(f"{collection_name}({', '.join(shape)})")
+
+    for shape in uncovered:
+        print(f"❌ No index covers {shape}")
+    if not uncovered:
+        print(f"✅ {sum(len(shapes) for shapes in QUERY_SHAPES.values())} query shapes covered")
+    assert not uncovered, f"uncovered query shapes: {uncovered}"
+    return True
+
+class FailingCollection:
+    """Collection whose index calls fail the way an unreachable or unauthorized MongoDB would"""
+
+    def __init__(self, fail_listing):
+        self.fail_listing = fail_listing
+        self.created = []
+
+    async def index_information(self):
+        if self.fail_listing:
+            raise RuntimeError("not authorized to list indexes")
+        return {"user_date": {"key": [("user_id", 1), ("date", 1)]}}
+
+    async def drop_index(self, name):
+        raise RuntimeError(f"cannot drop {name}")
+
+    async def create_index(self, keys, **options):
+        self.created.append(options["name"])
+
+class FailingDatabase(dict):
+    def __missing__(self, collection_name):
+        # Listing fails for users; everything else lists fine but cannot drop indexes
+        self[collection_name] = FailingCollection(fail_listing=collection_name == "users")
+        return self[collection_name]
+
+def test_reconciliation_survives_errors():
+    """A failing collection or drop_index() is reported and the other indexes are still created"""
+    print("\n🧪 Testing index reconciliation with failing MongoDB calls")
+    print("=" * 60)
+
+    original_db = server.db
+    server.db = FailingDatabase()
+    try:
+        report = asyncio.run(server.ensure_indexes())
+    finally:
+        failing_db, server.db = server.db, original_db
+
+    print(f"failed: {report['failed']}")
+    assert "users" in report["failed"], "listing failure was not reported"
+    assert "transactions.user_date" in report["failed"], "drop_index failure was not reported"
+    # Collections after the failures were still reconciled
+    assert "user_amount" in failing_db["transactions"].created
+    assert failing_db["merchant_categories"].created == ["user_merchant"]
+    print("✅ Failures recorded, remaining indexes created")
+    return True
+
+if __name__ == "__main__":
+    test_query_shapes_covered()
+    test_reconciliation_survives_errors()
+    print("\n" + "=" * 60)
+    print("✅ Index reconciliation checks passed")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Regression check for parallel page-range extraction: a multi-page statement
+imported with any PDF_PARALLEL_RANGES setting must give the same rows, in the
+same order, as parsing its full extracted text.
+"""
+import asyncio
+import io
+import os
+import sys
+
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "lifetracker_test")
+
+import server
+from server import extract_text_from_pdf, new_parse_state, parse_page_ranges, parse_transactions_from_text
+
+PAGE_COUNT = 40
+
+def build_statement(page_count):
+    """A credit card statement with 25 transactions per page and the header on page 1"""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    c.setFont("Helvetica", 9)
+    for page in range(page_count):
+        y_position = 750
+        if page == 0:
+            for line in [
+                "CIBC Dividend Visa Card",
+                "Prepared for: JANE OGHENERUEMU AGBAOHWO - October 16 to November 15, 2024",
+                "Your new charges and credits"
+            ]:
+                c.drawString(40, y_position, line)
+                y_position -= 15
+        for i in range(25):
+            day = 10 + i % 18
+            c.drawString(40, y_position, f"Oct {day} Oct {day + 1} MERCHANT {page}-{i} CALGARY AB Retail and Grocery {10 + i}.{page % 10}5")
+            y_position -= 14
+        c.drawString(40, y_position, f"Page {page + 1} of {page_count}")
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+async def parse_with_ranges(content, parallel_ranges):
+    server.PDF_PARALLEL_RANGES = parallel_ranges
+    state = new_parse_state()
+    transactions = []
+    async for _, parsed in parse_page_ranges(content, PAGE_COUNT, "test_user", "statement.pdf", state):
+        transactions.extend(parsed["transactions"])
+        state = parsed["state"]
+    return transactions
+
+def test_parallel_ranges_match_full_text():
+    """Parse the same statement at 1 to 4 parallel ranges and compare with full-text parsing"""
+    print("🧪 Testing parallel page ranges against full-text parsing")
+    print("=" * 60)
+
+    content = build_statement(PAGE_COUNT)
+    expected = parse_transactions_from_text(extract_text_from_pdf(content), "test_user", "statement.pdf")
+    assert len(expected) == PAGE_COUNT * 25, f"expected {PAGE_COUNT * 25} rows from the full text, got {len(expected)}"
+
+    async def run():
+        return {parallel_ranges: await parse_with_ranges(content, parallel_ranges) for parallel_ranges in (1, 2, 3, 4)}
+
+    original_ranges = server.PDF_PARALLEL_RANGES
+    try:
+        results = asyncio.run(run())
+    finally:
+        server.PDF_PARALLEL_RANGES = original_ranges
+        if server.pdf_executor is not None:
+            server.pdf_executor.shutdown()
+            server.pdf_executor = None
+
+    all_match = True
+    for parallel_ranges, transactions in results.items():
+        match = transactions == expected
+        all_match = all_match and match
+        print(f"{'✅' if match else '❌'} {parallel_ranges} range(s) at once: {len(transactions)} / {len(expected)} transactions")
+
+    assert all_match, "parallel range parsing differs from full-text parsing"
+    return all_match
+
+if __name__ == "__main__":
+    success = test_parallel_ranges_match_full_text()
+    print("\n" + "=" * 60)
+    print("✅ Parsed rows don't depend on PDF_PARALLEL_RANGES" if success else "❌ Parallel range parsing differs")